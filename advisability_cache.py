@@ -0,0 +1,149 @@
+"""
+    Persistent cache of advisability results, so that repeated runs against
+    unchanged weather data do not load the data or build any models.
+
+    Results are kept in an SQLite database, keyed by a hash of the contents
+    of the weather data file, the model and number of days, and the kind of
+    event.
+
+    AdvisabilityCache: Results cached for one weather data file.
+"""
+
+__author__ = "Youngsu Choi"
+__email__ = "tonymusic0825@gmail.com"
+
+import hashlib
+import json
+import os
+import sqlite3
+
+
+# Version of the cached results, changed whenever the way results are
+# computed changes, so that results of earlier versions are not used.
+CACHE_VERSION = 1
+
+# Number of bytes of the weather data file hashed at a time.
+HASH_BLOCK_SIZE = 1024 * 1024
+
+# Time (seconds) to wait for another process writing to the cache.
+LOCK_TIMEOUT = 30
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime INTEGER NOT NULL,
+    digest TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS results (
+    digest TEXT NOT NULL,
+    version INTEGER NOT NULL,
+    model TEXT NOT NULL,
+    number_days INTEGER NOT NULL,
+    time INTEGER NOT NULL,
+    outdoors INTEGER NOT NULL,
+    cover INTEGER NOT NULL,
+    forecast TEXT NOT NULL,
+    advisability REAL NOT NULL,
+    PRIMARY KEY (digest, version, model, number_days, time, outdoors, cover)
+);
+"""
+
+
+def file_digest(weather_file):
+    """(str) SHA-256 hash of the contents of a file, read in blocks."""
+    digest = hashlib.sha256()
+    with open(weather_file, "rb") as contents:
+        for block in iter(lambda: contents.read(HASH_BLOCK_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class AdvisabilityCache(object):
+    """Advisability results and forecasts cached for one weather data file."""
+
+    def __init__(self, cache_file, weather_file):
+        """
+        Parameters:
+            cache_file (str): Name of the SQLite database holding the cache,
+                              which is created if it does not exist.
+            weather_file (str): Name of the CSV file the results are for.
+                                It is only hashed again when its size or
+                                modification time has changed.
+        """
+        self._connection = sqlite3.connect(cache_file, timeout=LOCK_TIMEOUT)
+        self._connection.executescript(_SCHEMA)
+        self._digest = self._file_digest(weather_file)
+
+    def _file_digest(self, weather_file):
+        """(str) Hash of the contents of the weather data file."""
+        path = os.path.abspath(weather_file)
+        status = os.stat(path)
+        row = self._connection.execute(
+            "SELECT digest FROM files WHERE path = ? AND size = ? AND mtime = ?",
+            (path, status.st_size, status.st_mtime_ns)).fetchone()
+        if row is not None:
+            return row[0]
+
+        digest = file_digest(path)
+        with self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?)",
+                (path, status.st_size, status.st_mtime_ns, digest))
+        return digest
+
+    def get_digest(self):
+        """(str) Hash of the contents of the weather data file."""
+        return self._digest
+
+    def get(self, model_name, number_days, time, outdoors, cover_available):
+        """Returns a cached result, if there is one.
+
+        Parameters:
+            model_name (str): Name of the model, one of prediction.MODELS.
+            number_days (int): Number of days of data the model used.
+            time (int): Closest hour to the starting time of the event.
+            outdoors (bool): Whether the event is outdoors.
+            cover_available (bool): Whether the event has cover available.
+
+        Return:
+            (tuple<tuple, float>) The model's forecast, in FORECAST_FIELDS
+                                  order, and the advisability of the event,
+                                  or None if the result is not cached.
+        """
+        row = self._connection.execute(
+            "SELECT forecast, advisability FROM results WHERE digest = ? "
+            "AND version = ? AND model = ? AND number_days = ? AND time = ? "
+            "AND outdoors = ? AND cover = ?",
+            (self._digest, CACHE_VERSION, model_name, number_days, time,
+             bool(outdoors), bool(cover_available))).fetchone()
+        if row is None:
+            return None
+        return tuple(json.loads(row[0])), row[1]
+
+    def put_many(self, results):
+        """Caches many results in one transaction.
+
+        Parameters:
+            results (iter<tuple>): The model name, number of days, time,
+                whether outdoors, whether cover is available, forecast and
+                advisability of each result, as passed to and returned by get.
+        """
+        with self._connection:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [(self._digest, CACHE_VERSION, model_name, number_days, time,
+                  bool(outdoors), bool(cover_available), json.dumps(forecast),
+                  advisability)
+                 for (model_name, number_days, time, outdoors, cover_available,
+                      forecast, advisability) in results])
+
+    def close(self):
+        """Closes the database."""
+        self._connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exception):
+        self.close()
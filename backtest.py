@@ -0,0 +1,250 @@
+"""
+    Walk-forward backtesting of the weather prediction models.
+
+    Replays the weather data day by day, predicting each day from the data
+    available before it, and measures how far each prediction was from the
+    weather that actually occurred.
+
+    FieldErrors: Accumulated errors of the predictions of one quantity.
+    BacktestResult: Errors of one prediction model over the whole data.
+    backtest: Backtests one model with one number of days.
+    backtest_sweep: Backtests many models and numbers of days in parallel.
+"""
+
+__author__ = "Youngsu Choi"
+__email__ = "tonymusic0825@gmail.com"
+
+import argparse
+import json
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from weather_data import WeatherData
+from prediction import FORECAST_FIELDS, MAX_DAYS, MODELS, YesterdaysWeather, create_model
+
+
+# Least amount of rainfall (mm) counted as rain having occurred.
+RAIN_THRESHOLD = 0.1
+
+
+class FieldErrors(object):
+    """Accumulated errors of the predictions of one quantity."""
+
+    def __init__(self):
+        """
+        Parameters:
+            None
+        """
+        self._count = 0
+        self._total_error = 0.0
+        self._total_absolute_error = 0.0
+        self._total_squared_error = 0.0
+
+    def add(self, predicted, actual):
+        """Records one prediction and the value that actually occurred."""
+        error = predicted - actual
+        self._count += 1
+        self._total_error += error
+        self._total_absolute_error += abs(error)
+        self._total_squared_error += error * error
+
+    def get_count(self):
+        """(int) Number of predictions recorded."""
+        return self._count
+
+    def mean_absolute_error(self):
+        """(float) Mean of the absolute errors, or NaN if none recorded."""
+        return self._total_absolute_error / self._count if self._count else math.nan
+
+    def root_mean_squared_error(self):
+        """(float) Square root of the mean squared error, or NaN if none."""
+        if not self._count:
+            return math.nan
+        return math.sqrt(self._total_squared_error / self._count)
+
+    def bias(self):
+        """(float) Mean of predicted minus actual, or NaN if none recorded."""
+        return self._total_error / self._count if self._count else math.nan
+
+    def to_dict(self):
+        """(dict<str, float>) The error measures, by name."""
+        return {"count": self._count,
+                "mae": self.mean_absolute_error(),
+                "rmse": self.root_mean_squared_error(),
+                "bias": self.bias()}
+
+
+class BacktestResult(object):
+    """Errors of one prediction model over the whole data."""
+
+    def __init__(self, model_name, number_days, errors):
+        """
+        Parameters:
+            model_name (str): Name of the model, one of MODELS.
+            number_days (int): Number of days of data the model used.
+            errors (dict<str, FieldErrors>): Errors of each predicted quantity,
+                by name. Chance of rain is measured as a probability against
+                whether rain occurred, so its squared error is a Brier score.
+        """
+        self._model_name = model_name
+        self._number_days = number_days
+        self._errors = errors
+
+    def get_model_name(self):
+        """(str) Name of the model."""
+        return self._model_name
+
+    def get_number_days(self):
+        """(int) Number of days of data the model used."""
+        return self._number_days
+
+    def get_errors(self, field):
+        """(FieldErrors) Errors of the predictions of one quantity."""
+        return self._errors[field]
+
+    def to_dict(self):
+        """(dict) The result, in a form that can be written as JSON."""
+        return {"model": self._model_name,
+                "number_days": self._number_days,
+                "errors": {field: errors.to_dict()
+                           for field, errors in self._errors.items()}}
+
+    def __str__(self):
+        """(str) One line summary of the mean absolute errors."""
+        errors = ", ".join(f"{field} {self._errors[field].mean_absolute_error():.3f}"
+                           for field in FORECAST_FIELDS)
+        return f"{self._model_name} ({self._number_days} days): {errors}"
+
+
+def backtest(weather_data, model_name, number_days=1, start=1,
+             max_days=MAX_DAYS):
+    """Predicts each day from the days before it and measures the errors.
+
+    Parameters:
+        weather_data (WeatherData): Collection of weather data.
+        model_name (str): Name of the model to test, one of MODELS.
+        number_days (int): Number of days of data the model uses.
+        start (int): First day to predict, counting from 0.
+                     At least one day of data is always used.
+        max_days (int): Limit on number_days, or None for no limit.
+
+    Return:
+        (BacktestResult) Errors of the model's predictions.
+    """
+    errors = {field: FieldErrors() for field in FORECAST_FIELDS}
+    (rain_errors, high_errors, low_errors, humidity_errors, cloud_errors,
+     wind_errors) = (errors[field] for field in FORECAST_FIELDS)
+
+    for day in range(max(1, start), weather_data.size()):
+        model = create_model(model_name, weather_data.view(day), number_days,
+                             max_days)
+        (chance_of_rain, high_temperature, low_temperature, humidity,
+         cloud_cover, wind_speed) = model.forecast()
+        actual = weather_data.view(day + 1).get_data(1)[0]
+
+        rained = 1 if actual.get_rainfall() >= RAIN_THRESHOLD else 0
+        rain_errors.add(chance_of_rain / 100, rained)
+        high_errors.add(high_temperature, actual.get_high_temperature())
+        low_errors.add(low_temperature, actual.get_low_temperature())
+        humidity_errors.add(humidity, actual.get_humidity())
+        cloud_errors.add(cloud_cover, actual.get_cloud_cover())
+        wind_errors.add(wind_speed, actual.get_average_wind_speed())
+
+    return BacktestResult(model_name, number_days, errors)
+
+
+# Weather data read by each worker process of backtest_sweep.
+_worker_data = None
+
+
+def _attach_worker_data(name):
+    """Attaches a worker process to the shared weather data."""
+    global _worker_data
+    _worker_data = WeatherData.attach(name)
+
+
+def _backtest_worker(model_name, number_days, start, max_days):
+    """Runs one backtest against the worker's weather data."""
+    return backtest(_worker_data, model_name, number_days, start, max_days)
+
+
+def backtest_sweep(weather_file, model_names=None, days=range(1, MAX_DAYS + 1),
+                   start=1, max_days=MAX_DAYS, workers=None):
+    """Backtests every combination of model and number of days.
+
+    The combinations are shared out between a pool of worker processes.
+    The weather data is loaded once and shared with every worker, which
+    reads it in place rather than holding a copy of its own.
+
+    Parameters:
+        weather_file (str): Name of the CSV file containing the weather data.
+        model_names (list<str>): Names of the models to test, or None for all.
+        days (iter<int>): Numbers of days of data to test each model with.
+                          YesterdaysWeather is only tested once.
+        start (int): First day to predict, counting from 0.
+        max_days (int): Limit on number of days, or None for no limit.
+        workers (int): Number of worker processes, or None for one per CPU.
+
+    Return:
+        (list<BacktestResult>) Result of each combination, in the order
+                               of model_names and then days.
+    """
+    if model_names is None:
+        model_names = list(MODELS)
+    days = list(days)
+    tasks = [(name, number_days) for name in model_names
+             for number_days in ([1] if MODELS[name] is YesterdaysWeather
+                                 else days)]
+
+    weather_data = WeatherData()
+    weather_data.load(weather_file)
+    shared_name = weather_data.share()
+    try:
+        with ProcessPoolExecutor(max_workers=workers,
+                                 initializer=_attach_worker_data,
+                                 initargs=(shared_name,)) as executor:
+            futures = [executor.submit(_backtest_worker, name, number_days,
+                                       start, max_days)
+                       for name, number_days in tasks]
+            return [future.result() for future in futures]
+    finally:
+        WeatherData.unshare(shared_name)
+
+
+def _parse_days(text):
+    """(list<int>) Numbers of days given as "7" or a range such as "1-28"."""
+    first, _, last = text.partition("-")
+    return list(range(int(first), int(last or first) + 1))
+
+
+def main():
+    """Backtests the prediction models from the command line."""
+    parser = argparse.ArgumentParser(
+        description="Walk-forward backtest of the weather prediction models.")
+    parser.add_argument("weather_file", nargs="?", default="weather_data.csv")
+    parser.add_argument("--models", nargs="+", choices=list(MODELS),
+                        default=list(MODELS))
+    parser.add_argument("--days", type=_parse_days, default=_parse_days("1-28"),
+                        help='numbers of days to test, e.g. "7" or "1-28"')
+    parser.add_argument("--start", type=int, default=1,
+                        help="first day to predict, counting from 0")
+    parser.add_argument("--max-days", type=int, default=MAX_DAYS,
+                        help="limit on the number of days (0 for no limit)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--json", action="store_true",
+                        help="write results as JSON lines")
+    arguments = parser.parse_args()
+
+    results = backtest_sweep(arguments.weather_file, arguments.models,
+                             arguments.days, arguments.start,
+                             arguments.max_days or None, arguments.workers)
+    for result in results:
+        if arguments.json:
+            print(json.dumps(result.to_dict()))
+        else:
+            print(result)
+
+
+if __name__ == "__main__":
+    main()
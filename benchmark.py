@@ -0,0 +1,205 @@
+"""
+    Benchmarks of loading weather data, predicting the weather and deciding
+    on events, run against synthetic weather data of increasing size.
+
+    generate_weather_csv: Writes realistic synthetic weather data.
+    run_benchmarks: Times each benchmark at each data size.
+"""
+
+__author__ = "Youngsu Choi"
+__email__ = "tonymusic0825@gmail.com"
+
+import argparse
+import csv
+import datetime
+import json
+import math
+import os
+import platform
+import random
+import tempfile
+import time
+
+from weather_data import CSV_COLUMNS, WIND_DIRECTIONS, WeatherData
+from prediction import MODELS, create_model, forecast_cache, statistics_cache
+from event_decision import Event, EventDecision, batch_advisability
+
+
+# Columns of the CSV files, in the order of the bundled weather_data.csv.
+HEADER = ["Date", CSV_COLUMNS["temperature_low"],
+          CSV_COLUMNS["temperature_high"], CSV_COLUMNS["rain"],
+          CSV_COLUMNS["sunshine_hours"], CSV_COLUMNS["humidity"],
+          CSV_COLUMNS["cloud_cover"], CSV_COLUMNS["wind_direction"],
+          CSV_COLUMNS["wind_speed_average"], CSV_COLUMNS["wind_speed_max"],
+          CSV_COLUMNS["air_pressure"]]
+
+# Default numbers of rows of data to benchmark with.
+SIZES = (10 ** 3, 10 ** 4, 10 ** 5)
+# Number of events scored by the batch benchmark.
+BATCH_EVENTS = 100000
+
+
+def generate_weather_csv(weather_file, rows, seed=0,
+                         start=datetime.date(2000, 1, 1)):
+    """Writes synthetic weather data in the format of weather_data.csv.
+
+    Temperatures follow the seasons, rain falls on about a third of days,
+    and air pressure drifts from day to day, with humidity and cloud rising
+    on rainy days.
+
+    Dates never go past 31/12/9999. If there are too many rows to follow on
+    from start, the first date is moved earlier, as far as 1/1/0001, and
+    beyond that each date is given to several consecutive rows.
+
+    Parameters:
+        weather_file (str): Name of the CSV file to write.
+        rows (int): Number of days of data to write.
+        seed (int): Seed for the random values, so that files are repeatable.
+        start (datetime.date): Date of the first day.
+    """
+    generator = random.Random(seed)
+    pressure = 1015.0
+    dates = datetime.date.max.toordinal() - datetime.date.min.toordinal() + 1
+    rows_per_date = -(-rows // dates)
+    last = start.toordinal() + -(-rows // rows_per_date) - 1
+    day = start - datetime.timedelta(
+        days=max(0, last - datetime.date.max.toordinal()))
+    one_day = datetime.timedelta(days=1)
+    with open(weather_file, "w", newline="") as weather_details:
+        writer = csv.writer(weather_details)
+        writer.writerow(HEADER)
+        for row in range(rows):
+            season = math.cos(2 * math.pi * (day.timetuple().tm_yday - 15) / 365)
+            low = round(15 + 7 * season + generator.gauss(0, 2), 1)
+            high = round(low + generator.uniform(5, 13), 1)
+            raining = generator.random() < 0.3
+            rain = round(generator.expovariate(0.2), 1) if raining else 0
+            pressure = min(1040.0, max(990.0, pressure + generator.gauss(0, 2)))
+            wind = generator.randint(0, 30)
+            writer.writerow([
+                f"{day.day}/{day.month:02d}/{day.year}", low, high, rain,
+                round(generator.uniform(0, 4 if raining else 13), 1),
+                min(100, generator.randint(30, 80) + (20 if raining else 0)),
+                min(9, generator.randint(0, 6) + (3 if raining else 0)),
+                generator.choice(WIND_DIRECTIONS), wind,
+                wind + generator.randint(5, 40), round(pressure, 1)])
+            if (row + 1) % rows_per_date == 0 and day < datetime.date.max:
+                day += one_day
+
+
+def _time(function, repeat):
+    """(float) Least time (seconds) taken by one of 'repeat' calls."""
+    best = math.inf
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def _benchmarks(weather_file, weather_data):
+    """Yields the name and function of each benchmark for one data file."""
+    def get_data():
+        for _ in range(1000):
+            weather_data.get_data(28)
+
+    yield "get_data(28) x1000", get_data, 3
+
+    def window_sum():
+        for _ in range(1000):
+            weather_data.window_sum("rain", weather_data.size())
+
+    yield "window_sum(full history) x1000", window_sum, 3
+
+    for name in MODELS:
+        def forecast(name=name):
+            for number_days in range(1, 29):
+                forecast_cache.clear()
+                statistics_cache.clear()
+                create_model(name, weather_data, number_days).forecast()
+
+        yield f"{name} forecast, 1-28 days", forecast, 3
+
+    model = create_model("sophisticated", weather_data, 28)
+
+    def advisability():
+        for time_of_day in range(24):
+            EventDecision(Event("benchmark", True, False, time_of_day),
+                          model).advisability()
+
+    yield "advisability x24", advisability, 3
+
+    generator = random.Random(1)
+    times = [generator.randrange(24) for _ in range(BATCH_EVENTS)]
+    outdoors = [generator.random() < 0.5 for _ in range(BATCH_EVENTS)]
+    cover = [generator.random() < 0.5 for _ in range(BATCH_EVENTS)]
+    forecasts = [create_model(name, weather_data, 7).forecast()
+                 for name in MODELS]
+    models = [generator.randrange(len(forecasts)) for _ in range(BATCH_EVENTS)]
+
+    def batch():
+        batch_advisability(times, outdoors, cover, forecasts, models)
+
+    yield f"batch_advisability x{BATCH_EVENTS}", batch, 3
+
+
+def run_benchmarks(sizes=SIZES, directory=None, seed=0):
+    """Times each benchmark at each data size.
+
+    Parameters:
+        sizes (iter<int>): Numbers of rows of data to benchmark with.
+        directory (str): Where to keep the generated data files, which are
+                         reused by later runs, or None for a temporary one.
+        seed (int): Seed for the generated data.
+
+    Return:
+        (dict) Details of the environment and the "results": a list of
+               the benchmark name, number of rows and best time (seconds).
+    """
+    results = []
+    with tempfile.TemporaryDirectory() as temporary:
+        directory = directory or temporary
+        for size in sizes:
+            weather_file = os.path.join(directory, f"weather_{size}_{seed}.csv")
+            if not os.path.exists(weather_file):
+                generate_weather_csv(weather_file, size, seed)
+            # Time the load that the other benchmarks then use, rather than
+            # loading twice, to keep the memory needed by the largest sizes
+            # down.
+            weather_data = WeatherData()
+            results.append({"benchmark": "load", "rows": size,
+                            "seconds": _time(lambda: weather_data.load(weather_file),
+                                             1)})
+
+            for name, function, repeat in _benchmarks(weather_file, weather_data):
+                results.append({"benchmark": name, "rows": size,
+                                "seconds": _time(function, repeat)})
+    return {"python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+            "results": results}
+
+
+def main():
+    """Runs the benchmarks from the command line."""
+    parser = argparse.ArgumentParser(
+        description="Benchmark the weather data, prediction and decisions.")
+    parser.add_argument("--sizes", nargs="+", type=lambda size: int(float(size)),
+                        default=list(SIZES),
+                        help="numbers of rows, e.g. 1e3 1e5 1e7")
+    parser.add_argument("--data-dir", help="directory to keep generated data in")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write JSON results to this file")
+    arguments = parser.parse_args()
+
+    report = run_benchmarks(arguments.sizes, arguments.data_dir, arguments.seed)
+    for result in report["results"]:
+        print(f"{result['rows']:>10} rows  {result['seconds'] * 1000:10.3f} ms  "
+              f"{result['benchmark']}")
+    if arguments.output:
+        with open(arguments.output, "w") as output:
+            json.dump(report, output, indent=2)
+
+
+if __name__ == "__main__":
+    main()
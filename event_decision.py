@@ -5,16 +5,41 @@
     Event: Represents details about an event that may be influenced by weather.
     EventDecider: Determines if predicted weather will impact on a planned event.
     UserInteraction: Simple textual interface to drive program.
+    batch_advisability: Scores many events against model forecasts in one pass.
+    advisability_sweep: Scores every kind of event, model and window at once.
+    BatchDecider: Scores batches of advisability requests against one dataset.
 """
 
 __author__ = "Youngsu Choi"
 __email__ = "tonymusic0825@gmail.com"
 
+import argparse
+import json
+import os
+import stat
+import sys
+from array import array
+from itertools import islice, repeat
+
+import instrumentation
+from advisability_cache import AdvisabilityCache
 from weather_data import WeatherData
 from prediction import WeatherPrediction, YesterdaysWeather, SimplePrediction, SophisticatedPrediction
+from prediction import MAX_DAYS, MODELS, create_model, model_number_days
 # Import your SimplePrediction and SophisticatedPrediction classes once defined.
 
 
+# Number of hours in a day that an event can start at.
+HOURS = 24
+# Number of kinds of event in an advisability table:
+# one per starting hour, with and without outdoors and cover.
+TABLE_SIZE = 4 * HOURS
+# Number of requests read and scored together in batch mode.
+BATCH_SIZE = 1024
+# Model names by their number in the interactive menu.
+MODEL_CHOICES = {1: "yesterday", 2: "simple", 3: "sophisticated"}
+
+
 # Define your Event Class here
 class Event(object):
     """Creats an event according to user's input"""
@@ -73,51 +98,14 @@ class EventDecision(object):
         Return:
             (float) Temperature Factor
         """
-        temperature_factor = 0
-        humidity_factor = 0
-        humidity = self._prediction_model.humidity()
-        event_time = self._event.get_time()
-        event_outdoors = self._event.get_outdoors()
-
-        high_temperature = self._prediction_model.high_temperature()
-        low_temperature = self._prediction_model.low_temperature()
-
-        if humidity > 70:
-            humidity_factor = humidity / 20
-
-        if high_temperature > 0:
-            high_temperature += humidity_factor
-        elif high_temperature < 0:
-            high_temperature -= humidity_factor
-
-        if low_temperature > 0:
-            low_temperature += humidity_factor
-        elif low_temperature < 0:
-            low_temperature -= humidity_factor
-
-        if (event_time >= 6 and event_time <= 19 and event_outdoors and high_temperature >= 30) or high_temperature >= 45:
-            temperature_factor = (high_temperature / -5) + 6
-
-            if temperature_factor < 0:
-                if self._event.get_cover_available():
-                    temperature_factor += 1
-                if self._prediction_model.wind_speed() > 3 and self._prediction_model.wind_speed() < 10:
-                    temperature_factor += 1
-                if self._prediction_model.cloud_cover() > 4:
-                    temperature_factor += 1
-
-        elif (self._event.get_time() >= 0 and self._event.get_time() <= 5) or (self._event.get_time() >= 20 and self._event.get_time() <= 23) \
-             and low_temperature < 5 and high_temperature < 45:
-
-             temperature_factor = (low_temperature / 5) - 1.1
-
-        elif low_temperature > 15 and high_temperature < 30:
-            temperature_factor = (high_temperature - low_temperature) / 5
-
-        else:
-            temperature_factor = 0
-
-        return temperature_factor
+        return temperature_factor(
+            self._event.get_time(), self._event.get_outdoors(),
+            self._event.get_cover_available(),
+            self._prediction_model.humidity(),
+            self._prediction_model.high_temperature(),
+            self._prediction_model.low_temperature(),
+            self._prediction_model.wind_speed(),
+            self._prediction_model.cloud_cover())
 
     def _rain_factor(self):
         """
@@ -127,25 +115,10 @@ class EventDecision(object):
         Return:
             (float) Rain Factor
         """
-        chance_of_rain = self._prediction_model.chance_of_rain()
-
-        if self._prediction_model.chance_of_rain() < 20:
-            rain_factor = (chance_of_rain / -5) + 4
-        elif self._prediction_model.chance_of_rain() > 50:
-            rain_factor = (chance_of_rain / -20) + 1
-        else:
-            rain_factor = 0
-
-        if self._event.get_outdoors() and self._event.get_cover_available() and self._prediction_model.wind_speed() < 5:
-            rain_factor += 1
-
-        if rain_factor < 2 and self._prediction_model.wind_speed() > 15:
-            rain_factor += (self._prediction_model.wind_speed() / -15)
-
-        if rain_factor < -9:
-            rain_factor = -9
-
-        return rain_factor
+        return rain_factor(
+            self._event.get_outdoors(), self._event.get_cover_available(),
+            self._prediction_model.chance_of_rain(),
+            self._prediction_model.wind_speed())
 
     def advisability(self):
         """Determine how advisable it is to continue with the planned event.
@@ -154,14 +127,499 @@ class EventDecision(object):
             (float) Value in range of -5 to +5,
                     -5 is very bad, 0 is neutral, 5 is very beneficial
         """
-        advisability = self._temperature_factor() + self._rain_factor()
+        return combine_factors(self._temperature_factor(), self._rain_factor())
+
+
+def temperature_factor(time, outdoors, cover_available, humidity,
+                       high_temperature, low_temperature, wind_speed,
+                       cloud_cover):
+    """
+    Determines how advisable it is to continue with an event based on
+    predicted temperature
+
+    Parameters:
+        time (int): Closest hour to the starting time of event
+        outdoors (bool): Whether the event is outdoors
+        cover_available (bool): Whether the event has cover available
+        humidity (int): Predicted humidity
+        high_temperature (float): Predicted high temperature
+        low_temperature (float): Predicted low temperature
+        wind_speed (int): Predicted average wind speed
+        cloud_cover (int): Predicted cloud cover
 
-        if advisability < -5:
-            advisability = -5
-        elif advisability > 5:
-            advisability = 5
+    Return:
+        (float) Temperature Factor
+    """
+    factor = 0
+    humidity_factor = 0
+
+    if humidity > 70:
+        humidity_factor = humidity / 20
+
+    if high_temperature > 0:
+        high_temperature += humidity_factor
+    elif high_temperature < 0:
+        high_temperature -= humidity_factor
+
+    if low_temperature > 0:
+        low_temperature += humidity_factor
+    elif low_temperature < 0:
+        low_temperature -= humidity_factor
+
+    if (time >= 6 and time <= 19 and outdoors and high_temperature >= 30) or high_temperature >= 45:
+        factor = (high_temperature / -5) + 6
+
+        if factor < 0:
+            if cover_available:
+                factor += 1
+            if wind_speed > 3 and wind_speed < 10:
+                factor += 1
+            if cloud_cover > 4:
+                factor += 1
+
+    elif (time >= 0 and time <= 5) or (time >= 20 and time <= 23) \
+         and low_temperature < 5 and high_temperature < 45:
+
+         factor = (low_temperature / 5) - 1.1
+
+    elif low_temperature > 15 and high_temperature < 30:
+        factor = (high_temperature - low_temperature) / 5
+
+    else:
+        factor = 0
+
+    return factor
+
+
+def rain_factor(outdoors, cover_available, chance_of_rain, wind_speed):
+    """
+    Determines how advisable it is to continue with an event based on
+    predicted rainfall
+
+    Parameters:
+        outdoors (bool): Whether the event is outdoors
+        cover_available (bool): Whether the event has cover available
+        chance_of_rain (int): Predicted chance of rain
+        wind_speed (int): Predicted average wind speed
+
+    Return:
+        (float) Rain Factor
+    """
+    if chance_of_rain < 20:
+        factor = (chance_of_rain / -5) + 4
+    elif chance_of_rain > 50:
+        factor = (chance_of_rain / -20) + 1
+    else:
+        factor = 0
+
+    if outdoors and cover_available and wind_speed < 5:
+        factor += 1
+
+    if factor < 2 and wind_speed > 15:
+        factor += (wind_speed / -15)
+
+    if factor < -9:
+        factor = -9
+
+    return factor
+
+
+def combine_factors(temperature, rain):
+    """
+    Combines the temperature and rain factors into an advisability
+
+    Return:
+        (float) Value in range of -5 to +5
+    """
+    advisability = temperature + rain
+
+    if advisability < -5:
+        advisability = -5
+    elif advisability > 5:
+        advisability = 5
+
+    return advisability
+
+
+def forecast_advisability(time, outdoors, cover_available, forecast):
+    """
+    Determines how advisable an event is, given a model's forecast
+
+    Parameters:
+        time (int): Closest hour to the starting time of event
+        outdoors (bool): Whether the event is outdoors
+        cover_available (bool): Whether the event has cover available
+        forecast (tuple): Predicted quantities, in FORECAST_FIELDS order,
+                          as returned by WeatherPrediction.forecast()
+
+    Return:
+        (float) Value in range of -5 to +5
+    """
+    (chance_of_rain, high_temperature, low_temperature, humidity,
+     cloud_cover, wind_speed) = forecast
+    return combine_factors(
+        temperature_factor(time, outdoors, cover_available, humidity,
+                           high_temperature, low_temperature, wind_speed,
+                           cloud_cover),
+        rain_factor(outdoors, cover_available, chance_of_rain, wind_speed))
+
+
+def advisability_table(forecast):
+    """
+    Determines the advisability of every kind of event, given a forecast
+
+    Parameters:
+        forecast (tuple): Predicted quantities, in FORECAST_FIELDS order
+
+    Return:
+        (array<float>) Advisability of an event starting at hour 'time',
+                       indexed by event_key(time, outdoors, cover_available)
+    """
+    return array("d", [forecast_advisability(time, outdoors, cover_available,
+                                             forecast)
+                       for time in range(HOURS)
+                       for outdoors in (False, True)
+                       for cover_available in (False, True)])
+
+
+def event_key(time, outdoors, cover_available):
+    """(int) Position of an event in an advisability_table."""
+    return 4 * time + 2 * bool(outdoors) + bool(cover_available)
+
+
+def batch_advisability(times, outdoors, cover_available, forecasts,
+                       models=None):
+    """
+    Determines how advisable each of many events is, in one pass
+
+    The rules are those of EventDecision.advisability. Each forecast is
+    evaluated once for every kind of event, and each event then looks up
+    its advisability, so the cost per event is a single table lookup.
+
+    Parameters:
+        times (sequence<float>): Starting time of each event, in hours
+        outdoors (sequence<bool>): Whether each event is outdoors
+        cover_available (sequence<bool>): Whether each event has cover
+        forecasts (list<tuple>): Forecast of each model, in FORECAST_FIELDS
+                                 order, as returned by
+                                 WeatherPrediction.forecast()
+        models (sequence<int>): Position in forecasts of the model to score
+                                each event against, or None to score every
+                                event against forecasts[0]
+
+    Return:
+        (array<float>) Advisability of each event, in range of -5 to +5
+    """
+    table = array("d")
+    for forecast in forecasts:
+        table.extend(advisability_table(forecast))
+    if models is None:
+        models = repeat(0)
+
+    # Only the whole hours 0-23 are in the table, so other times, such as
+    # 6.5 or 24, are scored directly.
+    return array("d", [
+        table[TABLE_SIZE * model + 4 * time + 2 * bool(outside) + bool(cover)]
+        if isinstance(time, int) and 0 <= time < HOURS
+        else forecast_advisability(time, outside, cover, forecasts[model])
+        for model, time, outside, cover in zip(models, times, outdoors,
+                                                cover_available)])
+
+
+class AdvisabilitySweep(object):
+    """Advisability of every kind of event against every model and window,
+    held as one table."""
+
+    def __init__(self, model_names, days, values):
+        """
+        Parameters:
+            model_names (list<str>): Names of the models swept, from MODELS
+            days (list<int>): Numbers of days of data swept
+            values (array<float>): Advisability table of each model and
+                                   number of days, in that order, each laid
+                                   out as by advisability_table
+        """
+        self._model_names = model_names
+        self._days = days
+        self._values = values
+
+    def get_model_names(self):
+        """(list<str>) Names of the models swept"""
+        return self._model_names
+
+    def get_days(self):
+        """(list<int>) Numbers of days of data swept"""
+        return self._days
+
+    def get_values(self):
+        """(array<float>) Every advisability, as described in __init__"""
+        return self._values
+
+    def _start(self, model_name, number_days):
+        """(int) Position in values of a model and window's table"""
+        return TABLE_SIZE * (len(self._days) * self._model_names.index(model_name)
+                             + self._days.index(number_days))
+
+    def get_table(self, model_name, number_days):
+        """(array<float>) Advisability of every kind of event for one model
+                          and number of days, as returned by advisability_table"""
+        start = self._start(model_name, number_days)
+        return self._values[start:start + TABLE_SIZE]
+
+    def advisability(self, model_name, number_days, time, outdoors,
+                     cover_available):
+        """(float) Advisability of one kind of event, in range of -5 to +5"""
+        return self._values[self._start(model_name, number_days)
+                            + event_key(time, outdoors, cover_available)]
+
+    def to_dict(self):
+        """(dict) The sweep, in a form that can be written as JSON. "tables"
+                  holds a list per model, of a table per number of days,
+                  in the layout of advisability_table."""
+        return {"models": self._model_names, "days": self._days,
+                "hours": HOURS,
+                "tables": [[list(self.get_table(model_name, number_days))
+                            for number_days in self._days]
+                           for model_name in self._model_names]}
+
+
+def advisability_sweep(weather_data, model_names=None,
+                       days=range(1, MAX_DAYS + 1), max_days=MAX_DAYS):
+    """
+    Determines the advisability of every kind of event against every model
+    and number of days, in one pass
+
+    Each model is built once per number of days, and its forecast is
+    evaluated once for every kind of event. Windows giving the same forecast,
+    such as every window of YesterdaysWeather, share one evaluation.
+
+    Parameters:
+        weather_data (WeatherData): Data used for predicting the weather
+        model_names (list<str>): Names of the models to sweep, or None for all
+        days (iter<int>): Numbers of days of data to sweep
+        max_days (int): Limit on number of days, or None for no limit
+
+    Return:
+        (AdvisabilitySweep) Advisability of each combination
+    """
+    model_names = list(MODELS if model_names is None else model_names)
+    days = list(days)
+    tables = {}
+    values = array("d")
+    for model_name in model_names:
+        for number_days in days:
+            forecast = create_model(model_name, weather_data, number_days,
+                                    max_days).forecast()
+            table = tables.get(forecast)
+            if table is None:
+                table = tables[forecast] = advisability_table(forecast)
+            values.extend(table)
+    return AdvisabilitySweep(model_names, days, values)
+
+
+def _parse_flag(value):
+    """(bool) A yes/no answer given as a JSON boolean or as text."""
+    if isinstance(value, str):
+        return value.lower() in ("y", "yes", "true", "1")
+    return bool(value)
+
+
+def parse_event_request(request):
+    """Reads the event and model of a request for an advisability.
+
+    Parameters:
+        request (dict): Request with "name", "outdoors", "cover", "time",
+                        "model" and optionally "number_days". The model is
+                        one of prediction.MODELS or its menu number.
+
+    Return:
+        (tuple<Event, str, int>) The event, model name and number of days.
+
+    Raises:
+        ValueError: If the request is missing a value or has an invalid one.
+    """
+    if not isinstance(request, dict):
+        raise ValueError("Request must be a JSON object")
+    try:
+        event = Event(str(request["name"]), _parse_flag(request["outdoors"]),
+                      _parse_flag(request["cover"]), int(request["time"]))
+        model_name = request["model"]
+        number_days = int(request.get("number_days", 1))
+    except KeyError as error:
+        raise ValueError(f"Request is missing {error.args[0]!r}") from None
+    except (TypeError, ValueError) as error:
+        raise ValueError(f"Invalid request: {error}") from None
+
+    if not isinstance(model_name, str) or model_name.isdigit():
+        try:
+            model_name = MODEL_CHOICES[int(model_name)]
+        except (KeyError, ValueError):
+            raise ValueError(f"Unknown prediction model: {model_name!r}") from None
+    if model_name not in MODELS:
+        raise ValueError(f"Unknown prediction model: {model_name!r}")
+    if number_days < 1:
+        raise ValueError("number_days must be at least 1")
+    return event, model_name, number_days
+
+
+class BatchDecider(object):
+    """Scores batches of advisability requests against one set of weather data,
+    building each prediction model only once."""
+
+    def __init__(self, weather_data, max_days=MAX_DAYS, cache=None):
+        """
+        Parameters:
+            weather_data (WeatherData | callable): Data used for predicting
+                the weather, or a function returning it, which is only
+                called once a request is not found in the cache.
+            max_days (int): Limit on number_days, or None for no limit.
+            cache (AdvisabilityCache): Results kept from earlier runs against
+                                       the same data, or None for no cache.
+        """
+        self._weather_data = weather_data
+        self._max_days = max_days
+        self._cache = cache
+        self._models = {}
+
+    def get_weather_data(self):
+        """(WeatherData) Data used for predicting the weather."""
+        if callable(self._weather_data):
+            self._weather_data = self._weather_data()
+        return self._weather_data
+
+    def get_model(self, model_name, number_days):
+        """(WeatherPrediction) The model with the given name and window."""
+        key = (model_name, number_days)
+        model = self._models.get(key)
+        if model is None:
+            model = create_model(model_name, self.get_weather_data(),
+                                 number_days, self._max_days)
+            self._models[key] = model
+        return model
+
+    def decide(self, requests):
+        """Determines the advisability of each of a batch of requests.
+
+        Parameters:
+            requests (list<dict>): Requests, as read by parse_event_request.
+
+        Return:
+            (list<dict>) Result of each request, in order: the event name,
+                         model name, number of days used and advisability,
+                         or an "error" message if the request was invalid.
+        """
+        results = [None] * len(requests)
+        positions = []
+        events = []
+        model_indexes = {}
+        models = []
+        for position, request in enumerate(requests):
+            try:
+                event, model_name, number_days = parse_event_request(request)
+            except ValueError as error:
+                results[position] = {"error": str(error)}
+                continue
+            number_days = model_number_days(model_name, number_days,
+                                            self._max_days)
+            if self._cache is not None:
+                cached = self._cache.get(model_name, number_days,
+                                         event.get_time(), event.get_outdoors(),
+                                         event.get_cover_available())
+                if cached is not None:
+                    results[position] = {"name": event.get_name(),
+                                         "model": model_name,
+                                         "number_days": number_days,
+                                         "advisability": cached[1]}
+                    continue
+            key = (model_name, number_days)
+            if key not in model_indexes:
+                model_indexes[key] = len(models)
+                models.append(self.get_model(model_name, number_days))
+            positions.append(position)
+            events.append((event, model_name, model_indexes[key]))
+
+        forecasts = [model.forecast() for model in models]
+        scores = batch_advisability(
+            [event.get_time() for event, _, _ in events],
+            [event.get_outdoors() for event, _, _ in events],
+            [event.get_cover_available() for event, _, _ in events],
+            forecasts, [index for _, _, index in events])
+
+        for position, (event, model_name, index), score in zip(
+                positions, events, scores):
+            results[position] = {"name": event.get_name(),
+                                 "model": model_name,
+                                 "number_days": models[index].get_number_days(),
+                                 "advisability": score}
+        if self._cache is not None and events:
+            self._cache.put_many(
+                (model_name, models[index].get_number_days(), event.get_time(),
+                 event.get_outdoors(), event.get_cover_available(),
+                 forecasts[index], score)
+                for (event, model_name, index), score in zip(events, scores))
+        return results
+
+
+def _is_regular_file(stream):
+    """(bool) True if a stream reads from a regular file, so that all of its
+              lines are available without waiting."""
+    try:
+        return stat.S_ISREG(os.fstat(stream.fileno()).st_mode)
+    except (AttributeError, OSError, ValueError):
+        return False
+
+
+def run_batch(lines, output, weather_data, batch_size=BATCH_SIZE,
+              max_days=MAX_DAYS, cache=None):
+    """Scores advisability requests given as JSON lines.
+
+    Requests are read and scored in batches, and each batch of results is
+    written as soon as it is ready. A batch is only scored once it is full,
+    so requests arriving one at a time from a client waiting on each reply
+    should be scored with a batch_size of 1.
+
+    Parameters:
+        lines (iter<str>): Requests, one JSON object per line.
+                           Blank lines are ignored.
+        output (file): Where to write the results, one JSON object per line.
+        weather_data (WeatherData | callable): Data used for predicting the
+            weather, or a function returning it, as taken by BatchDecider.
+        batch_size (int): Number of requests scored together.
+        max_days (int): Limit on number_days, or None for no limit.
+        cache (AdvisabilityCache): Results kept from earlier runs, or None.
+
+    Return:
+        (int) Number of requests that could not be scored.
+    """
+    decider = BatchDecider(weather_data, max_days, cache)
+    lines = (line for line in lines if line.strip())
+    failures = 0
+    while True:
+        batch = list(islice(lines, batch_size))
+        if not batch:
+            return failures
+
+        requests = []
+        errors = {}
+        for position, line in enumerate(batch):
+            try:
+                requests.append(json.loads(line))
+            except ValueError as error:
+                requests.append(None)
+                errors[position] = f"Invalid JSON: {error}"
+        results = decider.decide(requests)
+        for position, result in enumerate(results):
+            if position in errors:
+                result = {"error": errors[position]}
+            failures += "error" in result
+            output.write(json.dumps(result) + "\n")
+        output.flush()
+
+
+instrumentation.instrument(EventDecision, "_temperature_factor", "_rain_factor",
+                           "advisability")
+instrumentation.instrument(BatchDecider, "decide")
 
-        return advisability
 
 class UserInteraction(object):
     """Simple textual interface to drive program."""
@@ -257,9 +715,59 @@ class UserInteraction(object):
 
 def main():
     """Main application's starting point."""
+    parser = argparse.ArgumentParser(
+        description="Determine how suitable the weather is for planned events.")
+    parser.add_argument("--data", default="weather_data.csv",
+                        help="CSV file of weather data")
+    parser.add_argument("--batch", nargs="?", const="-", metavar="FILE",
+                        help="score JSON lines requests from FILE "
+                             "(or standard input), instead of asking")
+    parser.add_argument("--sweep", action="store_true",
+                        help="write the advisability of every kind of event, "
+                             "model and number of days as JSON")
+    parser.add_argument("--cache", metavar="FILE",
+                        help="keep batch results in this SQLite file, and "
+                             "reuse them while the data is unchanged")
+    arguments = parser.parse_args()
+
+    def load_weather_data():
+        # Predictions use no more than the last MAX_DAYS days of data.
+        weather_data = WeatherData()
+        weather_data.load_tail(arguments.data, MAX_DAYS)
+        return weather_data
+
+    if arguments.batch is not None:
+        # With a cache, the data is only loaded if a result is not cached.
+        cache = None
+        weather_data = load_weather_data
+        if arguments.cache:
+            cache = AdvisabilityCache(arguments.cache, arguments.data)
+        else:
+            weather_data = load_weather_data()
+        try:
+            if arguments.batch == "-":
+                # Requests piped in may each wait on the previous reply, so
+                # are answered as they arrive unless read from a file.
+                batch_size = BATCH_SIZE if _is_regular_file(sys.stdin) else 1
+                failures = run_batch(sys.stdin, sys.stdout, weather_data,
+                                     batch_size, cache=cache)
+            else:
+                with open(arguments.batch) as requests:
+                    failures = run_batch(requests, sys.stdout, weather_data,
+                                         cache=cache)
+        finally:
+            if cache is not None:
+                cache.close()
+        sys.exit(1 if failures else 0)
+
     check_again = True
-    weather_data = WeatherData()
-    weather_data.load("weather_data.csv")
+    weather_data = load_weather_data()
+
+    if arguments.sweep:
+        json.dump(advisability_sweep(weather_data).to_dict(), sys.stdout)
+        print()
+        return
+
     user_interface = UserInteraction()
 
     print("Let's determine how suitable your event is for the predicted weather.")
@@ -0,0 +1,204 @@
+"""
+    Counters and latency histograms for the hot paths of loading weather
+    data, predicting the weather and deciding on events.
+
+    Instrumented methods are only wrapped while instrumentation is enabled,
+    so when it is disabled they run exactly as if it did not exist.
+    Setting the WEATHER_METRICS environment variable enables it on import,
+    and setting WEATHER_METRICS_FILE also writes the metrics to that file,
+    as JSON, when the process exits.
+
+    Histogram: Latency distribution and call count of one method.
+    instrument: Registers methods to be measured while enabled.
+    enable, disable: Switch instrumentation on and off at runtime.
+    snapshot, export_json, export_prometheus: Read out the metrics.
+"""
+
+__author__ = "Youngsu Choi"
+__email__ = "tonymusic0825@gmail.com"
+
+import atexit
+import bisect
+import functools
+import json
+import os
+import threading
+import time
+
+
+# Upper bounds (seconds) of the latency histogram buckets,
+# from 1 microsecond to 10 seconds, with an overflow bucket beyond.
+BUCKETS = tuple(float(f"{mantissa}e{exponent}")
+                for exponent in range(-6, 1)
+                for mantissa in (1, 2.5, 5)) + (10.0,)
+
+
+class Histogram(object):
+    """Latency distribution and call count of one method."""
+
+    def __init__(self, name):
+        """
+        Parameters:
+            name (str): Name of the measured method.
+        """
+        self._name = name
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Discards every observation."""
+        self._counts = [0] * (len(BUCKETS) + 1)
+        self._calls = 0
+        self._errors = 0
+        self._total = 0.0
+        self._maximum = 0.0
+
+    def observe(self, seconds, failed=False):
+        """Records one call, which took 'seconds' and may have failed."""
+        bucket = bisect.bisect_left(BUCKETS, seconds)
+        with self._lock:
+            self._counts[bucket] += 1
+            self._calls += 1
+            self._errors += failed
+            self._total += seconds
+            if seconds > self._maximum:
+                self._maximum = seconds
+
+    def get_name(self):
+        """(str) Name of the measured method."""
+        return self._name
+
+    def get_calls(self):
+        """(int) Number of calls recorded."""
+        return self._calls
+
+    def to_dict(self):
+        """(dict) The metrics, in a form that can be written as JSON.
+                  "buckets" counts the calls no longer than each bound,
+                  cumulatively, with None as the bound beyond the last."""
+        with self._lock:
+            counts = list(self._counts)
+            calls, errors = self._calls, self._errors
+            total, maximum = self._total, self._maximum
+        cumulative = []
+        running = 0
+        for bound, count in zip(BUCKETS + (None,), counts):
+            running += count
+            cumulative.append([bound, running])
+        return {"calls": calls, "errors": errors, "total_seconds": total,
+                "mean_seconds": total / calls if calls else 0.0,
+                "max_seconds": maximum, "buckets": cumulative}
+
+
+# Registered methods: (owner, attribute name, original function, histogram).
+_targets = []
+_histograms = {}
+_enabled = False
+_registry_lock = threading.Lock()
+
+
+def _timed(function, histogram):
+    """Wraps a function so that each call is recorded in a histogram."""
+    @functools.wraps(function)
+    def timed(*args, **kwargs):
+        started = time.perf_counter()
+        failed = True
+        try:
+            result = function(*args, **kwargs)
+            failed = False
+            return result
+        finally:
+            histogram.observe(time.perf_counter() - started, failed)
+
+    return timed
+
+
+def instrument(owner, *attributes):
+    """Registers methods to be measured while instrumentation is enabled.
+
+    Parameters:
+        owner (type): Class defining the methods.
+        attributes (str): Names of the methods, which must be defined by
+                          'owner' itself rather than inherited.
+    """
+    with _registry_lock:
+        for attribute in attributes:
+            original = owner.__dict__[attribute]
+            name = f"{owner.__module__}.{owner.__qualname__}.{attribute}"
+            histogram = _histograms.setdefault(name, Histogram(name))
+            _targets.append((owner, attribute, original, histogram))
+            if _enabled:
+                setattr(owner, attribute, _timed(original, histogram))
+
+
+def enable():
+    """Starts measuring every registered method."""
+    global _enabled
+    with _registry_lock:
+        if not _enabled:
+            for owner, attribute, original, histogram in _targets:
+                setattr(owner, attribute, _timed(original, histogram))
+            _enabled = True
+
+
+def disable():
+    """Stops measuring, restoring every registered method as it was."""
+    global _enabled
+    with _registry_lock:
+        if _enabled:
+            for owner, attribute, original, _ in _targets:
+                setattr(owner, attribute, original)
+            _enabled = False
+
+
+def is_enabled():
+    """(bool) True if registered methods are being measured."""
+    return _enabled
+
+
+def reset():
+    """Discards every recorded observation."""
+    for histogram in list(_histograms.values()):
+        histogram.reset()
+
+
+def snapshot():
+    """(dict<str, dict>) Metrics of each registered method, by name."""
+    return {name: histogram.to_dict()
+            for name, histogram in sorted(_histograms.items())}
+
+
+def export_json(metrics_file):
+    """Writes a snapshot of the metrics to a file, as JSON."""
+    with open(metrics_file, "w") as output:
+        json.dump({"enabled": _enabled, "timestamp": time.time(),
+                   "metrics": snapshot()}, output, indent=2)
+
+
+def export_prometheus():
+    """(str) The metrics, in the Prometheus text exposition format."""
+    # Each metric family must be written as one group, after its TYPE line.
+    metrics = snapshot()
+    lines = ["# TYPE weather_call_seconds histogram"]
+    for name, method_metrics in metrics.items():
+        label = f'method="{name}"'
+        for bound, count in method_metrics["buckets"]:
+            bound = "+Inf" if bound is None else repr(bound)
+            lines.append(f'weather_call_seconds_bucket{{{label},le="{bound}"}} {count}')
+        lines.append(f"weather_call_seconds_sum{{{label}}} {method_metrics['total_seconds']!r}")
+        lines.append(f"weather_call_seconds_count{{{label}}} {method_metrics['calls']}")
+    lines.append("# TYPE weather_call_errors_total counter")
+    for name, method_metrics in metrics.items():
+        lines.append(f'weather_call_errors_total{{method="{name}"}} {method_metrics["errors"]}')
+    return "\n".join(lines) + "\n"
+
+
+def dump_on_exit(metrics_file):
+    """Writes the metrics to a file, as JSON, when the process exits."""
+    atexit.register(export_json, metrics_file)
+
+
+if os.environ.get("WEATHER_METRICS"):
+    enable()
+if os.environ.get("WEATHER_METRICS_FILE"):
+    dump_on_exit(os.environ["WEATHER_METRICS_FILE"])
@@ -3,12 +3,221 @@
 
     WeatherPrediction: Defines the super class for all weather prediction models.
     YesterdaysWeather: Predict weather to be similar to yesterday's weather.
+    SimplePrediction: Predict weather from averages over the past days.
+    SophisticatedPrediction: Predict weather from averages and air pressure.
+    ForecastCache: Cache of predicted quantities shared by all models.
+    WindowStatistics: Every statistic of a window of days used by the models.
 """
 
 __author__ = "Youngsu Choi"
 __email__ = "tonymusic0825@gmail.com"
 
-from weather_data import WeatherData
+import functools
+import threading
+from array import array
+from collections import OrderedDict, deque
+from operator import methodcaller
+
+import instrumentation
+from weather_data import EASTERLY, GETTERS, SUMMED_FIELDS, WeatherData
+
+
+# Default limit on the number of days of data used by multi-day models.
+MAX_DAYS = 28
+
+# Quantities predicted by every model, in the order returned by forecast().
+FORECAST_FIELDS = ("chance_of_rain", "high_temperature", "low_temperature",
+                   "humidity", "cloud_cover", "wind_speed")
+
+
+# Default number of predicted quantities kept by the forecast cache.
+FORECAST_CACHE_SIZE = 4096
+
+
+class ForecastCache(object):
+    """Bounded cache of predicted quantities, discarding the least recently
+    used when full."""
+
+    def __init__(self, max_size=FORECAST_CACHE_SIZE):
+        """
+        Parameters:
+            max_size (int): Maximum number of quantities to keep.
+        """
+        self._max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, key, default=None):
+        """Returns the cached value for key, or default if it is not cached."""
+        with self._lock:
+            try:
+                value = self._entries[key]
+            except KeyError:
+                self._misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return value
+
+    def put(self, key, value):
+        """Caches value for key, discarding old entries if the cache is full."""
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Discards every cached value."""
+        with self._lock:
+            self._entries.clear()
+
+    def set_max_size(self, max_size):
+        """Changes the maximum number of quantities kept."""
+        with self._lock:
+            self._max_size = max_size
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+
+    def get_max_size(self):
+        """(int) Maximum number of quantities kept."""
+        return self._max_size
+
+    def get_hits(self):
+        """(int) Number of lookups that found a cached value."""
+        return self._hits
+
+    def get_misses(self):
+        """(int) Number of lookups that did not find a cached value."""
+        return self._misses
+
+    def __len__(self):
+        return len(self._entries)
+
+
+# Cache shared by every prediction model.
+forecast_cache = ForecastCache()
+
+_MISSING = object()
+
+
+def cached_forecast(method):
+    """Decorates a forecast method of a WeatherPrediction so that its result
+    is computed once per model type, number of days and data version.
+
+    Models whose data version is None are only cached per instance.
+    """
+    name = method.__name__
+
+    @functools.wraps(method)
+    def cached(self):
+        try:
+            return self._forecasts[name]
+        except KeyError:
+            pass
+        if self._data_version is None:
+            value = self._forecasts[name] = method(self)
+            return value
+        key = (type(self), self.get_number_days(), self._data_version, name)
+        value = forecast_cache.get(key, _MISSING)
+        if value is _MISSING:
+            value = method(self)
+            forecast_cache.put(key, value)
+        self._forecasts[name] = value
+        return value
+
+    return cached
+
+
+def _limit_days(number_days, max_days):
+    """(int) number_days, limited to max_days unless max_days is None."""
+    if max_days is not None and number_days > max_days:
+        return max_days
+    return number_days
+
+
+class WindowStatistics(object):
+    """Every statistic of the most recent days of weather data that is used
+    by the multi-day models, computed together so that each day is read once.
+
+    Has the same methods as RollingWindow, so models can read either.
+    """
+
+    def __init__(self, weather_data, number_days):
+        """
+        Parameters:
+            weather_data (WeatherData): Collection of weather data.
+            number_days (int): Number of days in the window.
+
+        Pre-condition:
+            weather_data.size() > 0
+        """
+        self._number_days = number_days
+        self._count = min(number_days, weather_data.size())
+        # Totals come from the cumulative sums, without reading the days.
+        self._sums = {field: weather_data.window_sum(field, number_days)
+                      for field in SUMMED_FIELDS}
+        self._maximum_high = max(
+            weather_data.get_column("temperature_high", number_days))
+        self._minimum_low = min(
+            weather_data.get_column("temperature_low", number_days))
+        # A copy, as the cache would otherwise keep every collection alive.
+        self._last_day = weather_data.get_data(1)[-1].to_item()
+
+    def get_number_days(self):
+        """(int) Number of days in the window once full."""
+        return self._number_days
+
+    def get_count(self):
+        """(int) Number of days in the window."""
+        return self._count
+
+    def get_sum(self, field):
+        """(float) Total of a field, one of SUMMED_FIELDS, over the window."""
+        return self._sums[field]
+
+    def get_maximum_high_temperature(self):
+        """(float) Greatest high temperature in the window."""
+        return self._maximum_high
+
+    def get_minimum_low_temperature(self):
+        """(float) Least low temperature in the window."""
+        return self._minimum_low
+
+    def get_last_day(self):
+        """(WeatherDataItem) Most recent day in the window."""
+        return self._last_day
+
+
+# Default number of windows kept by the statistics cache.
+STATISTICS_CACHE_SIZE = 256
+
+# Cache of window statistics, shared by every model reading the same window.
+statistics_cache = ForecastCache(STATISTICS_CACHE_SIZE)
+
+
+def window_statistics(weather_data, number_days):
+    """Returns the statistics of the most recent days of weather data,
+    computing them only once per data version and number of days.
+
+    Parameters:
+        weather_data (WeatherData): Collection of weather data.
+        number_days (int): Number of days in the window.
+
+    Return:
+        (WindowStatistics) Statistics of the window.
+    """
+    version = weather_data.get_version()
+    if version is None:
+        return WindowStatistics(weather_data, number_days)
+    key = (version, number_days)
+    statistics = statistics_cache.get(key)
+    if statistics is None:
+        statistics = WindowStatistics(weather_data, number_days)
+        statistics_cache.put(key, statistics)
+    return statistics
 
 
 class WeatherPrediction(object):
@@ -23,6 +232,8 @@ class WeatherPrediction(object):
             weather_data.size() > 0
         """
         self._weather_data = weather_data
+        self._data_version = weather_data.get_version()
+        self._forecasts = {}
 
     def get_number_days(self):
         """(int) Number of days of data being used in prediction"""
@@ -52,6 +263,12 @@ class WeatherPrediction(object):
         """(int) Expected average wind speed."""
         raise NotImplementedError
 
+    def forecast(self):
+        """(tuple) Every predicted quantity, in FORECAST_FIELDS order."""
+        return (self.chance_of_rain(), self.high_temperature(),
+                self.low_temperature(), self.humidity(), self.cloud_cover(),
+                self.wind_speed())
+
 
 class YesterdaysWeather(WeatherPrediction):
     """Simple prediction model, based on yesterday's weather."""
@@ -65,13 +282,14 @@ class YesterdaysWeather(WeatherPrediction):
             weather_data.size() > 0
         """
         super().__init__(weather_data)
-        self._yesterdays_weather = self._weather_data.get_data(1)
-        self._yesterdays_weather = self._yesterdays_weather[0]
+        # A copy, so that the model still works once the data is reloaded.
+        self._yesterdays_weather = self._weather_data.get_data(1)[0].to_item()
 
     def get_number_days(self):
         """(int) Number of days of data being used in prediction"""
         return 1
 
+    @cached_forecast
     def chance_of_rain(self):
         """(int) Percentage indicating chance of rain occurring."""
         # Amount of yesterday's rain indicating chance of it occurring.
@@ -95,43 +313,46 @@ class YesterdaysWeather(WeatherPrediction):
 
         return chance_of_rain
 
+    @cached_forecast
     def high_temperature(self):
         """(float) Expected high temperature."""
         return self._yesterdays_weather.get_high_temperature()
 
+    @cached_forecast
     def low_temperature(self):
         """(float) Expected low temperature."""
         return self._yesterdays_weather.get_low_temperature()
 
+    @cached_forecast
     def humidity(self):
         """(int) Expected humidity."""
         return self._yesterdays_weather.get_humidity()
 
+    @cached_forecast
     def wind_speed(self):
         """(int) Expected average wind speed."""
         return self._yesterdays_weather.get_average_wind_speed()
 
+    @cached_forecast
     def cloud_cover(self):
         """(int) Expected amount of cloud cover."""
         return self._yesterdays_weather.get_cloud_cover()
 
 class SimplePrediction(WeatherPrediction):
     """Simple prediction model, based on the weather of multiple days."""
-    def __init__(self, weather_data, number_days):
+    def __init__(self, weather_data, number_days, max_days=MAX_DAYS):
         """
         Parameters:
             weather_data (WeatherData): Collection of weather data.
             number_days (int): Numbers of days being used to predict weather
+            max_days (int): Limit on number_days, or None for no limit.
 
         Pre-condition:
             weather_data.size() > 0
         """
-        if number_days > 28:
-            self._number_days = 28
-        else:
-            self._number_days = number_days
+        self._number_days = _limit_days(number_days, max_days)
         super().__init__(weather_data)
-        self._past_weather_list = self._weather_data.get_data(self._number_days)
+        self._window = window_statistics(self._weather_data, self._number_days)
 
     def get_number_days(self):
         """(int) The number of days being used to predict weather"""
@@ -176,77 +397,77 @@ class SimplePrediction(WeatherPrediction):
         temperature_list = []
 
         if information == "high_temperature":
-            for weather in self._past_weather_list:
+            for weather in weather_list:
                 temperature_list.append(weather.get_high_temperature())
 
         elif information == "low_temperature":
-            for weather in self._past_weather_list:
+            for weather in weather_list:
                 temperature_list.append(weather.get_low_temperature())
 
         temperature_list = sorted(temperature_list)
         return temperature_list
 
-    def chance_of_rain(self):
-        """(int) Percentage indicating chance of rain occurring."""
-        average_rainfall = 0
+    def get_window(self):
+        """(WindowStatistics) Statistics of the days predicted from."""
+        return self._window
 
-        for weather in self._past_weather_list:
-            average_rainfall += weather.get_rainfall()
+    def _window_average(self, field):
+        """(float) Total of 'field' over the past days, per day predicted on."""
+        return self._window.get_sum(field) / self._number_days
 
-        average_rainfall = round((average_rainfall/self._number_days) * 9)
+    @cached_forecast
+    def chance_of_rain(self):
+        """(int) Percentage indicating chance of rain occurring."""
+        average_rainfall = round(self._window_average("rain") * 9)
 
         if average_rainfall > 100:
             average_rainfall = 100
 
         return average_rainfall
 
+    @cached_forecast
     def high_temperature(self):
         """(int) The highest temperature in the past days."""
-        high_temperature_list = self.get_temperature(self._past_weather_list, "high_temperature")
-        highest_temperature = high_temperature_list[-1]
-        return highest_temperature
+        return self._window.get_maximum_high_temperature()
 
+    @cached_forecast
     def low_temperature(self):
         """(int) The lowest temperature the past days."""
-        low_temperature_list = self.get_temperature(self._past_weather_list, "low_temperature")
-        lowest_temperature = low_temperature_list[0]
-        return lowest_temperature
+        return self._window.get_minimum_low_temperature()
 
+    @cached_forecast
     def humidity(self):
         """(int) Expected humidity."""
-        return self.get_average(self._past_weather_list, "humidity")
+        return round(self._window_average("humidity"))
 
+    @cached_forecast
     def cloud_cover(self):
         """(int) Expected amount of average cloud cover."""
-        return self.get_average(self._past_weather_list, "cloud_cover")
+        return round(self._window_average("cloud_cover"))
 
+    @cached_forecast
     def wind_speed(self):
         """(int) Expected average wind speed."""
-        return self.get_average(self._past_weather_list, "wind_speed")
+        return round(self._window_average("wind_speed_average"))
 
 class SophisticatedPrediction(WeatherPrediction):
     """Sophisticated prediction model, based on the weather of multiple days."""
-    def __init__(self, weather_data, number_days):
+    def __init__(self, weather_data, number_days, max_days=MAX_DAYS):
         """
         Parameters:
             weather_data (WeatherData): Collection of weather data.
             number_days (int): Numbers of days being used to predict weather
+            max_days (int): Limit on number_days, or None for no limit.
 
         Pre-condition:
             weather_data.size() > 0
         """
         super().__init__(weather_data)
-        if number_days > 28:
-            self._number_days = 28
-        else:
-            self._number_days = number_days
-
-        self._past_weather_list = self._weather_data.get_data(self._number_days)
+        self._number_days = _limit_days(number_days, max_days)
+        self._window = window_statistics(self._weather_data, self._number_days)
 
-        air_pressure = 0
-        for weather in self._past_weather_list:
-            air_pressure += weather.get_air_pressure()
-        self._air_pressure = air_pressure / self._number_days
+        self._last_day = self._window.get_last_day()
+        self._air_pressure = self._window_average("air_pressure")
 
     def get_number_days(self):
         """(int) The number of days being used to predict weather"""
@@ -290,16 +511,25 @@ class SophisticatedPrediction(WeatherPrediction):
         average = average / self._number_days
         return average
 
+    def get_window(self):
+        """(WindowStatistics) Statistics of the days predicted from."""
+        return self._window
+
+    def _window_average(self, field):
+        """(float) Total of 'field' over the past days, per day predicted on."""
+        return self._window.get_sum(field) / self._number_days
+
+    @cached_forecast
     def chance_of_rain(self):
         """(int) Percentage indicating chance of rain occurring."""
-        rainfall = self.get_average(self._past_weather_list, "rainfall")
+        rainfall = self._window_average("rain")
 
-        if self._past_weather_list[-1].get_air_pressure() < self._air_pressure:
+        if self._last_day.get_air_pressure() < self._air_pressure:
             rainfall = rainfall * 10
         else:
             rainfall = rainfall * 7
 
-        if 'E' in self._past_weather_list[-1].get_wind_direction():
+        if self._last_day.get_wind_flags() & EASTERLY:
             rainfall = round(rainfall * 1.2)
         else:
             rainfall = round(rainfall)
@@ -309,31 +539,34 @@ class SophisticatedPrediction(WeatherPrediction):
 
         return rainfall
 
+    @cached_forecast
     def high_temperature(self):
         """(float) Expected high temperature."""
-        high_temperature = self.get_average(self._past_weather_list, "high_temperature")
+        high_temperature = self._window_average("temperature_high")
 
-        if self._past_weather_list[-1].get_air_pressure() > self._air_pressure:
+        if self._last_day.get_air_pressure() > self._air_pressure:
             high_temperature += 2
 
         return high_temperature
 
+    @cached_forecast
     def low_temperature(self):
         """(float) Expected low temperature."""
-        low_temperature = self.get_average(self._past_weather_list, "low_temperature")
+        low_temperature = self._window_average("temperature_low")
 
-        if self._past_weather_list[-1].get_air_pressure() < self._air_pressure:
+        if self._last_day.get_air_pressure() < self._air_pressure:
             low_temperature -= 2
 
         return low_temperature
 
+    @cached_forecast
     def humidity(self):
         """(int) Expected humidity."""
-        humidity = self.get_average(self._past_weather_list, "humidity")
+        humidity = self._window_average("humidity")
 
-        if self._past_weather_list[-1].get_air_pressure() < self._air_pressure:
+        if self._last_day.get_air_pressure() < self._air_pressure:
             humidity = round(humidity + 15)
-        elif self._past_weather_list[-1].get_air_pressure() > self._air_pressure:
+        elif self._last_day.get_air_pressure() > self._air_pressure:
             humidity = round(humidity - 15)
         else:
             humidity = round(humidity)
@@ -345,11 +578,12 @@ class SophisticatedPrediction(WeatherPrediction):
 
         return humidity
 
+    @cached_forecast
     def cloud_cover(self):
         """(int) Expected amount of average cloud cover."""
-        cloud_cover = self.get_average(self._past_weather_list, "cloud_cover")
+        cloud_cover = self._window_average("cloud_cover")
 
-        if self._past_weather_list[-1].get_air_pressure() < self._air_pressure:
+        if self._last_day.get_air_pressure() < self._air_pressure:
             cloud_cover = round(cloud_cover + 2)
         else:
             cloud_cover = round(cloud_cover)
@@ -359,11 +593,12 @@ class SophisticatedPrediction(WeatherPrediction):
 
         return cloud_cover
 
+    @cached_forecast
     def wind_speed(self):
         """(int) Expected average wind speed."""
-        wind_speed = self.get_average(self._past_weather_list, "wind_speed")
+        wind_speed = self._window_average("wind_speed_average")
 
-        if self._past_weather_list[-1].get_maximum_wind_speed() > 4 * wind_speed:
+        if self._last_day.get_maximum_wind_speed() > 4 * wind_speed:
             wind_speed = round(wind_speed * 1.2)
         else:
             wind_speed = round(wind_speed)
@@ -373,6 +608,301 @@ class SophisticatedPrediction(WeatherPrediction):
 # Your implementations of the SimplePrediction and SophisticatedPrediction
 # classes should go here.
 
+class _RunningSum(object):
+    """Sum of a changing set of values, kept as an unevaluated pair of floats
+    so that adding and removing values does not accumulate rounding error."""
+
+    __slots__ = ("_total", "_error")
+
+    def __init__(self):
+        self._total = 0.0
+        self._error = 0.0
+
+    def add(self, value):
+        """Adds value to the sum; adding its negative removes it."""
+        total = self._total + value
+        rounding = total - self._total
+        self._error += (self._total - (total - rounding)) + (value - rounding)
+        self._total = total
+
+    def get(self):
+        """(float) The sum."""
+        return self._total + self._error
+
+
+class RollingWindow(object):
+    """Running statistics of the most recent days of weather data.
+
+    Each new day is added in constant time, evicting the oldest day once
+    the window is full, so statistics never need recomputing from scratch.
+    """
+
+    def __init__(self, number_days):
+        """
+        Parameters:
+            number_days (int): Number of days in the window.
+        """
+        self._number_days = number_days
+        self._days = deque()
+        self._sums = {field: _RunningSum() for field in SUMMED_FIELDS}
+        # Positions and values of the days that may yet be the greatest high,
+        # or least low, temperature in the window, in decreasing (increasing)
+        # order of temperature.
+        self._maximum_highs = deque()
+        self._minimum_lows = deque()
+        self._position = 0
+        self._last_day = None
+
+    def push(self, weather_item):
+        """Adds a day as the most recent, evicting the oldest if full.
+
+        Parameters:
+            weather_item (WeatherDataItem): Weather data for the day.
+        """
+        values = tuple(_SUMMED_GETTERS[field](weather_item)
+                       for field in SUMMED_FIELDS)
+        self._days.append(values)
+        for running_sum, value in zip(self._sums.values(), values):
+            running_sum.add(value)
+        if len(self._days) > self._number_days:
+            for running_sum, value in zip(self._sums.values(),
+                                          self._days.popleft()):
+                running_sum.add(-value)
+
+        position = self._position
+        self._position += 1
+        oldest = self._position - self._number_days
+        high = weather_item.get_high_temperature()
+        low = weather_item.get_low_temperature()
+        _push_extreme(self._maximum_highs, position, high, oldest,
+                      lambda kept: kept <= high)
+        _push_extreme(self._minimum_lows, position, low, oldest,
+                      lambda kept: kept >= low)
+        self._last_day = weather_item.to_item()
+
+    def get_number_days(self):
+        """(int) Number of days in the window once full."""
+        return self._number_days
+
+    def get_count(self):
+        """(int) Number of days currently in the window."""
+        return len(self._days)
+
+    def get_sum(self, field):
+        """(float) Total of a field, one of SUMMED_FIELDS, over the window."""
+        return self._sums[field].get()
+
+    def get_maximum_high_temperature(self):
+        """(float) Greatest high temperature in the window."""
+        return self._maximum_highs[0][1]
+
+    def get_minimum_low_temperature(self):
+        """(float) Least low temperature in the window."""
+        return self._minimum_lows[0][1]
+
+    def get_last_day(self):
+        """(WeatherDataItem) Most recent day in the window."""
+        return self._last_day
+
+
+_SUMMED_GETTERS = {field: methodcaller(GETTERS[field]) for field in SUMMED_FIELDS}
+
+
+def _push_extreme(extremes, position, value, oldest, dominated):
+    """Adds a day to a monotonic deque of candidate extreme values.
+
+    Parameters:
+        extremes (deque<tuple<int, float>>): Positions and values of candidates.
+        position (int): Position of the new day.
+        value (float): Value of the new day.
+        oldest (int): Position of the oldest day still in the window.
+        dominated (callable): True for a kept value that the new value makes
+                              redundant.
+    """
+    while extremes and dominated(extremes[-1][1]):
+        extremes.pop()
+    extremes.append((position, value))
+    while extremes[0][0] < oldest:
+        extremes.popleft()
+
+
+class RollingSimplePrediction(SimplePrediction):
+    """SimplePrediction that is updated in place, in constant time, as each
+    new day of weather data arrives."""
+
+    def __init__(self, weather_data, number_days, max_days=MAX_DAYS):
+        """
+        Parameters:
+            weather_data (WeatherData): Initial weather data, or None to
+                                        start with no days.
+            number_days (int): Numbers of days being used to predict weather
+            max_days (int): Limit on number_days, or None for no limit.
+
+        Pre-condition:
+            At least one day has been added before predicting.
+        """
+        self._number_days = _limit_days(number_days, max_days)
+        self._weather_data = weather_data
+        self._window = RollingWindow(self._number_days)
+        self._data_version = None
+        self._forecasts = {}
+        if weather_data is not None:
+            for weather_item in weather_data.get_data(self._number_days):
+                self.push(weather_item)
+
+    def push(self, weather_item):
+        """Adds a day as the most recent, evicting the oldest if needed.
+
+        Parameters:
+            weather_item (WeatherDataItem): Weather data for the day.
+        """
+        self._window.push(weather_item)
+        self._forecasts.clear()
+
+    def get_window(self):
+        """(RollingWindow) Running statistics of the days predicted from."""
+        return self._window
+
+
+class RollingSophisticatedPrediction(SophisticatedPrediction):
+    """SophisticatedPrediction that is updated in place, in constant time, as
+    each new day of weather data arrives."""
+
+    def __init__(self, weather_data, number_days, max_days=MAX_DAYS):
+        """
+        Parameters:
+            weather_data (WeatherData): Initial weather data, or None to
+                                        start with no days.
+            number_days (int): Numbers of days being used to predict weather
+            max_days (int): Limit on number_days, or None for no limit.
+
+        Pre-condition:
+            At least one day has been added before predicting.
+        """
+        self._number_days = _limit_days(number_days, max_days)
+        self._weather_data = weather_data
+        self._window = RollingWindow(self._number_days)
+        self._data_version = None
+        self._forecasts = {}
+        self._last_day = None
+        self._air_pressure = None
+        if weather_data is not None:
+            for weather_item in weather_data.get_data(self._number_days):
+                self.push(weather_item)
+
+    def push(self, weather_item):
+        """Adds a day as the most recent, evicting the oldest if needed.
+
+        Parameters:
+            weather_item (WeatherDataItem): Weather data for the day.
+        """
+        self._window.push(weather_item)
+        self._forecasts.clear()
+        self._last_day = self._window.get_last_day()
+        self._air_pressure = self._window_average("air_pressure")
+
+    def get_window(self):
+        """(RollingWindow) Running statistics of the days predicted from."""
+        return self._window
+
+# Prediction models, by the name used to select them.
+MODELS = OrderedDict([
+    ("yesterday", YesterdaysWeather),
+    ("simple", SimplePrediction),
+    ("sophisticated", SophisticatedPrediction),
+])
+
+# Models updated in place as each day arrives, by the name of the model
+# whose predictions they make.
+ROLLING_MODELS = OrderedDict([
+    ("simple", RollingSimplePrediction),
+    ("sophisticated", RollingSophisticatedPrediction),
+])
+
+instrumentation.instrument(WeatherPrediction, "forecast")
+for _model in MODELS.values():
+    instrumentation.instrument(_model, *FORECAST_FIELDS)
+
+
+def model_number_days(name, number_days=1, max_days=MAX_DAYS):
+    """Returns the number of days of data a model would use, without
+    building it.
+
+    Parameters:
+        name (str): Name of the model, one of MODELS.
+        number_days (int): Numbers of days requested.
+        max_days (int): Limit on number_days, or None for no limit.
+
+    Return:
+        (int) Number of days the model created by create_model would use.
+    """
+    if MODELS[name] is YesterdaysWeather:
+        return 1
+    return _limit_days(number_days, max_days)
+
+
+def create_model(name, weather_data, number_days=1, max_days=MAX_DAYS):
+    """Creates a prediction model selected by name.
+
+    Parameters:
+        name (str): Name of the model, one of MODELS.
+        weather_data (WeatherData): Collection of weather data.
+        number_days (int): Numbers of days being used to predict weather.
+                           Ignored by YesterdaysWeather.
+        max_days (int): Limit on number_days, or None for no limit.
+
+    Return:
+        (WeatherPrediction) The prediction model.
+
+    Raises:
+        ValueError: If name is not one of MODELS.
+    """
+    try:
+        model = MODELS[name]
+    except KeyError:
+        raise ValueError(f"Unknown prediction model: {name!r}") from None
+    if model is YesterdaysWeather:
+        return model(weather_data)
+    return model(weather_data, number_days, max_days)
+
+
+def forecast_series(weather_data, name, number_days, max_days=MAX_DAYS, start=0):
+    """Makes the forecast of a model on every day of the data, from the days
+    up to and including that day, in one pass over the data.
+
+    Each forecast is the same as that of the model created by create_model
+    with the data up to that day, but the model is updated in constant time
+    from one day to the next rather than being created again.
+
+    Parameters:
+        weather_data (WeatherData): Collection of weather data.
+        name (str): Name of the model, one of ROLLING_MODELS.
+        number_days (int): Numbers of days being used to predict weather.
+        max_days (int): Limit on number_days, or None for no limit.
+        start (int): First day to forecast on, counting from 0.
+
+    Return:
+        (dict<str, array>) Columns of the forecasts, ordered by day: "date",
+                           the ordinal of the day each forecast was made on,
+                           and each of FORECAST_FIELDS, as floats.
+
+    Raises:
+        ValueError: If name is not one of ROLLING_MODELS.
+    """
+    try:
+        model = ROLLING_MODELS[name](None, number_days, max_days)
+    except KeyError:
+        raise ValueError(f"No rolling prediction model: {name!r}") from None
+
+    series = {"date": array("i", weather_data.get_column("date")[start:])}
+    columns = [series.setdefault(field, array("d")) for field in FORECAST_FIELDS]
+    for day, weather_item in enumerate(weather_data.get_data(weather_data.size())):
+        model.push(weather_item)
+        if day >= start:
+            for column, value in zip(columns, model.forecast()):
+                column.append(value)
+    return series
+
 
 if __name__ == "__main__":
     print("This module provides the weather prediction models",
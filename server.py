@@ -0,0 +1,276 @@
+"""
+    Long-running local service answering advisability requests, keeping the
+    weather data and prediction models loaded between requests.
+
+    Clients connect over TCP and send one JSON object per line:
+        {"op": "advise", "name": ..., "outdoors": ..., "cover": ...,
+         "time": ..., "model": ..., "number_days": ...}
+            Scores an event, as in event_decision.py's batch mode.
+            "op" may be left out, and any "id" is copied to the reply.
+        {"op": "reload", "path": ...}
+            Loads the weather data again, from "path" if given,
+            without dropping any connections.
+        {"op": "ping"}
+            Checks that the service is running.
+    Each request gets one JSON line in reply, in the order requests were sent.
+    The weather data can also be reloaded automatically whenever its file
+    changes, with the --watch option.
+
+    AdvisabilityServer: Batches concurrent requests into one evaluation pass.
+"""
+
+__author__ = "Youngsu Choi"
+__email__ = "tonymusic0825@gmail.com"
+
+import argparse
+import asyncio
+import json
+
+from weather_data import WeatherData
+from prediction import MAX_DAYS
+from event_decision import BATCH_SIZE, BatchDecider
+from watcher import WeatherDataWatcher
+
+
+# Default address the service listens on.
+HOST = "127.0.0.1"
+PORT = 8765
+# Default time (seconds) to wait for more requests to join a batch.
+BATCH_WINDOW = 0.002
+
+
+class AdvisabilityServer(object):
+    """Answers advisability requests, batching together those that arrive
+    within a short window of each other."""
+
+    def __init__(self, weather_file, batch_window=BATCH_WINDOW,
+                 batch_size=BATCH_SIZE, max_days=MAX_DAYS, watch_interval=None):
+        """
+        Parameters:
+            weather_file (str): Name of the CSV file containing the weather data.
+            batch_window (float): Time (seconds) to wait for more requests
+                                  before scoring a batch.
+            batch_size (int): Number of requests that are scored at once
+                              without waiting for the window to end.
+            max_days (int): Limit on number_days, or None for no limit.
+            watch_interval (float): Time (seconds) between checks of the
+                                    weather data file for changes, which are
+                                    then loaded, or None not to check.
+        """
+        self._weather_file = weather_file
+        self._batch_window = batch_window
+        self._batch_size = batch_size
+        self._max_days = max_days
+        self._watch_interval = watch_interval
+        self._decider = BatchDecider(self._load(weather_file), max_days)
+        self._watcher = None
+        self._pending = []
+        self._flush_handle = None
+
+    @staticmethod
+    def _load(weather_file):
+        """(WeatherData) Weather data loaded from a CSV file."""
+        weather_data = WeatherData()
+        weather_data.load(weather_file)
+        return weather_data
+
+    def advise(self, request):
+        """Queues a request to be scored in the next batch.
+
+        Parameters:
+            request (dict): Request, as read by parse_event_request.
+
+        Return:
+            (asyncio.Future<dict>) Result of the request.
+        """
+        loop = asyncio.get_running_loop()
+        result = loop.create_future()
+        self._pending.append((request, result))
+        if len(self._pending) >= self._batch_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self._batch_window, self._flush)
+        return result
+
+    def _flush(self):
+        """Scores every queued request in one pass."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        pending, self._pending = self._pending, []
+        if not pending:
+            return
+
+        try:
+            results = self._decider.decide([request for request, _ in pending])
+        except Exception as error:
+            results = [{"error": f"Internal error: {error}"}] * len(pending)
+        for (_, future), result in zip(pending, results):
+            if not future.done():
+                future.set_result(result)
+
+    async def reload(self, weather_file=None):
+        """Loads the weather data again and swaps it in once ready.
+
+        Requests keep being answered from the old data while the new data
+        is loaded in a background thread. If the service is watching the
+        weather data file, it watches the reloaded file from then on.
+
+        Parameters:
+            weather_file (str): CSV file to load, or None for the current one.
+
+        Return:
+            (dict) Number of days and version of the new data.
+        """
+        loop = asyncio.get_running_loop()
+        weather_file = weather_file or self._weather_file
+        if self._watcher is None:
+            weather_data = await loop.run_in_executor(None, self._load,
+                                                      weather_file)
+        else:
+            # The new watcher loads the data, so that it picks up any change
+            # made to the file while loading.
+            watcher = await loop.run_in_executor(None, self._new_watcher, loop,
+                                                 weather_file)
+            previous, self._watcher = self._watcher, watcher
+            await loop.run_in_executor(None, previous.stop)
+            watcher.start()
+            weather_data = watcher.get()
+        self._weather_file = weather_file
+        self._swap(weather_data)
+        return {"size": weather_data.size(),
+                "version": weather_data.get_version()}
+
+    def _swap(self, weather_data):
+        """Answers requests from new weather data from now on."""
+        # Score requests queued against the old data before swapping.
+        self._flush()
+        self._decider = BatchDecider(weather_data, self._max_days)
+
+    def _new_watcher(self, loop, weather_file, weather_data=None):
+        """Returns a watcher of a weather data file, not yet started, whose
+        updates are swapped in while it is the service's watcher.
+
+        Parameters:
+            loop (asyncio.AbstractEventLoop): Loop the service runs in.
+            weather_file (str): Name of the CSV file to watch.
+            weather_data (WeatherData): Data already loaded from the file,
+                                        or None to load it now.
+        """
+        def update(updated):
+            loop.call_soon_threadsafe(self._swap_watched, watcher, updated)
+
+        watcher = WeatherDataWatcher(weather_file, self._watch_interval, update,
+                                     weather_data)
+        return watcher
+
+    def _swap_watched(self, watcher, weather_data):
+        """Swaps in an update from a watcher, unless a reload has replaced it."""
+        if watcher is self._watcher:
+            self._swap(weather_data)
+
+    async def _respond(self, message):
+        """(dict) The reply to one request line."""
+        try:
+            request = json.loads(message)
+        except ValueError as error:
+            return {"error": f"Invalid JSON: {error}"}
+        if not isinstance(request, dict):
+            return {"error": "Request must be a JSON object"}
+
+        operation = request.get("op", "advise")
+        if operation == "advise":
+            reply = dict(await self.advise(request))
+        elif operation == "reload":
+            try:
+                reply = await self.reload(request.get("path"))
+            except (OSError, ValueError) as error:
+                reply = {"error": f"Reload failed: {error}"}
+        elif operation == "ping":
+            reply = {"size": self._decider.get_weather_data().size()}
+        else:
+            reply = {"error": f"Unknown operation: {operation!r}"}
+
+        if "id" in request:
+            reply["id"] = request["id"]
+        return reply
+
+    async def handle_connection(self, reader, writer):
+        """Answers the requests sent over one connection, in order.
+
+        Requests are read as they arrive, without waiting for earlier replies,
+        so that one client can fill a batch.
+        """
+        replies = asyncio.Queue()
+
+        async def write_replies():
+            while True:
+                reply = await replies.get()
+                if reply is None:
+                    break
+                writer.write((json.dumps(await reply) + "\n").encode())
+                await writer.drain()
+
+        writing = asyncio.ensure_future(write_replies())
+        try:
+            async for line in reader:
+                if line.strip():
+                    replies.put_nowait(asyncio.ensure_future(
+                        self._respond(line.decode())))
+        except ConnectionError:
+            pass
+        finally:
+            replies.put_nowait(None)
+            try:
+                await writing
+            except ConnectionError:
+                pass
+            writer.close()
+
+    async def serve(self, host=HOST, port=PORT):
+        """Listens for connections until cancelled.
+
+        If watching the weather data file, it is the file currently being
+        used that is watched, which reload may change.
+        """
+        if self._watch_interval:
+            self._watcher = self._new_watcher(asyncio.get_running_loop(),
+                                              self._weather_file,
+                                              self._decider.get_weather_data())
+            self._watcher.start()
+        try:
+            server = await asyncio.start_server(self.handle_connection, host,
+                                                port)
+            async with server:
+                await server.serve_forever()
+        finally:
+            if self._watcher is not None:
+                self._watcher.stop()
+                self._watcher = None
+
+
+def main():
+    """Runs the service from the command line."""
+    parser = argparse.ArgumentParser(
+        description="Serve advisability requests over local TCP.")
+    parser.add_argument("--data", default="weather_data.csv",
+                        help="CSV file of weather data")
+    parser.add_argument("--host", default=HOST)
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--window", type=float, default=BATCH_WINDOW,
+                        help="seconds to wait for requests to join a batch")
+    parser.add_argument("--watch", type=float, metavar="SECONDS",
+                        help="reload the data when its file changes, "
+                             "checking this often")
+    arguments = parser.parse_args()
+
+    server = AdvisabilityServer(arguments.data, arguments.window,
+                                watch_interval=arguments.watch)
+    try:
+        asyncio.run(server.serve(arguments.host, arguments.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+"""
+    Weather data for many stations, used to run the prediction models and
+    event decisions at many sites.
+
+    StationWeatherData: Collection of WeatherData, keyed by station ID.
+"""
+
+__author__ = "Youngsu Choi"
+__email__ = "tonymusic0825@gmail.com"
+
+import glob
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from weather_data import WeatherData
+from prediction import MAX_DAYS, create_model
+from event_decision import EventDecision
+
+
+def station_id_from_file(weather_file):
+    """(str) Station ID of a weather data file: its name without extension."""
+    name = os.path.basename(weather_file)
+    return name.split(".", 1)[0]
+
+
+def station_files_by_id(weather_files):
+    """Finds the station ID of each of a list of weather data files.
+
+    Parameters:
+        weather_files (list<str>): Names of the files.
+
+    Return:
+        (dict<str, str>) Each file, keyed by its station ID.
+
+    Raises:
+        ValueError: If two files have the same station ID, such as a.csv and
+                    a.csv.gz, or the same name in two directories.
+    """
+    station_files = {}
+    for weather_file in weather_files:
+        station_id = station_id_from_file(weather_file)
+        if station_id in station_files:
+            raise ValueError(f"Station {station_id!r} has more than one file: "
+                             f"{station_files[station_id]} and {weather_file}")
+        station_files[station_id] = weather_file
+    return station_files
+
+
+def _load_station(weather_file):
+    """(WeatherData) Loads one station's weather data in a worker process."""
+    weather_data = WeatherData()
+    weather_data.load(weather_file)
+    return weather_data
+
+
+class StationWeatherData(object):
+    """Collection of WeatherData, keyed by station ID."""
+
+    def __init__(self):
+        """
+        Parameters:
+            None
+        """
+        self._stations = {}
+
+    def load(self, station_files, workers=None):
+        """Loads the weather data of many stations concurrently.
+
+        Each file is parsed in a pool of worker processes, so loading scales
+        with the number of CPUs.
+
+        Parameters:
+            station_files (str | list<str> | dict<str, str>):
+                A glob pattern or list of CSV files, whose station IDs are
+                their names without extension, or a mapping of station ID
+                to CSV file.
+            workers (int): Number of worker processes, or None for one per CPU.
+
+        Return:
+            (list<str>) IDs of the stations loaded.
+
+        Raises:
+            ValueError: If two of the files have the same station ID.
+        """
+        if isinstance(station_files, str):
+            station_files = sorted(glob.glob(station_files))
+        if not isinstance(station_files, dict):
+            station_files = station_files_by_id(station_files)
+        station_ids = list(station_files)
+        workers = workers or os.cpu_count()
+
+        # Send files to workers in batches, to keep the overhead per file low
+        # while still sharing the work evenly.
+        chunksize = max(1, len(station_ids) // (4 * workers))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            loaded = executor.map(_load_station,
+                                  [station_files[station_id]
+                                   for station_id in station_ids],
+                                  chunksize=chunksize)
+            for station_id, weather_data in zip(station_ids, loaded):
+                self._stations[station_id] = weather_data
+        return station_ids
+
+    def add(self, station_id, weather_data):
+        """Adds, or replaces, the weather data of one station.
+
+        Parameters:
+            station_id (str): ID of the station.
+            weather_data (WeatherData): Weather data of the station.
+        """
+        self._stations[station_id] = weather_data
+
+    def get(self, station_id):
+        """Returns the weather data of one station.
+
+        Raises:
+            KeyError: If there is no data for the station.
+        """
+        try:
+            return self._stations[station_id]
+        except KeyError:
+            raise KeyError(f"No weather data for station: {station_id!r}") from None
+
+    def get_station_ids(self):
+        """(list<str>) IDs of the stations with weather data."""
+        return list(self._stations)
+
+    def create_model(self, station_id, model_name, number_days=1,
+                     max_days=MAX_DAYS):
+        """Creates a prediction model for one station.
+
+        Parameters:
+            station_id (str): ID of the station.
+            model_name (str): Name of the model, one of prediction.MODELS.
+            number_days (int): Numbers of days being used to predict weather.
+            max_days (int): Limit on number_days, or None for no limit.
+
+        Return:
+            (WeatherPrediction) Model predicting the station's weather.
+        """
+        return create_model(model_name, self.get(station_id), number_days,
+                            max_days)
+
+    def event_decision(self, station_id, event, model_name, number_days=1,
+                       max_days=MAX_DAYS):
+        """Creates a decision about an event held at one station.
+
+        Parameters:
+            station_id (str): ID of the station.
+            event (Event): The event to determine its suitability.
+            model_name (str): Name of the model, one of prediction.MODELS.
+            number_days (int): Numbers of days being used to predict weather.
+            max_days (int): Limit on number_days, or None for no limit.
+
+        Return:
+            (EventDecision) Decision using the station's weather.
+        """
+        return EventDecision(event, self.create_model(
+            station_id, model_name, number_days, max_days))
+
+    def __contains__(self, station_id):
+        return station_id in self._stations
+
+    def __len__(self):
+        return len(self._stations)
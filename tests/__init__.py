@@ -0,0 +1,5 @@
+"""
+    Tests of the weather data, prediction and event decision modules.
+
+    Run from the top of the repository with: python -m pytest tests
+"""
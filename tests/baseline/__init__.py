@@ -0,0 +1,6 @@
+"""
+    The weather_data, prediction and event_decision modules as they were
+    before being optimised, kept unchanged apart from their imports.
+
+    The optimised modules must give the same forecasts and advisabilities.
+"""
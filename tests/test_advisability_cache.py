@@ -0,0 +1,106 @@
+"""
+    Tests of the persistent cache of advisability results.
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+import advisability_cache
+from advisability_cache import AdvisabilityCache
+from event_decision import BatchDecider
+from weather_data import WeatherData
+
+
+WEATHER_FILE = os.path.join(os.path.dirname(os.path.dirname(__file__)),
+                            "weather_data.csv")
+
+REQUESTS = [{"name": f"event {time}", "outdoors": outdoors, "cover": False,
+             "time": time, "model": model, "number_days": 3}
+            for time in (0, 6, 12, 18) for outdoors in (False, True)
+            for model in ("yesterday", "simple", "sophisticated")]
+
+
+class AdvisabilityCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self._directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self._directory.cleanup)
+        self.weather_file = os.path.join(self._directory.name, "weather.csv")
+        shutil.copyfile(WEATHER_FILE, self.weather_file)
+        self.cache_file = os.path.join(self._directory.name, "cache.sqlite")
+        self.loads = 0
+
+    def load(self):
+        """(WeatherData) The test's weather data, counting the loads."""
+        self.loads += 1
+        weather_data = WeatherData()
+        weather_data.load(self.weather_file)
+        return weather_data
+
+    def decide(self, requests=REQUESTS):
+        """(list<dict>) Results of requests, using the cache."""
+        with AdvisabilityCache(self.cache_file, self.weather_file) as cache:
+            return BatchDecider(self.load, cache=cache).decide(requests)
+
+    def test_cache_hit(self):
+        expected = BatchDecider(self.load()).decide(REQUESTS)
+        self.assertEqual(self.decide(), expected)
+        with AdvisabilityCache(self.cache_file, self.weather_file) as cache:
+            forecast, advisability = cache.get("simple", 3, 6, True, False)
+        position = REQUESTS.index({"name": "event 6", "outdoors": True,
+                                   "cover": False, "time": 6,
+                                   "model": "simple", "number_days": 3})
+        self.assertEqual(advisability, expected[position]["advisability"])
+        self.assertEqual(len(forecast), 6)
+
+        # The second run finds every result, so never loads the data.
+        self.loads = 0
+        self.assertEqual(self.decide(), expected)
+        self.assertEqual(self.loads, 0)
+
+    def test_partly_cached_batch(self):
+        self.decide(REQUESTS[:6])
+        self.loads = 0
+        self.assertEqual(self.decide(), BatchDecider(self.load()).decide(REQUESTS))
+        self.assertEqual(self.loads, 2)
+
+    def test_changed_file_is_not_cached(self):
+        self.decide()
+        with open(self.weather_file, newline="") as weather_details:
+            lines = weather_details.readlines()
+        with open(self.weather_file, "w", newline="") as weather_details:
+            weather_details.writelines(lines[:-1])
+
+        with AdvisabilityCache(self.cache_file, self.weather_file) as cache:
+            self.assertIsNone(cache.get("simple", 3, 6, True, False))
+        self.loads = 0
+        self.assertEqual(self.decide(), BatchDecider(self.load()).decide(REQUESTS))
+        self.assertEqual(self.loads, 2)
+
+    def test_file_is_hashed_again_only_when_it_changes(self):
+        with AdvisabilityCache(self.cache_file, self.weather_file) as cache:
+            digest = cache.get_digest()
+        with mock.patch.object(advisability_cache, "file_digest",
+                               wraps=advisability_cache.file_digest) as hashed:
+            with AdvisabilityCache(self.cache_file, self.weather_file) as cache:
+                self.assertEqual(cache.get_digest(), digest)
+            self.assertEqual(hashed.call_count, 0)
+
+            # The same size, but rewritten with different contents.
+            with open(self.weather_file, "rb") as weather_details:
+                contents = weather_details.read()
+            with open(self.weather_file, "wb") as weather_details:
+                weather_details.write(contents.replace(b",SSW,", b",NNE,", 1))
+            status = os.stat(self.weather_file)
+            os.utime(self.weather_file,
+                     ns=(status.st_atime_ns, status.st_mtime_ns + 10 ** 9))
+            with AdvisabilityCache(self.cache_file, self.weather_file) as cache:
+                self.assertNotEqual(cache.get_digest(), digest)
+            self.assertEqual(hashed.call_count, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
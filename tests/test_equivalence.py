@@ -0,0 +1,207 @@
+"""
+    Checks that the prediction models and event decisions give the same
+    results as the original implementation, kept in tests.baseline, on every
+    prefix of weather_data.csv.
+"""
+
+import datetime
+import itertools
+import math
+import os
+import tempfile
+import unittest
+
+import event_decision
+import prediction
+from weather_data import WeatherData
+
+from tests.baseline import event_decision as baseline_event_decision
+from tests.baseline import prediction as baseline_prediction
+from tests.baseline import weather_data as baseline_weather_data
+
+
+WEATHER_FILE = os.path.join(os.path.dirname(os.path.dirname(__file__)),
+                            "weather_data.csv")
+
+# Numbers of days of data given to the multi-day models.
+DAYS = (1, 2, 3, 5, 7, 14, 28)
+
+# Every kind of event: time, whether outdoors and whether cover is available.
+EVENTS = list(itertools.product(range(event_decision.HOURS), (False, True),
+                                (False, True)))
+
+
+def forecast(model):
+    """(tuple<float>) Forecast of a model of either implementation."""
+    return (model.chance_of_rain(), model.high_temperature(),
+            model.low_temperature(), model.humidity(), model.cloud_cover(),
+            model.wind_speed())
+
+
+def baseline_models(weather_data):
+    """Yields the name, number of days and model of each original model."""
+    yield "yesterday", 1, baseline_prediction.YesterdaysWeather(weather_data)
+    for number_days in DAYS:
+        yield ("simple", number_days,
+               baseline_prediction.SimplePrediction(weather_data, number_days))
+        yield ("sophisticated", number_days,
+               baseline_prediction.SophisticatedPrediction(weather_data,
+                                                           number_days))
+
+
+class EquivalenceTest(unittest.TestCase):
+    """Compares the optimised modules with the original ones."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls._directory = tempfile.TemporaryDirectory()
+        with open(WEATHER_FILE, newline="") as weather_details:
+            lines = weather_details.readlines()
+        cls.prefixes = []
+        for rows in range(1, len(lines)):
+            weather_file = os.path.join(cls._directory.name, f"weather_{rows}.csv")
+            with open(weather_file, "w", newline="") as prefix:
+                prefix.writelines(lines[:rows + 1])
+            cls.prefixes.append(weather_file)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls._directory.cleanup()
+
+    def setUp(self):
+        prediction.forecast_cache.clear()
+        prediction.statistics_cache.clear()
+
+    def assertClose(self, actual, expected, message=None):
+        """Asserts that two numbers, or tuples of them, are equal to within
+        rounding."""
+        if isinstance(expected, tuple):
+            self.assertEqual(len(actual), len(expected), message)
+            for actual_value, expected_value in zip(actual, expected):
+                self.assertClose(actual_value, expected_value, message)
+        elif not math.isclose(actual, expected, rel_tol=1e-9, abs_tol=1e-9):
+            self.fail(f"{actual!r} != {expected!r}: {message}")
+
+    def load(self, weather_file):
+        """Loads a file with both implementations."""
+        weather_data = WeatherData()
+        weather_data.load(weather_file)
+        baseline_data = baseline_weather_data.WeatherData()
+        baseline_data.load(weather_file)
+        return weather_data, baseline_data
+
+    def baseline_advisability(self, time, outdoors, cover_available, model):
+        """(float) Advisability of an event against an original model."""
+        return baseline_event_decision.EventDecision(
+            baseline_event_decision.Event("event", outdoors, cover_available,
+                                          time), model).advisability()
+
+    def test_models(self):
+        for weather_file in self.prefixes:
+            weather_data, baseline_data = self.load(weather_file)
+            for name, number_days, expected in baseline_models(baseline_data):
+                model = prediction.create_model(name, weather_data, number_days)
+                message = f"{name} {number_days} days of {weather_data.size()}"
+                self.assertClose(forecast(model), forecast(expected), message)
+                self.assertEqual(model.get_number_days(),
+                                 expected.get_number_days(), message)
+
+    def test_models_as_of(self):
+        weather_data = WeatherData()
+        weather_data.load(WEATHER_FILE)
+        dates = weather_data.get_column("date")
+        for day, weather_file in enumerate(self.prefixes):
+            view = weather_data.as_of(datetime.date.fromordinal(dates[day]))
+            baseline_data = baseline_weather_data.WeatherData()
+            baseline_data.load(weather_file)
+            for name, number_days, expected in baseline_models(baseline_data):
+                model = prediction.create_model(name, view, number_days)
+                self.assertClose(forecast(model), forecast(expected),
+                                 f"{name} {number_days} days as of day {day}")
+
+    def test_event_decisions(self):
+        for weather_file in self.prefixes:
+            weather_data, baseline_data = self.load(weather_file)
+            for name, number_days, expected in baseline_models(baseline_data):
+                model = prediction.create_model(name, weather_data, number_days)
+                for time, outdoors, cover_available in EVENTS:
+                    decision = event_decision.EventDecision(
+                        event_decision.Event("event", outdoors,
+                                             cover_available, time), model)
+                    expected_decision = baseline_event_decision.EventDecision(
+                        baseline_event_decision.Event("event", outdoors,
+                                                      cover_available, time),
+                        expected)
+                    self.assertClose(decision.advisability(),
+                                     expected_decision.advisability(),
+                                     f"{name} {number_days} days at {time}")
+
+    def test_batch(self):
+        weather_data, baseline_data = self.load(WEATHER_FILE)
+        decider = event_decision.BatchDecider(weather_data)
+        # Times that are not whole hours of the day are scored directly.
+        times = [6.5, 19.25, -1, 24, 30.0]
+        for name, number_days, expected in baseline_models(baseline_data):
+            requests = [{"name": "event", "outdoors": outdoors,
+                         "cover": cover_available, "time": time,
+                         "model": name, "number_days": number_days}
+                        for time, outdoors, cover_available in EVENTS]
+            for (time, outdoors, cover_available), result in zip(
+                    EVENTS, decider.decide(requests)):
+                self.assertClose(result["advisability"],
+                                 self.baseline_advisability(
+                                     time, outdoors, cover_available, expected))
+
+            model = prediction.create_model(name, weather_data, number_days)
+            scores = event_decision.batch_advisability(
+                times, [True] * len(times), [False] * len(times),
+                [model.forecast()])
+            for time, score in zip(times, scores):
+                self.assertClose(score, self.baseline_advisability(
+                    time, True, False, expected), f"{name} at {time}")
+
+    def test_sweep(self):
+        for weather_file in (self.prefixes[0], self.prefixes[-1]):
+            weather_data, baseline_data = self.load(weather_file)
+            sweep = event_decision.advisability_sweep(weather_data, days=DAYS)
+            self.assertEqual(sweep.get_model_names(), list(prediction.MODELS))
+            self.assertEqual(sweep.get_days(), list(DAYS))
+            for name, number_days, expected in baseline_models(baseline_data):
+                table = sweep.get_table(name, number_days)
+                for time, outdoors, cover_available in EVENTS:
+                    expected_advisability = self.baseline_advisability(
+                        time, outdoors, cover_available, expected)
+                    message = f"{name} {number_days} days at {time}"
+                    self.assertClose(sweep.advisability(name, number_days, time,
+                                                        outdoors,
+                                                        cover_available),
+                                     expected_advisability, message)
+                    self.assertClose(
+                        table[event_decision.event_key(time, outdoors,
+                                                       cover_available)],
+                        expected_advisability, message)
+            # Every window of YesterdaysWeather gives the same forecast.
+            for number_days in DAYS:
+                self.assertEqual(sweep.get_table("yesterday", number_days),
+                                 sweep.get_table("yesterday", 1))
+
+    def test_forecast_series(self):
+        weather_data = WeatherData()
+        weather_data.load(WEATHER_FILE)
+        for name, number_days in itertools.product(prediction.ROLLING_MODELS,
+                                                   DAYS):
+            series = prediction.forecast_series(weather_data, name, number_days)
+            for day, weather_file in enumerate(self.prefixes):
+                baseline_data = baseline_weather_data.WeatherData()
+                baseline_data.load(weather_file)
+                expected = dict((model_name, model) for model_name, days, model
+                                in baseline_models(baseline_data)
+                                if days == number_days)[name]
+                self.assertClose(
+                    tuple(series[field][day]
+                          for field in prediction.FORECAST_FIELDS),
+                    forecast(expected), f"{name} {number_days} days on day {day}")
+
+
+if __name__ == "__main__":
+    unittest.main()
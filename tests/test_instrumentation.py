@@ -0,0 +1,145 @@
+"""
+    Tests of measuring the hot paths of the weather modules.
+"""
+
+import json
+import os
+import re
+import tempfile
+import unittest
+
+import event_decision
+import instrumentation
+import prediction
+from weather_data import WeatherData
+
+
+WEATHER_FILE = os.path.join(os.path.dirname(os.path.dirname(__file__)),
+                            "weather_data.csv")
+
+# A sample line of the Prometheus text format: name, labels and value.
+SAMPLE = re.compile(r'([a-z_]+)\{((?:[a-z]+="[^"]*",?)*)\} (\S+)')
+
+
+def registered():
+    """(list<object>) The current definition of every registered method."""
+    return [owner.__dict__[attribute]
+            for owner, attribute, _, _ in instrumentation._targets]
+
+
+def parse_prometheus(text):
+    """Reads the samples of metrics in the Prometheus text format.
+
+    Return:
+        (list<tuple<str, dict<str, str>, float>>) Name, labels and value of
+            each sample.
+
+    Raises:
+        ValueError: If a line is not valid, or a sample comes before the TYPE
+                    line of its metric.
+    """
+    samples = []
+    types = set()
+    for line in text.splitlines():
+        if line.startswith("# TYPE "):
+            types.add(line.split()[2])
+            continue
+        match = SAMPLE.fullmatch(line)
+        if match is None:
+            raise ValueError(f"Invalid line: {line!r}")
+        name, labels, value = match.groups()
+        if not any(name == family or name.startswith(family + "_")
+                   for family in types):
+            raise ValueError(f"Sample before its TYPE line: {line!r}")
+        samples.append((name, dict(re.findall(r'([a-z]+)="([^"]*)"', labels)),
+                        float(value)))
+    return samples
+
+
+class InstrumentationTest(unittest.TestCase):
+
+    def setUp(self):
+        self.assertFalse(instrumentation.is_enabled())
+        self.addCleanup(instrumentation.disable)
+        self.addCleanup(instrumentation.reset)
+        instrumentation.reset()
+
+    def test_disable_restores_methods(self):
+        originals = registered()
+        self.assertEqual(originals, [original for _, _, original, _
+                                     in instrumentation._targets])
+        instrumentation.enable()
+        self.assertTrue(instrumentation.is_enabled())
+        for original, wrapped in zip(originals, registered()):
+            self.assertIsNot(wrapped, original)
+            self.assertIs(wrapped.__wrapped__, original)
+
+        instrumentation.disable()
+        self.assertFalse(instrumentation.is_enabled())
+        for original, restored in zip(originals, registered()):
+            self.assertIs(restored, original)
+
+    def test_calls_are_counted_only_while_enabled(self):
+        name = "weather_data.WeatherData.load"
+        WeatherData().load(WEATHER_FILE)
+        self.assertEqual(instrumentation.snapshot()[name]["calls"], 0)
+
+        instrumentation.enable()
+        data = WeatherData()
+        data.load(WEATHER_FILE)
+        with self.assertRaises(OSError):
+            WeatherData().load(os.path.join("missing", "file.csv"))
+        prediction.forecast_cache.clear()
+        prediction.SimplePrediction(data, 3).forecast()
+        instrumentation.disable()
+        WeatherData().load(WEATHER_FILE)
+
+        metrics = instrumentation.snapshot()
+        self.assertEqual(metrics[name]["calls"], 2)
+        self.assertEqual(metrics[name]["errors"], 1)
+        self.assertEqual(metrics[name]["buckets"][-1], [None, 2])
+        self.assertEqual(
+            metrics["prediction.WeatherPrediction.forecast"]["calls"], 1)
+
+    def test_export_prometheus(self):
+        instrumentation.enable()
+        data = WeatherData()
+        data.load(WEATHER_FILE)
+        event_decision.BatchDecider(data).decide([
+            {"name": "event", "outdoors": True, "cover": False, "time": 9,
+             "model": "simple"}])
+        instrumentation.disable()
+
+        samples = parse_prometheus(instrumentation.export_prometheus())
+        metrics = instrumentation.snapshot()
+        for name, method_metrics in metrics.items():
+            buckets = [(labels["le"], value)
+                       for sample, labels, value in samples
+                       if sample == "weather_call_seconds_bucket"
+                       and labels["method"] == name]
+            self.assertEqual(len(buckets), len(instrumentation.BUCKETS) + 1)
+            self.assertEqual(buckets[-1], ("+Inf", method_metrics["calls"]))
+            counts = [value for _, value in buckets]
+            self.assertEqual(counts, sorted(counts))
+            self.assertIn(("weather_call_seconds_count", {"method": name},
+                           method_metrics["calls"]), samples)
+            self.assertIn(("weather_call_errors_total", {"method": name},
+                           method_metrics["errors"]), samples)
+        self.assertIn(("weather_call_seconds_count",
+                       {"method": "event_decision.BatchDecider.decide"}, 1.0),
+                      samples)
+
+    def test_export_json(self):
+        instrumentation.enable()
+        WeatherData().load(WEATHER_FILE)
+        with tempfile.TemporaryDirectory() as directory:
+            metrics_file = os.path.join(directory, "metrics.json")
+            instrumentation.export_json(metrics_file)
+            with open(metrics_file) as metrics:
+                exported = json.load(metrics)
+        self.assertTrue(exported["enabled"])
+        self.assertEqual(exported["metrics"], instrumentation.snapshot())
+
+
+if __name__ == "__main__":
+    unittest.main()
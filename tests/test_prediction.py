@@ -0,0 +1,120 @@
+"""
+    Tests of the prediction models.
+"""
+
+import os
+import tempfile
+import unittest
+
+import prediction
+from weather_data import WeatherData, WeatherDataItem
+
+
+WEATHER_FILE = os.path.join(os.path.dirname(os.path.dirname(__file__)),
+                            "weather_data.csv")
+
+
+def loaded(weather_file):
+    """(WeatherData) Data loaded from the whole of a file."""
+    data = WeatherData()
+    data.load(weather_file)
+    return data
+
+
+class PredictionTest(unittest.TestCase):
+
+    def setUp(self):
+        prediction.forecast_cache.clear()
+        prediction.statistics_cache.clear()
+
+    def test_models_survive_reload(self):
+        data = loaded(WEATHER_FILE)
+        expected = loaded(WEATHER_FILE)
+        models = [(prediction.create_model(name, data, 3),
+                   prediction.create_model(name, expected, 3))
+                  for name in prediction.MODELS]
+        for name, model in prediction.ROLLING_MODELS.items():
+            models.append((model(data, 3), model(expected, 3)))
+
+        with tempfile.TemporaryDirectory() as directory:
+            other_file = os.path.join(directory, "other.csv")
+            with open(WEATHER_FILE, newline="") as weather_details:
+                lines = weather_details.readlines()
+            with open(other_file, "w", newline="") as other:
+                other.writelines(lines[:5])
+            data.load(other_file)
+
+        for model, expected_model in models:
+            self.assertEqual(model.forecast(), expected_model.forecast(),
+                             type(model).__name__)
+
+
+class ForecastCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        prediction.forecast_cache.clear()
+        prediction.statistics_cache.clear()
+
+    def test_models_of_the_same_data_share_forecasts(self):
+        data = loaded(WEATHER_FILE)
+        expected = prediction.create_model("sophisticated", data, 5).forecast()
+        hits = prediction.forecast_cache.get_hits()
+        model = prediction.create_model("sophisticated", data, 5)
+        self.assertEqual(model.forecast(), expected)
+        self.assertGreater(prediction.forecast_cache.get_hits(), hits)
+
+    def test_append_invalidates_forecasts(self):
+        data = loaded(WEATHER_FILE)
+        for name in prediction.MODELS:
+            prediction.create_model(name, data, 3).forecast()
+        data.append(WeatherDataItem(80.0, 44.0, 31.0, 0.5, 95, 40, 90, "NNE",
+                                    8, 990.0))
+        expected = loaded(WEATHER_FILE)
+        expected.append(data.get_data(1)[0].to_item())
+        for name in prediction.MODELS:
+            before = prediction.create_model(name, loaded(WEATHER_FILE), 3)
+            model = prediction.create_model(name, data, 3)
+            self.assertNotEqual(model.forecast(), before.forecast(), name)
+            prediction.forecast_cache.clear()
+            self.assertEqual(model.forecast(),
+                             prediction.create_model(name, expected,
+                                                     3).forecast(), name)
+
+    def test_load_invalidates_forecasts(self):
+        data = loaded(WEATHER_FILE)
+        forecast = prediction.create_model("simple", data, 3).forecast()
+        with tempfile.TemporaryDirectory() as directory:
+            other_file = os.path.join(directory, "other.csv")
+            with open(WEATHER_FILE, newline="") as weather_details:
+                lines = weather_details.readlines()
+            with open(other_file, "w", newline="") as other:
+                other.writelines(lines[:5])
+            data.load(other_file)
+            expected = loaded(other_file)
+        model = prediction.create_model("simple", data, 3)
+        self.assertNotEqual(model.forecast(), forecast)
+        self.assertEqual(model.forecast(),
+                         prediction.create_model("simple", expected,
+                                                 3).forecast())
+
+    def test_least_recently_used_are_discarded(self):
+        cache = prediction.ForecastCache(3)
+        for key in range(3):
+            cache.put(key, str(key))
+        self.assertEqual(cache.get(0), "0")
+        cache.put(3, "3")
+        self.assertEqual(len(cache), 3)
+        self.assertIsNone(cache.get(1))
+        self.assertEqual([cache.get(key) for key in (0, 2, 3)],
+                         ["0", "2", "3"])
+
+        for key in range(100):
+            cache.put((key, "forecast"), key)
+        self.assertEqual(len(cache), 3)
+        cache.set_max_size(1)
+        self.assertEqual(len(cache), 1)
+        self.assertEqual(cache.get((99, "forecast")), 99)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,143 @@
+"""
+    Tests of the advisability service.
+"""
+
+import asyncio
+import json
+import os
+import tempfile
+import unittest
+
+from event_decision import BatchDecider
+from server import AdvisabilityServer
+from weather_data import WeatherData
+
+
+WEATHER_FILE = os.path.join(os.path.dirname(os.path.dirname(__file__)),
+                            "weather_data.csv")
+
+
+def loaded(weather_file):
+    """(WeatherData) Data loaded from the whole of a file."""
+    data = WeatherData()
+    data.load(weather_file)
+    return data
+
+
+def advise(request_id, time, model="simple"):
+    """(dict) An advise request for an outdoor event without cover."""
+    return {"id": request_id, "name": "event", "outdoors": True,
+            "cover": False, "time": time, "model": model, "number_days": 3}
+
+
+class AdvisabilityServerTest(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        # A long window, so that requests sent together share a batch.
+        self.server = AdvisabilityServer(WEATHER_FILE, batch_window=0.05)
+        self.listener = await asyncio.start_server(
+            self.server.handle_connection, "127.0.0.1", 0)
+        self.port = self.listener.sockets[0].getsockname()[1]
+        self.addAsyncCleanup(self.stop_listening)
+
+    async def stop_listening(self):
+        self.listener.close()
+        await self.listener.wait_closed()
+
+    async def connect(self):
+        """(tuple) Reader and writer of a new connection to the service."""
+        reader, writer = await asyncio.open_connection("127.0.0.1", self.port)
+        self.addAsyncCleanup(self.close, writer)
+        return reader, writer
+
+    @staticmethod
+    async def close(writer):
+        writer.close()
+        await writer.wait_closed()
+        # Lets the service see the connection close.
+        await asyncio.sleep(0.01)
+
+    @staticmethod
+    async def send(reader, writer, requests):
+        """(list<dict>) Replies to requests, written all at once."""
+        writer.write("".join(request if isinstance(request, str)
+                             else json.dumps(request) + "\n"
+                             for request in requests).encode())
+        await writer.drain()
+        return [json.loads(await reader.readline()) for _ in requests]
+
+    async def test_requests_are_batched(self):
+        batches = []
+        decider = self.server._decider
+        decide = decider.decide
+        decider.decide = lambda requests: batches.append(len(requests)) or \
+            decide(requests)
+
+        requests = [advise(time, time) for time in range(24)]
+        connections = [await self.connect() for _ in range(3)]
+        replies = await asyncio.gather(*[self.send(reader, writer, requests)
+                                         for reader, writer in connections])
+
+        expected = BatchDecider(loaded(WEATHER_FILE)).decide(requests)
+        for connection_replies in replies:
+            self.assertEqual([reply["advisability"]
+                              for reply in connection_replies],
+                             [result["advisability"] for result in expected])
+        self.assertEqual(sum(batches), 3 * len(requests))
+        self.assertLess(len(batches), 3 * len(requests))
+
+    async def test_replies_are_in_request_order(self):
+        reader, writer = await self.connect()
+        replies = await self.send(reader, writer, [
+            advise(0, 6), {"op": "ping", "id": 1}, "not json\n",
+            advise(3, 12, "sophisticated"), {"op": "unknown", "id": 4},
+            {"id": 5, "name": "event"}, advise(6, 18, "yesterday")])
+        self.assertEqual([reply.get("id") for reply in replies],
+                         [0, 1, None, 3, 4, 5, 6])
+        self.assertIn("advisability", replies[0])
+        self.assertEqual(replies[1]["size"], loaded(WEATHER_FILE).size())
+        for position in (2, 4, 5):
+            self.assertIn("error", replies[position])
+        self.assertEqual([replies[position]["model"] for position in (0, 3, 6)],
+                         ["simple", "sophisticated", "yesterday"])
+
+    async def test_reload_keeps_connections_open(self):
+        with tempfile.TemporaryDirectory() as directory:
+            other_file = os.path.join(directory, "other.csv")
+            with open(WEATHER_FILE, newline="") as weather_details:
+                lines = weather_details.readlines()
+            with open(other_file, "w", newline="") as other:
+                other.writelines(lines[:6])
+
+            reader, writer = await self.connect()
+            other_reader, other_writer = await self.connect()
+            before = await self.send(reader, writer, [advise(0, 6)])
+            reloaded = await self.send(reader, writer, [
+                {"op": "reload", "path": other_file, "id": 1}])
+            replies = await self.send(reader, writer, [
+                {"op": "ping", "id": 2}, advise(3, 6)])
+
+        self.assertEqual(reloaded[0]["size"], 5)
+        self.assertEqual(replies[0], {"size": 5, "id": 2})
+        self.assertEqual(replies[1]["number_days"], 3)
+        expected = BatchDecider(loaded(WEATHER_FILE)).decide([advise(0, 6)])
+        self.assertEqual(before[0]["advisability"], expected[0]["advisability"])
+        # Both connections are still answered, from the reloaded data.
+        other_replies = await self.send(other_reader, other_writer,
+                                        [{"op": "ping", "id": 4}])
+        self.assertEqual(other_replies, [{"size": 5, "id": 4}])
+        self.assertEqual(await self.send(reader, writer,
+                                         [{"op": "ping", "id": 5}]),
+                         [{"size": 5, "id": 5}])
+
+    async def test_failed_reload_keeps_data(self):
+        reader, writer = await self.connect()
+        replies = await self.send(reader, writer, [
+            {"op": "reload", "path": os.path.join("missing", "file.csv")},
+            {"op": "ping"}])
+        self.assertIn("error", replies[0])
+        self.assertEqual(replies[1], {"size": loaded(WEATHER_FILE).size()})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,54 @@
+"""
+    Tests of loading the weather data of many stations.
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from stations import StationWeatherData, station_files_by_id
+
+
+WEATHER_FILE = os.path.join(os.path.dirname(os.path.dirname(__file__)),
+                            "weather_data.csv")
+
+
+class StationWeatherDataTest(unittest.TestCase):
+
+    def setUp(self):
+        self._directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self._directory.cleanup)
+
+    def copy(self, name):
+        """(str) Copy of weather_data.csv in the test's temporary directory."""
+        station_file = os.path.join(self._directory.name, name)
+        os.makedirs(os.path.dirname(station_file), exist_ok=True)
+        shutil.copyfile(WEATHER_FILE, station_file)
+        return station_file
+
+    def test_load(self):
+        self.copy("a.csv")
+        self.copy("b.csv")
+        stations = StationWeatherData()
+        self.assertEqual(
+            stations.load(os.path.join(self._directory.name, "*.csv"),
+                          workers=1), ["a", "b"])
+        self.assertEqual(stations.get("a").size(), stations.get("b").size())
+
+    def test_duplicate_station_ids(self):
+        for names in (["a.csv", "a.csv.gz"],
+                      [os.path.join("x", "a.csv"), os.path.join("y", "a.csv")]):
+            station_files = [self.copy(name) for name in names]
+            with self.assertRaises(ValueError):
+                station_files_by_id(station_files)
+            with self.assertRaises(ValueError):
+                StationWeatherData().load(station_files, workers=1)
+
+    def test_station_ids(self):
+        self.assertEqual(station_files_by_id(["x/a.csv", "y/b.csv.gz"]),
+                         {"a": "x/a.csv", "b": "y/b.csv.gz"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+"""
+    Tests of keeping weather data up to date with its file.
+"""
+
+import os
+import unittest
+
+from watcher import WeatherDataWatcher
+
+from tests.test_weather_data import WeatherDataFileTest, loaded, rows
+
+
+class WatcherTest(WeatherDataFileTest):
+
+    def setUp(self):
+        super().setUp()
+        self.write(self.lines[:11])
+        self.watcher = WeatherDataWatcher(self.weather_file)
+
+    def write(self, lines, weather_file=None):
+        """Writes lines to the weather file, with a new modification time
+        even if written within the file system's time resolution."""
+        super().write(lines, weather_file)
+        status = os.stat(weather_file or self.weather_file)
+        self._mtime = max(getattr(self, "_mtime", 0) + 1000,
+                          status.st_mtime_ns)
+        os.utime(weather_file or self.weather_file,
+                 ns=(status.st_atime_ns, self._mtime))
+
+    def assertCurrent(self):
+        """Asserts that the watcher's data is that of the whole file."""
+        self.assertEqual(rows(self.watcher.get()),
+                         rows(loaded(self.weather_file)))
+
+    def test_appended_rows(self):
+        published = self.watcher.get()
+        self.assertFalse(self.watcher.check())
+        self.write(self.lines[:21])
+        self.assertTrue(self.watcher.check())
+        self.assertCurrent()
+        # Published data is never changed.
+        self.assertEqual(published.size(), 10)
+
+    def test_same_size_rewrite(self):
+        lines = self.lines[:11]
+        lines[1] = lines[1].replace(",N,", ",S,", 1)
+        self.assertNotEqual(lines[1], self.lines[1])
+        self.write(lines)
+        self.assertTrue(self.watcher.check())
+        self.assertCurrent()
+
+    def test_grown_rewrite(self):
+        lines = self.lines[:21]
+        lines[2] = lines[2].replace(",", ",0", 1)
+        self.write(lines)
+        self.assertTrue(self.watcher.check())
+        self.assertIsNone(self.watcher.get_error())
+        self.assertCurrent()
+
+    def test_invalid_rows(self):
+        self.write(self.lines[:11] + ["not,a,row\r\n"])
+        with self.assertRaises(Exception):
+            self.watcher.check()
+        self.assertIsNotNone(self.watcher.get_error())
+        self.assertEqual(self.watcher.get().size(), 10)
+        # The file is not read again until it changes.
+        self.assertFalse(self.watcher.check())
+
+        self.write(self.lines[:21])
+        self.assertTrue(self.watcher.check())
+        self.assertIsNone(self.watcher.get_error())
+        self.assertCurrent()
+
+    def test_missing_file(self):
+        os.remove(self.weather_file)
+        self.assertFalse(self.watcher.check())
+        self.assertEqual(self.watcher.get().size(), 10)
+
+        self.write(self.lines[:21])
+        self.assertTrue(self.watcher.check())
+        self.assertCurrent()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,465 @@
+"""
+    Tests of storing, loading and ingesting weather data.
+"""
+
+import datetime
+import math
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import weather_data
+from weather_data import (COLUMNS, SUMMED_FIELDS, WeatherData, WeatherDataItem,
+                          period_start)
+
+
+WEATHER_FILE = os.path.join(os.path.dirname(os.path.dirname(__file__)),
+                            "weather_data.csv")
+
+
+def rows(data):
+    """(list<tuple>) Every value of every day of the data, oldest first."""
+    return [tuple(data.get_column(field)[day] for field in COLUMNS)
+            for day in range(data.size())]
+
+
+def loaded(weather_file):
+    """(WeatherData) Data loaded from the whole of a file."""
+    data = WeatherData()
+    data.load(weather_file)
+    return data
+
+
+class StorageTest(unittest.TestCase):
+
+    def test_rows_read_columns(self):
+        data = loaded(WEATHER_FILE)
+        days = data.get_data(data.size())
+        self.assertEqual(len(days), data.size())
+        self.assertEqual([day.get_rainfall() for day in days],
+                         list(data.get_column("rain")))
+        self.assertEqual([day.get_wind_direction_code() for day in days],
+                         list(data.get_column("wind_direction")))
+        self.assertEqual(days[-1].get_air_pressure(),
+                         data.get_column("air_pressure")[-1])
+
+    def test_load_matches_appended_rows(self):
+        data = loaded(WEATHER_FILE)
+        appended = WeatherData()
+        appended.ingest_file(WEATHER_FILE)
+        self.assertEqual(rows(data), rows(appended))
+        for field in SUMMED_FIELDS:
+            for days in (1, 7, data.size()):
+                self.assertEqual(data.window_sum(field, days),
+                                 appended.window_sum(field, days), field)
+
+    def test_cleared_rows_are_not_read(self):
+        data = loaded(WEATHER_FILE)
+        row = data.get_data(1)[0]
+        data.clear()
+        data.load(WEATHER_FILE)
+        with self.assertRaises(ValueError):
+            row.get_rainfall()
+
+
+class LazyLoadTest(unittest.TestCase):
+
+    def test_lazy_columns(self):
+        full = loaded(WEATHER_FILE)
+        data = WeatherData()
+        data.load(WEATHER_FILE, fields=["rain", "date"])
+        self.assertEqual(data.size(), full.size())
+        for field in COLUMNS:
+            self.assertEqual(list(data.get_column(field)),
+                             list(full.get_column(field)), field)
+        for field in SUMMED_FIELDS:
+            self.assertEqual(data.window_sum(field, 7), full.window_sum(field, 7))
+
+    def test_unknown_lazy_column(self):
+        with self.assertRaises(ValueError):
+            WeatherData().load(WEATHER_FILE, fields=["snow"])
+
+    def test_append_parses_deferred_columns_in_one_pass(self):
+        full = loaded(WEATHER_FILE)
+        item = full.get_data(1)[0].to_item()
+        full.append(item)
+        data = WeatherData()
+        data.load(WEATHER_FILE, fields=["rain"])
+        with mock.patch.object(weather_data, "_parse_columns",
+                               wraps=weather_data._parse_columns) as parse:
+            data.append(item)
+        self.assertEqual(parse.call_count, 1)
+        self.assertEqual(rows(data), rows(full))
+
+
+class WeatherDataFileTest(unittest.TestCase):
+    """Base of the tests working on copies of weather_data.csv."""
+
+    def setUp(self):
+        self._directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self._directory.cleanup)
+        with open(WEATHER_FILE, newline="") as weather_details:
+            self.lines = weather_details.readlines()
+        self.weather_file = self.path("weather.csv")
+
+    def path(self, name):
+        """(str) Name of a file in the test's temporary directory."""
+        return os.path.join(self._directory.name, name)
+
+    def write(self, lines, weather_file=None):
+        """Writes lines to the test's weather file, or another file."""
+        with open(weather_file or self.weather_file, "w", newline="") as output:
+            output.writelines(lines)
+
+
+class IngestTest(WeatherDataFileTest):
+
+    def test_resumes_from_checkpoint(self):
+        self.write(self.lines[:11])
+        data = WeatherData()
+        self.assertEqual(data.ingest_file(self.weather_file), 10)
+        checkpoint = data.get_checkpoint()
+        self.assertEqual(checkpoint.get_offset(),
+                         os.path.getsize(self.weather_file))
+
+        self.write(self.lines[:21])
+        self.assertEqual(data.ingest_file(self.weather_file), 10)
+        self.assertEqual(data.ingest_file(self.weather_file), 0)
+        self.assertEqual(rows(data), rows(loaded(self.weather_file)))
+
+    def test_waits_for_complete_lines(self):
+        self.write(self.lines[:11] + [self.lines[11][:5]])
+        data = WeatherData()
+        self.assertEqual(data.ingest_file(self.weather_file), 10)
+        self.write(self.lines[:13])
+        self.assertEqual(data.ingest_file(self.weather_file), 2)
+        self.assertEqual(rows(data), rows(loaded(self.weather_file)))
+
+    def test_reloads_rewritten_file(self):
+        self.write(self.lines[:21])
+        data = loaded(self.weather_file)
+        self.assertTrue(data.get_checkpoint().matches())
+
+        # The same size, but a different last row.
+        last = self.lines[20].replace(",SSW,", ",NNE,", 1)
+        self.assertEqual(len(last), len(self.lines[20]))
+        self.assertNotEqual(last, self.lines[20])
+        self.write(self.lines[:20] + [last])
+        self.assertFalse(data.get_checkpoint().matches())
+        data.ingest_file(self.weather_file)
+        self.assertEqual(rows(data), rows(loaded(self.weather_file)))
+
+        # An earlier row made longer, with more rows appended.
+        lines = self.lines[:25]
+        lines[3] = lines[3].replace(",", ",0", 1)
+        self.write(lines)
+        data.ingest_file(self.weather_file)
+        self.assertEqual(rows(data), rows(loaded(self.weather_file)))
+
+    def test_reloads_shrunk_file(self):
+        self.write(self.lines[:21])
+        data = loaded(self.weather_file)
+        self.write(self.lines[:6])
+        data.ingest_file(self.weather_file)
+        self.assertEqual(data.size(), 5)
+
+    def test_last_line_without_line_break(self):
+        self.write(self.lines[:-1] + [self.lines[-1].rstrip("\r\n")])
+        expected = rows(loaded(WEATHER_FILE))
+        self.assertEqual(len(expected), len(self.lines) - 1)
+        self.assertEqual(rows(loaded(self.weather_file)), expected)
+
+        data = WeatherData()
+        data.load(self.weather_file, fields=["rain"])
+        self.assertEqual(rows(data), expected)
+        data = WeatherData()
+        data.load_tail(self.weather_file, 3)
+        self.assertEqual(rows(data), expected[-3:])
+
+    def test_ingests_other_file(self):
+        data = loaded(WEATHER_FILE)
+        size = data.size()
+        self.write(self.lines[:1] + [self.lines[-1]])
+        self.assertEqual(data.ingest_file(self.weather_file), 1)
+        self.assertEqual(data.size(), size + 1)
+        self.assertEqual(rows(data)[-1], rows(data)[-2])
+
+    def test_invalid_row_is_not_reloaded(self):
+        self.write(self.lines[:11])
+        data = loaded(self.weather_file)
+        day = data.get_data(1)[0]
+        self.write(self.lines[:16] + ["not,a,row\r\n"] + self.lines[16:21])
+        with self.assertRaises((ValueError, IndexError)):
+            data.ingest_file(self.weather_file)
+        # The data was not loaded again, which would have cleared it.
+        self.assertEqual(day.get_rainfall(), data.get_column("rain")[9])
+        self.assertEqual(rows(data), rows(loaded(WEATHER_FILE))[:15])
+        self.assertEqual(data.get_checkpoint().get_offset(),
+                         len("".join(self.lines[:16])))
+
+
+class TailLoadTest(WeatherDataFileTest):
+
+    def test_tail_load(self):
+        self.write(self.lines[:21])
+        data = WeatherData()
+        data.load_tail(self.weather_file, 5)
+        self.assertEqual(rows(data), rows(loaded(self.weather_file))[-5:])
+
+        self.write(self.lines)
+        self.assertEqual(data.ingest_file(self.weather_file),
+                         len(self.lines) - 21)
+        self.assertEqual(rows(data), rows(loaded(self.weather_file))[15:])
+
+    def test_tail_load_of_short_file(self):
+        self.write(self.lines[:4])
+        data = WeatherData()
+        data.load_tail(self.weather_file, 10)
+        self.assertEqual(rows(data), rows(loaded(self.weather_file)))
+
+    def test_tail_load_over_many_blocks(self):
+        self.write(self.lines[:15] + ["\r\n"] * 3 + self.lines[15:])
+        expected = rows(loaded(WEATHER_FILE))
+        # Blocks shorter than a line, so that several are read.
+        with mock.patch.object(weather_data, "TAIL_BLOCK_SIZE", 16):
+            for number_days in (1, 14, 15, len(expected) + 1):
+                data = WeatherData()
+                data.load_tail(self.weather_file, number_days)
+                self.assertEqual(rows(data), expected[-number_days:],
+                                 number_days)
+
+
+class LoadFilesTest(WeatherDataFileTest):
+
+    def test_load_files_skips_empty_files(self):
+        self.write(self.lines[:11], self.path("first.csv"))
+        self.write([], self.path("empty.csv"))
+        self.write(self.lines[:1] + self.lines[11:], self.path("second.csv"))
+        data = WeatherData()
+        data.load_files([self.path("empty.csv"), self.path("second.csv"),
+                         self.path("first.csv")], workers=1)
+        self.assertEqual(rows(data), rows(loaded(WEATHER_FILE)))
+
+    def test_load_files_of_only_empty_files(self):
+        self.write([], self.path("empty.csv"))
+        self.write(self.lines[:1], self.path("header.csv"))
+        data = loaded(WEATHER_FILE)
+        data.load_files([self.path("empty.csv"), self.path("header.csv")],
+                        workers=1)
+        self.assertEqual(data.size(), 0)
+
+
+def days_of(rows):
+    """(list<int>) Day of the month of each of a list of rows."""
+    return [row.get_date().day for row in rows]
+
+
+class DateQueryTest(WeatherDataFileTest):
+    """Queries by date of weather_data.csv, which holds every day of
+    February 2019."""
+
+    def setUp(self):
+        super().setUp()
+        self.data = loaded(WEATHER_FILE)
+
+    def test_data_range_is_inclusive(self):
+        self.assertEqual(days_of(self.data.get_data_range("3/02/2019",
+                                                          "5/02/2019")),
+                         [3, 4, 5])
+        self.assertEqual(days_of(self.data.get_data_range(
+            datetime.date(2019, 2, 7), "2019-02-07")), [7])
+        self.assertEqual(self.data.get_data_range("5/02/2019", "3/02/2019"), [])
+
+    def test_data_range_beyond_the_data(self):
+        self.assertEqual(days_of(self.data.get_data_range("1/01/2019",
+                                                          "2/02/2019")),
+                         [1, 2])
+        self.assertEqual(days_of(self.data.get_data_range("27/02/2019",
+                                                          "1/03/2019")),
+                         [27, 28])
+        self.assertEqual(len(self.data.get_data_range("1/01/2019",
+                                                      "1/01/2020")), 28)
+        self.assertEqual(self.data.get_data_range("1/01/2019", "31/01/2019"), [])
+        self.assertEqual(self.data.get_data_range("1/03/2019", "1/04/2019"), [])
+
+    def test_missing_days(self):
+        # 10-14 February are missing.
+        self.write(self.lines[:10] + self.lines[15:])
+        data = loaded(self.weather_file)
+        self.assertEqual(data.get_data_range("10/02/2019", "14/02/2019"), [])
+        self.assertEqual(days_of(data.get_data_range("9/02/2019",
+                                                     "15/02/2019")), [9, 15])
+        self.assertEqual(data.index_of("12/02/2019"), 9)
+        self.assertEqual(days_of(data.get_data_as_of("12/02/2019", 2)), [8, 9])
+
+    def test_index_of(self):
+        self.assertEqual(self.data.index_of("31/01/2019"), 0)
+        self.assertEqual(self.data.index_of("1/02/2019"), 1)
+        self.assertEqual(self.data.index_of("28/02/2019"), 28)
+        self.assertEqual(self.data.index_of("1/03/2019"), 28)
+        self.assertEqual(self.data.index_of(datetime.date(2019, 2, 10)), 10)
+
+    def test_data_as_of(self):
+        self.assertEqual(days_of(self.data.get_data_as_of("5/02/2019", 3)),
+                         [3, 4, 5])
+        self.assertEqual(days_of(self.data.get_data_as_of("2/02/2019", 5)),
+                         [1, 2])
+        self.assertEqual(self.data.get_data_as_of("31/01/2019", 5), [])
+        self.assertEqual(days_of(self.data.get_data_as_of("1/03/2019", 2)),
+                         [27, 28])
+
+    def test_view(self):
+        self.write(self.lines[:11])
+        truncated = loaded(self.weather_file)
+        view = self.data.as_of("10/02/2019")
+        self.assertEqual(view.size(), 10)
+        self.assertEqual(rows(view), rows(truncated))
+        for field in SUMMED_FIELDS:
+            self.assertEqual(view.window_sum(field, 7),
+                             truncated.window_sum(field, 7), field)
+            self.assertEqual(view.window_mean(field, 30),
+                             truncated.window_mean(field, 30), field)
+
+        self.assertEqual(days_of(view.get_data_range("8/02/2019",
+                                                     "20/02/2019")),
+                         [8, 9, 10])
+        self.assertEqual(view.index_of("20/02/2019"), 10)
+        self.assertEqual(view.as_of("5/02/2019").size(), 5)
+        self.assertEqual(view.as_of("20/02/2019").size(), 10)
+        self.assertEqual(days_of(view.get_data_as_of("20/02/2019", 2)), [9, 10])
+        self.assertEqual(self.data.as_of("31/01/2019").size(), 0)
+        self.assertEqual(self.data.as_of("31/01/2019").get_data(3), [])
+
+        # Days appended later are not in the view.
+        self.data.append(self.data.get_data(1)[0].to_item())
+        self.assertEqual(rows(view), rows(truncated))
+
+
+class SnapshotTest(WeatherDataFileTest):
+
+    def setUp(self):
+        super().setUp()
+        self.write(self.lines[:21])
+        self.snapshot_file = self.path("weather.snapshot")
+
+    def test_round_trip(self):
+        data = loaded(self.weather_file)
+        data.save_snapshot(self.snapshot_file)
+        opened = WeatherData.open_snapshot(self.snapshot_file)
+        self.assertEqual(rows(opened), rows(data))
+        self.assertEqual(opened.window_sum("rain", 7), data.window_sum("rain", 7))
+
+    def test_stale_snapshot_is_rebuilt(self):
+        loaded(self.weather_file).save_snapshot(self.snapshot_file)
+        self.write(self.lines)
+        opened = WeatherData.open_snapshot(self.snapshot_file, self.weather_file)
+        self.assertEqual(rows(opened), rows(loaded(self.weather_file)))
+        # The rebuilt snapshot is up to date.
+        self.assertEqual(rows(WeatherData.open_snapshot(self.snapshot_file)),
+                         rows(opened))
+
+    def test_corrupt_snapshot(self):
+        loaded(self.weather_file).save_snapshot(self.snapshot_file)
+        with open(self.snapshot_file, "rb") as snapshot:
+            contents = snapshot.read()
+        for corrupt in (b"", contents[:10], contents[:len(contents) // 2],
+                        b"\0" * len(contents)):
+            with open(self.snapshot_file, "wb") as snapshot:
+                snapshot.write(corrupt)
+            with self.assertRaises(ValueError):
+                WeatherData.open_snapshot(self.snapshot_file)
+            # With the CSV file it is rebuilt instead.
+            opened = WeatherData.open_snapshot(self.snapshot_file,
+                                               self.weather_file)
+            self.assertEqual(rows(opened), rows(loaded(self.weather_file)))
+
+
+class RetentionTest(unittest.TestCase):
+
+    def test_roll_up(self):
+        full = loaded(WEATHER_FILE)
+        data = WeatherData()
+        data.set_retention(5, "week", 3)
+        data.load(WEATHER_FILE)
+        self.assertLess(data.size(), 5 + 3)
+        self.assertEqual(rows(data), rows(full)[-data.size():])
+
+        rolled_up = rows(full)[:-data.size()]
+        summaries = data.get_summaries()
+        self.assertEqual(sum(summary.get_count() for summary in summaries),
+                         len(rolled_up))
+        dates = full.get_column("date")
+        for summary in summaries:
+            start = summary.get_start()
+            if isinstance(start, datetime.date):
+                start = start.toordinal()
+            days = [day for day in range(len(rolled_up))
+                    if period_start(dates[day], "week") == start]
+            self.assertEqual(summary.get_count(), len(days))
+            for field in SUMMED_FIELDS:
+                values = [full.get_column(field)[day] for day in days]
+                self.assertTrue(math.isclose(summary.get_sum(field),
+                                             math.fsum(values)), field)
+                self.assertEqual(summary.get_minimum(field), min(values))
+                self.assertEqual(summary.get_maximum(field), max(values))
+
+    def test_rolled_up_rows_are_not_read(self):
+        data = loaded(WEATHER_FILE)
+        oldest = data.get_data(data.size())[0]
+        newest = data.get_data(1)[0]
+        rain = newest.get_rainfall()
+        data.set_retention(3, "month", 1)
+        self.assertEqual(newest.get_rainfall(), rain)
+        with self.assertRaises(ValueError):
+            oldest.get_rainfall()
+
+    def test_roll_up_of_lazy_load(self):
+        full = loaded(WEATHER_FILE)
+        data = WeatherData()
+        data.set_retention(5, "week", 5)
+        data.load(WEATHER_FILE, fields=["rain"])
+        self.assertLess(data.size(), 5 + 5)
+        self.assertEqual(rows(data), rows(full)[-data.size():])
+        self.assertEqual(sum(summary.get_count()
+                             for summary in data.get_summaries()),
+                         full.size() - data.size())
+
+
+class WeatherDataItemTest(unittest.TestCase):
+
+    def test_values(self):
+        item = WeatherDataItem("1.5", 30, 20.5, 8, "60", 10.0, 25, " NE ", 3,
+                               1012.5)
+        self.assertEqual(item.get_rainfall(), 1.5)
+        self.assertEqual(item.get_high_temperature(), 30.0)
+        self.assertEqual(item.get_humidity(), 60)
+        self.assertEqual(item.get_average_wind_speed(), 10)
+        self.assertEqual(item.get_wind_direction(), "NE")
+        self.assertTrue(item.has_easterly_component())
+        self.assertEqual(item.get_air_pressure(), 1012.5)
+
+    def test_invalid_values(self):
+        values = dict(rain=0, temperature_high=30, temperature_low=20,
+                      sunshine_hours=8, humidity=60, wind_speed_average=10,
+                      wind_speed_max=25, wind_direction="N", cloud_cover=3,
+                      air_pressure=1012.5)
+        for field, value in (("rain", "heavy"), ("humidity", None),
+                             ("wind_direction", "NORTH"),
+                             ("wind_direction", None),
+                             ("cloud_cover", 2 ** 40)):
+            with self.assertRaises(ValueError, msg=field):
+                WeatherDataItem(**dict(values, **{field: value}))
+
+    def test_row_matches_item(self):
+        data = loaded(WEATHER_FILE)
+        row = data.get_data(1)[0]
+        item = row.to_item()
+        self.assertIsInstance(item, WeatherDataItem)
+        self.assertEqual(str(item), str(row))
+        self.assertFalse(hasattr(row, "_values"))
+        self.assertNotIn("_values", weather_data.WeatherDataRow.__slots__)
+
+
+if __name__ == "__main__":
+    unittest.main()
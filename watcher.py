@@ -0,0 +1,138 @@
+"""
+    Keeps weather data up to date with the CSV file it is loaded from,
+    for long-running processes.
+
+    Each change to the file is ingested into a copy of the current data in
+    a background thread, and the copy is then published in place of the
+    current data. Published data is never changed, so anything still using
+    an earlier version finishes with it unchanged, and readers need no locks.
+
+    WeatherDataWatcher: Publishes a new version of the data as the file changes.
+"""
+
+__author__ = "Youngsu Choi"
+__email__ = "tonymusic0825@gmail.com"
+
+import threading
+
+from weather_data import WeatherData, file_signature
+
+
+# Default time (seconds) between checks of the file for changes.
+POLL_INTERVAL = 1.0
+
+
+class WeatherDataWatcher(object):
+    """Publishes a new version of the weather data whenever its CSV file
+    changes."""
+
+    def __init__(self, weather_file, interval=POLL_INTERVAL, on_update=None,
+                 weather_data=None):
+        """
+        Parameters:
+            weather_file (str): Name of the CSV file containing the weather data.
+            interval (float): Time (seconds) between checks for changes.
+            on_update (callable): Called with each new version of the data,
+                                  in the background thread, or None.
+            weather_data (WeatherData): Data already loaded from the file,
+                                        which is not changed, or None to
+                                        load it now.
+        """
+        self._weather_file = weather_file
+        self._interval = interval
+        self._on_update = on_update
+        # Taken before loading, so that a change made while loading is
+        # picked up by the next check.
+        self._signature = file_signature(weather_file)
+        if weather_data is None:
+            weather_data = WeatherData()
+            weather_data.load(weather_file)
+        self._current = weather_data
+        self._error = None
+        self._update_lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def get(self):
+        """(WeatherData) The most recently published version of the data.
+
+        It must not be changed, as other threads may be reading it.
+        """
+        return self._current
+
+    def get_error(self):
+        """(Exception) Why the file could not be read when it last changed,
+                       or None if it was read."""
+        return self._error
+
+    def check(self):
+        """Ingests any change to the file and publishes the result.
+
+        Rows appended since the last check are added to a copy of the current
+        data. If the file was otherwise rewritten, it is loaded again: always
+        if it has not grown, as appending rows grows it, and otherwise if
+        WeatherData.ingest_file finds that it was rewritten.
+
+        Return:
+            (bool) True if a new version of the data was published.
+
+        Raises:
+            Exception: If the file could not be read or parsed, in which case
+                the current data is kept, and the file is not read again until
+                it next changes.
+        """
+        with self._update_lock:
+            signature = file_signature(self._weather_file)
+            if signature is None or signature == self._signature:
+                return False
+            current = self._current
+            updated = current.copy()
+            try:
+                if self._signature is not None and signature[0] <= self._signature[0]:
+                    updated.load(self._weather_file)
+                else:
+                    updated.ingest_file(self._weather_file)
+            except Exception as error:
+                self._signature = signature
+                self._error = error
+                raise
+            self._signature = signature
+            self._error = None
+            if updated.get_version() == current.get_version():
+                return False
+            self._current = updated
+        if self._on_update is not None:
+            self._on_update(updated)
+        return True
+
+    def _watch(self):
+        """Checks the file every interval until stopped."""
+        while not self._stopped.wait(self._interval):
+            try:
+                self.check()
+            except Exception:
+                # Kept by check for get_error. Keep watching, as the file
+                # may yet be corrected.
+                pass
+
+    def start(self):
+        """Starts checking the file in a background thread."""
+        if self._thread is None:
+            self._stopped.clear()
+            self._thread = threading.Thread(target=self._watch, daemon=True,
+                                            name="weather-data-watcher")
+            self._thread.start()
+
+    def stop(self):
+        """Stops checking the file, waiting for any check in progress."""
+        if self._thread is not None:
+            self._stopped.set()
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exception):
+        self.stop()
@@ -4,6 +4,10 @@
 
     WeatherData: Holds data about weather over a period of time.
     WeatherDataItem: Record of weather data for a 24 hour period.
+    WeatherDataRow: View of one day of data held in a WeatherData collection.
+    WeatherDataView: Read-only view of the first days of a WeatherData.
+    WeatherDataCheckpoint: Position reached when ingesting a CSV file.
+    WeatherDataSummary: Totals and extremes of the days of a week or month.
 """
 
 __author__ = "Richard Thomas"
@@ -11,16 +15,298 @@ __email__ = "richard.thomas@uq.edu.au"
 __date__ = "24/03/2019"
 __copyright__ = "The University of Queensland, 2019"
 
+import bisect
+import bz2
+import calendar
+import copy
 import csv
+import datetime
+import glob
+import gzip
+import hashlib
+import heapq
+import io
+import itertools
+import lzma
+import math
+import mmap
+import operator
+import os
+import struct
+import sys
+import tempfile
+from array import array
+from collections import Counter, OrderedDict
+from concurrent.futures import ProcessPoolExecutor
 
+import instrumentation
 
-class WeatherDataItem(object):
+
+# 16-wind compass rose directions, plus empty for no direction recorded.
+# A direction's position in this tuple is its code in stored data.
+WIND_DIRECTIONS = ("", "N", "NNE", "NE", "ENE", "E", "ESE", "SE", "SSE",
+                   "S", "SSW", "SW", "WSW", "W", "WNW", "NW", "NNW")
+
+_WIND_CODES = {direction: code for code, direction in enumerate(WIND_DIRECTIONS)}
+
+# Bit flags for the compass components of a wind direction.
+NORTHERLY = 1
+EASTERLY = 2
+SOUTHERLY = 4
+WESTERLY = 8
+
+# Compass component flags of each wind direction, indexed by its code.
+WIND_FLAGS = tuple((NORTHERLY if "N" in direction else 0)
+                   | (EASTERLY if "E" in direction else 0)
+                   | (SOUTHERLY if "S" in direction else 0)
+                   | (WESTERLY if "W" in direction else 0)
+                   for direction in WIND_DIRECTIONS)
+
+
+def encode_wind_direction(wind_direction):
+    """Returns the code used to store a wind direction.
+
+    Surrounding whitespace is ignored, so a blank direction is stored as "".
+
+    Parameters:
+        wind_direction (str): One of WIND_DIRECTIONS.
+
+    Return:
+        (int) Position of wind_direction in WIND_DIRECTIONS.
+    """
+    try:
+        return _WIND_CODES[wind_direction.strip()]
+    except (AttributeError, KeyError):
+        raise ValueError(f"Unknown wind direction: {wind_direction!r}") from None
+
+
+# Layout of the packed values of a WeatherDataItem: rain, high and low
+# temperature, sunshine and air pressure as doubles, at byte offsets 0-32;
+# humidity, average and maximum wind speed and cloud cover as 32 bit
+# integers, at offsets 40-52; and the wind direction code, at offset 56.
+_ITEM_LAYOUT = struct.Struct("=5d4iB")
+_DOUBLE = struct.Struct("=d")
+_INT = struct.Struct("=i")
+
+
+# Source of data versions, shared by all WeatherData objects so that a
+# version identifies both a collection and the state of its data.
+_versions = itertools.count(1)
+
+
+# Fields of a WeatherDataItem, in the order taken by its constructor.
+FIELDS = ("rain", "temperature_high", "temperature_low", "sunshine_hours",
+          "humidity", "wind_speed_average", "wind_speed_max", "wind_direction",
+          "cloud_cover", "air_pressure")
+
+# Name of the WeatherDataItem method returning each field.
+GETTERS = {
+    "rain": "get_rainfall",
+    "temperature_high": "get_high_temperature",
+    "temperature_low": "get_low_temperature",
+    "sunshine_hours": "get_sunshine_hours",
+    "humidity": "get_humidity",
+    "wind_speed_average": "get_average_wind_speed",
+    "wind_speed_max": "get_maximum_wind_speed",
+    "wind_direction": "get_wind_direction_code",
+    "cloud_cover": "get_cloud_cover",
+    "air_pressure": "get_air_pressure",
+}
+
+# Name of the CSV column holding each field.
+CSV_COLUMNS = {
+    "rain": "Rainfall (mm)",
+    "temperature_high": "Maximum Temperature (C)",
+    "temperature_low": "Minimum Temperature (C)",
+    "sunshine_hours": "Sunshine (hours)",
+    "humidity": "Relative Humidity (%)",
+    "wind_speed_average": "Wind Speed (km/h)",
+    "wind_speed_max": "Maximum Wind Gust (km/h)",
+    "wind_direction": "Wind Direction",
+    "cloud_cover": "Cloud Cover (oktas)",
+    "air_pressure": "MSL Pressure (hPa)",
+}
+
+# Conversion applied to the CSV text of each field.
+PARSERS = {
+    "rain": float,
+    "temperature_high": float,
+    "temperature_low": float,
+    "sunshine_hours": float,
+    "humidity": int,
+    "wind_speed_average": int,
+    "wind_speed_max": int,
+    "wind_direction": encode_wind_direction,
+    "cloud_cover": int,
+    "air_pressure": float,
+}
+
+# Numeric fields for which cumulative sums are kept, to total any window.
+SUMMED_FIELDS = ("rain", "temperature_high", "temperature_low",
+                 "sunshine_hours", "humidity", "wind_speed_average",
+                 "wind_speed_max", "cloud_cover", "air_pressure")
+
+# Array type code of each field's column.
+# Wind directions are stored as their code in WIND_DIRECTIONS.
+TYPECODES = {
+    "rain": "d",
+    "temperature_high": "d",
+    "temperature_low": "d",
+    "sunshine_hours": "d",
+    "humidity": "i",
+    "wind_speed_average": "i",
+    "wind_speed_max": "i",
+    "wind_direction": "B",
+    "cloud_cover": "i",
+    "air_pressure": "d",
+    "date": "i",
+}
+
+# Name of the CSV column holding the date of each day.
+DATE_COLUMN = "Date"
+
+# Every column of stored data: the fields, and the date of each day as
+# its proleptic Gregorian ordinal (see datetime.date.toordinal).
+COLUMNS = FIELDS + ("date",)
+
+# Periods into which days older than those retained are rolled up.
+ROLLUP_PERIODS = ("week", "month")
+
+# Function opening each kind of compressed file, by its file extension.
+DECOMPRESSORS = {".gz": gzip.open, ".bz2": bz2.open, ".xz": lzma.open}
+
+# Directory holding weather data shared between processes: in memory,
+# where the platform provides a directory for it.
+SHARED_DIRECTORY = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+
+# Number of bytes first read back from the end of a file by load_tail,
+# doubled on each further read until enough rows have been found.
+TAIL_BLOCK_SIZE = 64 * 1024
+
+# Number of bytes before a checkpoint, along with the header, whose hash
+# is kept to tell whether the ingested part of the file has been rewritten.
+FINGERPRINT_SIZE = 64 * 1024
+
+# Number of rows whose columns are parsed together when loading a file.
+PARSE_BLOCK_ROWS = 16 * 1024
+
+
+def parse_date(date):
+    """Returns the ordinal of a date, used to store and search dates.
+
+    Parameters:
+        date (datetime.date | str | int): A date, text in the day/month/year
+            format of the CSV files or in ISO year-month-day format, or an
+            ordinal, which is returned unchanged.
+
+    Return:
+        (int) Proleptic Gregorian ordinal of the date.
+
+    Raises:
+        ValueError: If the text is not a valid date.
+    """
+    if isinstance(date, int):
+        return date
+    if isinstance(date, datetime.date):
+        return date.toordinal()
+    try:
+        if "/" in date:
+            day, month, year = date.split("/")
+        else:
+            year, month, day = date.split("-")
+        return datetime.date(int(year), int(month), int(day)).toordinal()
+    except (TypeError, ValueError):
+        raise ValueError(f"Invalid date: {date!r}") from None
+
+
+class _DateParser(object):
+    """Parses the dates of a column like parse_date, remembering the first
+    day of each month seen rather than building every day as a date."""
+
+    def __init__(self):
+        # Ordinal of the first day and number of days, by "month/year" text.
+        self._months = {}
+
+    def __call__(self, date):
+        """(int) Ordinal of a date, as returned by parse_date(date)."""
+        day, _, month = date.partition("/")
+        known = self._months.get(month)
+        if known is None:
+            try:
+                first = parse_date("1/" + month)
+            except ValueError:
+                return parse_date(date)
+            start = datetime.date.fromordinal(first)
+            known = (first, calendar.monthrange(start.year, start.month)[1])
+            self._months[month] = known
+        first, days = known
+        try:
+            number = int(day)
+        except ValueError:
+            return parse_date(date)
+        if not 1 <= number <= days:
+            return parse_date(date)
+        return first + number - 1
+
+
+class _WeatherRecord(object):
+    """Methods shared by WeatherDataItem and WeatherDataRow, which are
+    derived from the values each of them stores in its own way."""
+
+    __slots__ = ()
+
+    def get_wind_direction(self):
+        """(str) 16-wind compass rose directions."""
+        return WIND_DIRECTIONS[self.get_wind_direction_code()]
+
+    def get_wind_flags(self):
+        """(int) NORTHERLY, EASTERLY, SOUTHERLY and WESTERLY flags of the
+                 compass components of the wind direction."""
+        return WIND_FLAGS[self.get_wind_direction_code()]
+
+    def has_easterly_component(self):
+        """(bool) True if the wind direction has an easterly component."""
+        return bool(self.get_wind_flags() & EASTERLY)
+
+    def __str__(self):
+        """(str) Readable representation of the object's data."""
+        return (f"Rain: {self.get_rainfall()}\n"
+                f"High Temp: {self.get_high_temperature()}\n"
+                f"Low Temp: {self.get_low_temperature()}\n"
+                f"Sunshine: {self.get_sunshine_hours()}\n"
+                f"Humidity: {self.get_humidity()}\n"
+                f"Ave Wind: {self.get_average_wind_speed()}\n"
+                f"Max Wind: {self.get_average_wind_speed()}\n"
+                f"Wind Dir: {self.get_wind_direction()}\n"
+                f"Cloud Cover: {self.get_cloud_cover()}\n"
+                f"Pressure: {self.get_air_pressure()}"
+                )
+
+
+def _convert(convert, name, value):
+    """Converts a value with 'convert', raising ValueError naming the field
+    if it cannot be converted."""
+    try:
+        return convert(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"Invalid {name}: {value!r}") from None
+
+
+class WeatherDataItem(_WeatherRecord):
     """Record of weather data for a 24 hour period."""
 
+    # The values are packed into one bytes object, rather than held as
+    # separate attributes, which about halves the size of each record.
+    __slots__ = ("_values",)
+
     def __init__(self, rain, temperature_high, temperature_low, sunshine_hours,
                  humidity, wind_speed_average, wind_speed_max, wind_direction,
                  cloud_cover, air_pressure):
         """
+        Values are converted with float() or int(), as below, so numbers
+        given as text are accepted, but an int field given a float loses its
+        fraction.
+
         Parameters:
             rain (float): Amount of rainfall (mm).
             temperature_high (float): Maximum temperature (C).
@@ -32,111 +318,801 @@ class WeatherDataItem(object):
             wind_direction (str): 16-wind compass rose directions.
                                   N, NNE, NE, ENE, E, ESE, SE, SSE, S, SSW, SW,
                                   WSW, W, WNW, NW, NNW, or empty string.
+                                  Surrounding whitespace is ignored; any other
+                                  value is not accepted.
             cloud_cover (int): Scale of 0 to 9 (oktas),
                                0 is clear, 8 is full cloud cover,
                                9 means sky is not visible (e.g. foggy).
             air_pressure (float): Mean sea level air pressure (hPa).
+
+        Raises:
+            ValueError: If a value cannot be converted, an int field does not
+                        fit in 32 bits, or the wind direction is not one of
+                        WIND_DIRECTIONS.
         """
-        self._rain = rain
-        self._temperature_high = temperature_high
-        self._temperature_low = temperature_low
-        self._sunshine_hours = sunshine_hours
-        self._humidity = humidity
-        self._wind_speed_average = wind_speed_average
-        self._wind_speed_max = wind_speed_max
-        self._wind_direction = wind_direction
-        self._cloud_cover = cloud_cover
-        self._air_pressure = air_pressure
+        values = (_convert(float, "rainfall", rain),
+                  _convert(float, "high temperature", temperature_high),
+                  _convert(float, "low temperature", temperature_low),
+                  _convert(float, "sunshine hours", sunshine_hours),
+                  _convert(float, "air pressure", air_pressure),
+                  _convert(int, "humidity", humidity),
+                  _convert(int, "average wind speed", wind_speed_average),
+                  _convert(int, "maximum wind speed", wind_speed_max),
+                  _convert(int, "cloud cover", cloud_cover),
+                  encode_wind_direction(wind_direction))
+        try:
+            self._values = _ITEM_LAYOUT.pack(*values)
+        except struct.error:
+            raise ValueError("Humidity, wind speeds and cloud cover must fit in "
+                             f"32 bits: {values[5:9]}") from None
 
     def get_rainfall(self):
         """(float) Amount of rainfall (mm)."""
-        return self._rain
+        return _DOUBLE.unpack_from(self._values, 0)[0]
 
     def get_high_temperature(self):
         """(float) Maximum temperature (C)."""
-        return self._temperature_high
+        return _DOUBLE.unpack_from(self._values, 8)[0]
 
     def get_low_temperature(self):
         """(float) Minimum temperature (C)."""
-        return self._temperature_low
+        return _DOUBLE.unpack_from(self._values, 16)[0]
 
     def get_sunshine_hours(self):
         """(float) Number of hours of sunshine."""
-        return self._sunshine_hours
+        return _DOUBLE.unpack_from(self._values, 24)[0]
 
     def get_humidity(self):
         """(int) Relative humidity (%)."""
-        return self._humidity
+        return _INT.unpack_from(self._values, 40)[0]
 
     def get_average_wind_speed(self):
         """(int) Average wind speed (km/h)."""
-        return self._wind_speed_average
+        return _INT.unpack_from(self._values, 44)[0]
 
     def get_maximum_wind_speed(self):
         """Maximum gust of wind speed (km/h)."""
-        return self._wind_speed_max
+        return _INT.unpack_from(self._values, 48)[0]
 
-    def get_wind_direction(self):
-        """(str) 16-wind compass rose directions."""
-        return self._wind_direction
+    def get_wind_direction_code(self):
+        """(int) Position of the wind direction in WIND_DIRECTIONS."""
+        return self._values[56]
+
+    def to_item(self):
+        """(WeatherDataItem) The item itself, as it does not change."""
+        return self
 
     def get_cloud_cover(self):
         """(int) Scale of 0 to 9 (oktas),"""
-        return self._cloud_cover
+        return _INT.unpack_from(self._values, 52)[0]
 
     def get_air_pressure(self):
         """(float) Mean sea level air pressure (hPa)."""
-        return self._air_pressure
+        return _DOUBLE.unpack_from(self._values, 32)[0]
 
-    def __str__(self):
-        """(str) Readable representation of the object's data."""
-        return (f"Rain: {self.get_rainfall()}\n"
-                f"High Temp: {self.get_high_temperature()}\n"
-                f"Low Temp: {self.get_low_temperature()}\n"
-                f"Sunshine: {self.get_sunshine_hours()}\n"
-                f"Humidity: {self.get_humidity()}\n"
-                f"Ave Wind: {self.get_average_wind_speed()}\n"
-                f"Max Wind: {self.get_average_wind_speed()}\n"
-                f"Wind Dir: {self.get_wind_direction()}\n"
-                f"Cloud Cover: {self.get_cloud_cover()}\n"
-                f"Pressure: {self.get_air_pressure()}"
-                )
+
+class WeatherDataRow(_WeatherRecord):
+    """View of one day of weather data held in a WeatherData collection.
+
+    Has the same methods as a WeatherDataItem, but reads its values from the
+    columns of the collection rather than holding its own copy of them.
+    """
+
+    __slots__ = ("_data", "_index")
+
+    def __init__(self, weather_data, index):
+        """
+        Parameters:
+            weather_data (WeatherData): Collection holding the data.
+            index (int): Position of the day among every day ever added to
+                         the collection, including any rolled up or cleared
+                         since.
+        """
+        self._data = weather_data
+        self._index = index
+
+    def _value(self, field):
+        """Returns the value of 'field' for this day."""
+        data = self._data
+        position = self._index - data._base
+        if position < 0:
+            raise ValueError("This day is no longer held in the collection: "
+                             "it has been rolled up or cleared")
+        return data._columns[field][position]
+
+    def get_rainfall(self):
+        """(float) Amount of rainfall (mm)."""
+        return self._value("rain")
+
+    def get_high_temperature(self):
+        """(float) Maximum temperature (C)."""
+        return self._value("temperature_high")
+
+    def get_low_temperature(self):
+        """(float) Minimum temperature (C)."""
+        return self._value("temperature_low")
+
+    def get_sunshine_hours(self):
+        """(float) Number of hours of sunshine."""
+        return self._value("sunshine_hours")
+
+    def get_humidity(self):
+        """(int) Relative humidity (%)."""
+        return self._value("humidity")
+
+    def get_average_wind_speed(self):
+        """(int) Average wind speed (km/h)."""
+        return self._value("wind_speed_average")
+
+    def get_maximum_wind_speed(self):
+        """Maximum gust of wind speed (km/h)."""
+        return self._value("wind_speed_max")
+
+    def get_wind_direction_code(self):
+        """(int) Position of the wind direction in WIND_DIRECTIONS."""
+        return self._value("wind_direction")
+
+    def get_date(self):
+        """(datetime.date) Date of the day."""
+        return datetime.date.fromordinal(self._value("date"))
+
+    def get_cloud_cover(self):
+        """(int) Scale of 0 to 9 (oktas),"""
+        return self._value("cloud_cover")
+
+    def get_air_pressure(self):
+        """(float) Mean sea level air pressure (hPa)."""
+        return self._value("air_pressure")
+
+    def to_item(self):
+        """(WeatherDataItem) Copy of the day's values, which does not keep
+                             the collection alive."""
+        return WeatherDataItem(
+            self.get_rainfall(), self.get_high_temperature(),
+            self.get_low_temperature(), self.get_sunshine_hours(),
+            self.get_humidity(), self.get_average_wind_speed(),
+            self.get_maximum_wind_speed(), self.get_wind_direction(),
+            self.get_cloud_cover(), self.get_air_pressure())
 
 
 class WeatherData(object):
-    """Collection of weather data over a period of time."""
+    """Collection of weather data over a period of time.
+
+    The data is stored column-wise, with one typed array per numeric field,
+    rather than as a list of WeatherDataItem objects.
+    """
 
     def __init__(self):
         """
         """
-        self._weather_data = []
+        self._columns = _new_columns()
+        self._sums = _new_sums()
+        self._sum_errors = _new_sums()
+        self._size = 0
+        self._base = 0
+        self._summaries = OrderedDict()
+        self._retention = None
+        self._deferred = {}
+        self._checkpoint = None
+        self._snapshot_source = None
+        self._snapshot_buffer = None
+        self._version = next(_versions)
 
-    def load(self, weather_file) :
+    def load(self, weather_file, fields=None) :
         """Loads a fresh set of weather data from a CSV file.
 
+        Each column is parsed whole and its cumulative sums computed in one
+        pass, rather than the rows being appended one at a time.
+
         Parameters:
             weather_file (str): Name of the CSV file containing the weather data.
+            fields (iter<str>): Columns to parse now, from COLUMNS, or None for
+                                all of them. The other columns are parsed from
+                                the file when they are first used, so the file
+                                must not be rewritten until then.
 
         Pre-condition:
             weather_file != ""
             weather_file is CSV file containing the accessed columns.
         """
-        self._weather_data.clear()
-        with open(weather_file) as weather_details :
-            file_reader = csv.DictReader(weather_details)
-
-            for row in file_reader:
-                self._weather_data.append(
-                    WeatherDataItem(float(row["Rainfall (mm)"]),
-                                    float(row["Maximum Temperature (C)"]),
-                                    float(row["Minimum Temperature (C)"]),
-                                    float(row["Sunshine (hours)"]),
-                                    int(row["Relative Humidity (%)"]),
-                                    int(row["Wind Speed (km/h)"]),
-                                    int(row["Maximum Wind Gust (km/h)"]),
-                                    row["Wind Direction"],
-                                    int(row["Cloud Cover (oktas)"]),
-                                    float(row["MSL Pressure (hPa)"])))
+        self.clear()
+        fields = set(COLUMNS if fields is None else fields)
+        unknown = fields.difference(COLUMNS)
+        if unknown:
+            raise ValueError(f"Unknown weather data columns: {sorted(unknown)}")
+        with open(weather_file, "rb") as weather_details:
+            header_line = weather_details.readline()
+            if not header_line.endswith(b"\n"):
+                return
+            header = next(csv.reader([header_line.decode("utf-8-sig")]))
+            # The whole file is read, so the CSV reader reads it directly.
+            text = io.TextIOWrapper(weather_details, encoding="utf-8",
+                                    newline="")
+            columns, self._size = _parse_columns(csv.reader(text), header,
+                                                 [field for field in COLUMNS
+                                                  if field in fields])
+            end = text.detach().tell()
+            checkpoint = WeatherDataCheckpoint.at(weather_details, weather_file,
+                                                  end, header)
+
+        deferred = (weather_file, len(header_line), end, header)
+        self._deferred = {field: deferred for field in COLUMNS
+                          if field not in fields}
+        if self._deferred:
+            self._columns = _LazyColumns(self._load_deferred)
+            self._sums = _LazyColumns(self._load_deferred)
+            self._sum_errors = _LazyColumns(self._load_deferred)
+        for field, column in columns.items():
+            self._set_column(field, column)
+        self._checkpoint = checkpoint
+        self._version = next(_versions)
+        self._apply_retention()
+
+    def load_tail(self, weather_file, number_days):
+        """Loads only the most recent days of weather data from a CSV file.
+
+        The file is read backwards from its end, so the time taken depends
+        on number_days rather than on the length of the file. Rows appended
+        to the file later can be added with ingest_file.
+
+        Parameters:
+            weather_file (str): Name of the CSV file containing the weather data.
+            number_days (int): Number of days of data to load.
+                               All of them are loaded if the file has fewer.
+
+        Pre-condition:
+            number_days > 0
+            No CSV field in the file contains a line break.
+        """
+        self.clear()
+        with open(weather_file, "rb") as weather_details:
+            header_line = weather_details.readline()
+            if not header_line.endswith(b"\n"):
+                return
+            header = next(csv.reader([header_line.decode("utf-8-sig")]))
+            offset = _tail_offset(weather_details, len(header_line), number_days)
+            weather_details.seek(offset)
+
+            lines = _LineReader(weather_details, offset, last_line=True)
+            self._ingest_rows(csv.reader(lines), header)
+            self._checkpoint = WeatherDataCheckpoint.at(
+                weather_details, weather_file, lines.get_offset(), header)
+
+    def load_files(self, weather_files, workers=None):
+        """Loads a fresh set of weather data from many CSV files.
+
+        The files, any of which may be compressed (see DECOMPRESSORS), are
+        parsed in a pool of worker processes. Each is decompressed as it is
+        read, so no file is ever held in memory whole. The days of all the
+        files are then merged in date order.
+
+        Parameters:
+            weather_files (str | list<str>): A glob pattern or list of files.
+            workers (int): Number of worker processes, or None for one per CPU.
+                           With one worker, or one file, no processes are used.
+
+        Pre-condition:
+            Either every file has a Date column, or none of them do, in which
+            case the days are taken to follow on in the order of the files.
+        """
+        if isinstance(weather_files, str):
+            weather_files = sorted(glob.glob(weather_files))
+        weather_files = list(weather_files)
+        workers = workers or os.cpu_count()
+
+        if workers == 1 or len(weather_files) <= 1:
+            parsed = list(map(_read_weather_file, weather_files))
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                parsed = list(executor.map(_read_weather_file, weather_files))
+
+        self.clear()
+        for field, column in _merge_columns(parsed).items():
+            self._set_column(field, column)
+        self._size = len(self._columns["date"])
+        self._version = next(_versions)
+        self._apply_retention()
+
+    def _load_deferred(self, *fields):
+        """Parses columns that were not parsed when the data was loaded,
+        in one pass over the part of the file they were deferred from.
+
+        Parameters:
+            fields (str): Names of the columns, or of summed fields, all
+                          deferred from the same part of the same file.
+
+        Raises:
+            ValueError: If the file no longer holds the loaded rows.
+        """
+        weather_file, start, end, header = self._deferred[fields[0]]
+        for field in fields:
+            del self._deferred[field]
+        with open(weather_file, "rb") as weather_details:
+            weather_details.seek(start)
+            lines = _LineReader(weather_details, start, end, last_line=True)
+            columns, count = _parse_columns(csv.reader(lines), header, fields)
+        if count != self._size:
+            raise ValueError(f"{weather_file} has changed since it was loaded")
+        for field in fields:
+            self._set_column(field, columns[field])
+
+    def _set_column(self, field, column):
+        """Stores a whole column, with its cumulative sums if it has them.
+
+        Raises:
+            ValueError: If the column holds dates that are out of order.
+        """
+        if field == "date" and any(map(operator.gt, column, column[1:])):
+            raise ValueError("Weather data must be in date order")
+        self._columns[field] = column
+        if field in SUMMED_FIELDS:
+            sums, errors = _cumulative_sums(column)
+            self._sums[field] = sums
+            self._sum_errors[field] = errors
+
+    def _load_all_deferred(self):
+        """Parses every column not yet parsed, and stops deferring columns."""
+        while self._deferred:
+            source = next(iter(self._deferred.values()))
+            self._load_deferred(*[field for field, deferred
+                                  in self._deferred.items()
+                                  if deferred == source])
+        self._columns = dict(self._columns)
+        self._sums = dict(self._sums)
+        self._sum_errors = dict(self._sum_errors)
+
+    def ingest_file(self, weather_file, offset=None):
+        """Appends the rows of a CSV file that have not yet been ingested.
+
+        Only complete lines are ingested, so a row that is still being
+        written is picked up by the next call.
+
+        If the data holds a checkpoint of the same file (see get_checkpoint),
+        ingesting continues from it. The file is loaded again in place of
+        the data only if the file no longer matches the checkpoint (see
+        WeatherDataCheckpoint.matches), or if the first row after it cannot
+        be parsed, as then the checkpoint no longer falls at the start of a
+        row. Otherwise every row of the file is appended.
+
+        Parameters:
+            weather_file (str): Name of the CSV file containing the weather data.
+            offset (int): Byte offset of the first row to ingest, or None to
+                          choose it as above.
+
+        Return:
+            (int) Number of days of data added.
+
+        Raises:
+            ValueError, IndexError: If a row cannot be parsed, or is dated
+                before the most recent day. The rows before it are kept,
+                and the checkpoint is left at its start.
+        """
+        checkpoint = self._checkpoint
+        if offset is not None or checkpoint is None \
+                or checkpoint.get_file() != weather_file:
+            return self._ingest_file(weather_file, offset or 0)
+
+        if checkpoint.matches():
+            try:
+                return self._ingest_file(weather_file, checkpoint.get_offset(),
+                                         checkpoint.get_header())
+            except (ValueError, IndexError):
+                if self._checkpoint.get_offset() != checkpoint.get_offset():
+                    raise
+                # The first new row could not be parsed: the file was most
+                # likely rewritten in a way the fingerprint missed, or else
+                # loading it again raises the same error.
+        self.clear()
+        return self._ingest_file(weather_file, 0)
+
+    def _ingest_file(self, weather_file, offset, header=None, last_line=False):
+        """Appends the rows of a CSV file from a byte offset.
+
+        Parameters:
+            weather_file (str): Name of the CSV file containing the weather data.
+            offset (int): Byte offset of the first row to ingest.
+            header (list<str>): Column names of the file, or None to read them
+                                from its first line.
+            last_line (bool): Whether to ingest a last line without a line
+                              break, rather than leave it as possibly still
+                              being written.
+
+        Return:
+            (int) Number of days of data added.
+        """
+        with open(weather_file, "rb") as weather_details:
+            if header is None:
+                header_line = weather_details.readline()
+                if not header_line.endswith(b"\n"):
+                    return 0
+                header = next(csv.reader([header_line.decode("utf-8-sig")]))
+                offset = max(offset, len(header_line))
+            weather_details.seek(offset)
+
+            lines = _LineReader(weather_details, offset, last_line=last_line)
+            self._ensure_writable()
+            size = self.size()
+            try:
+                self._ingest_rows(csv.reader(lines), header)
+            except Exception:
+                self._checkpoint = WeatherDataCheckpoint.at(
+                    weather_details, weather_file, lines.get_line_start(), header)
+                raise
+            self._checkpoint = WeatherDataCheckpoint.at(
+                weather_details, weather_file, lines.get_offset(), header)
+        return self.size() - size
+
+    def ingest(self, records):
+        """Appends a sequence of records to the end of the data.
+
+        Parameters:
+            records (iter<WeatherDataItem | dict<str, str>>):
+                Records ordered from oldest to most recent. Each is either a
+                WeatherDataItem or a CSV row mapping column names to text.
+                Records without a date are taken to be of the day after
+                the most recent day.
+
+        Return:
+            (int) Number of days of data added.
+        """
+        self._ensure_writable()
+        size = self.size()
+        for record in records:
+            if isinstance(record, dict):
+                date = record.get(DATE_COLUMN)
+                self._append_values([PARSERS[field](record[CSV_COLUMNS[field]])
+                                     for field in FIELDS],
+                                    None if date is None else parse_date(date))
+            else:
+                self.append(record)
+        return self.size() - size
+
+    def append(self, weather_item, date=None):
+        """Appends one day of weather data as the most recent day.
+
+        Parameters:
+            weather_item (WeatherDataItem): Weather data for the day.
+            date (datetime.date | str): Date of the day, or None for the day
+                                        after the most recent day.
+
+        Raises:
+            ValueError: If the date is before the most recent day.
+        """
+        self._ensure_writable()
+        self._append_values([weather_item.get_rainfall(),
+                             weather_item.get_high_temperature(),
+                             weather_item.get_low_temperature(),
+                             weather_item.get_sunshine_hours(),
+                             weather_item.get_humidity(),
+                             weather_item.get_average_wind_speed(),
+                             weather_item.get_maximum_wind_speed(),
+                             weather_item.get_wind_direction_code(),
+                             weather_item.get_cloud_cover(),
+                             weather_item.get_air_pressure()],
+                            None if date is None else parse_date(date))
+
+    def clear(self):
+        """Removes all of the weather data, keeping any retention policy."""
+        self._columns = _new_columns()
+        self._sums = _new_sums()
+        self._sum_errors = _new_sums()
+        # Days are never renumbered, so rows taken from the removed data
+        # cannot read the days that replace it.
+        self._base += self._size
+        self._size = 0
+        self._summaries = OrderedDict()
+        self._deferred = {}
+        self._checkpoint = None
+        self._snapshot_source = None
+        self._snapshot_buffer = None
+        self._version = next(_versions)
+
+    def save_snapshot(self, snapshot_file, weather_file=None):
+        """Saves the data to a binary snapshot file.
+
+        The snapshot holds each column as a fixed-width block, so that
+        open_snapshot can map it into memory without parsing it.
+
+        Parameters:
+            snapshot_file (str): Name of the snapshot file to write.
+            weather_file (str): Name of the CSV file the data came from.
+                                Its size and modification time are recorded,
+                                to detect when the snapshot becomes stale.
+                                If None, the file last ingested is used,
+                                if any.
+        """
+        if weather_file is None and self._checkpoint is not None:
+            weather_file = self._checkpoint.get_file()
+        if weather_file is None:
+            weather_file = self._snapshot_source
+        signature = None if weather_file is None else file_signature(weather_file)
+        # A missing source leaves the snapshot to be rebuilt when it is opened.
+        source_size, source_mtime = signature or (0, 0)
+
+        temporary_file = f"{snapshot_file}.{os.getpid()}.tmp"
+        with open(temporary_file, "wb") as snapshot:
+            columns = self._stored_columns()
+            snapshot.write(_snapshot_header(
+                columns, self.size(), weather_file, source_size,
+                source_mtime))
+            for _, column in columns:
+                column = memoryview(column).cast("B")
+                snapshot.write(column)
+                snapshot.write(bytes(_padding(len(column))))
+        os.replace(temporary_file, snapshot_file)
+
+    @classmethod
+    def open_snapshot(cls, snapshot_file, weather_file=None):
+        """Opens weather data saved by save_snapshot.
+
+        The snapshot is memory mapped and its columns are read in place.
+        If the snapshot is missing, unreadable or older than the CSV file it
+        was built from, it is rebuilt from the CSV file.
+
+        Parameters:
+            snapshot_file (str): Name of the snapshot file.
+            weather_file (str): Name of the CSV file the snapshot is built from.
+                                If None, the file recorded in the snapshot is used.
+
+        Return:
+            (WeatherData) The weather data.
+        """
+        try:
+            weather_data = cls._map_snapshot(snapshot_file)
+        except (OSError, ValueError):
+            if weather_file is None:
+                raise
+            weather_data = None
+
+        if weather_data is not None:
+            if weather_file is None:
+                weather_file = weather_data._snapshot_source
+            if (weather_file is None or weather_data._snapshot_signature
+                    == file_signature(weather_file)):
+                return weather_data
+
+        weather_data = cls()
+        weather_data.load(weather_file)
+        weather_data.save_snapshot(snapshot_file, weather_file)
+        return weather_data
+
+    @classmethod
+    def _map_snapshot(cls, snapshot_file):
+        """Maps a snapshot file into memory.
+
+        Raises:
+            ValueError: If the file is not a readable snapshot.
+        """
+        with open(snapshot_file, "rb") as snapshot:
+            if os.fstat(snapshot.fileno()).st_size == 0:
+                raise ValueError(f"Empty snapshot file: {snapshot_file}")
+            buffer = mmap.mmap(snapshot.fileno(), 0, access=mmap.ACCESS_READ)
+        weather_data = cls()
+        (weather_data._columns, weather_data._sums,
+         weather_data._sum_errors, weather_data._snapshot_source,
+         weather_data._snapshot_signature) = _read_snapshot(buffer)
+        weather_data._size = len(weather_data._columns["date"])
+        weather_data._snapshot_buffer = buffer
+        return weather_data
+
+    def share(self, name=None):
+        """Publishes the data for other processes to read without copying it.
+
+        The data is saved as a snapshot in SHARED_DIRECTORY, which other
+        processes map into memory with attach, so that they all read the one
+        copy held by the operating system. Changes made after sharing are not
+        seen by processes that attach.
+
+        Parameters:
+            name (str): File name to share the data under, or None for a name
+                        unique to this process and data version.
+
+        Return:
+            (str) Name to attach to the data by. It stays available until
+                  removed with unshare.
+        """
+        if name is None:
+            name = f"weather-data-{os.getpid()}-{self._version}"
+        shared_file = os.path.join(SHARED_DIRECTORY, name)
+        self.save_snapshot(shared_file)
+        return shared_file
+
+    @classmethod
+    def attach(cls, name):
+        """Reads weather data published by share, mapping it into memory.
+
+        The data is read in place, without parsing or copying, until it is
+        changed, when it is copied into this process.
+
+        Parameters:
+            name (str): Name returned by share.
+
+        Return:
+            (WeatherData) The weather data.
+
+        Raises:
+            OSError: If no data is shared under the name.
+        """
+        return cls._map_snapshot(name)
+
+    @staticmethod
+    def unshare(name):
+        """Removes data published by share. Processes already attached to it
+        can keep reading it.
+
+        Parameters:
+            name (str): Name returned by share.
+        """
+        try:
+            os.remove(name)
+        except FileNotFoundError:
+            pass
+
+    def _stored_columns(self):
+        """(list<tuple<str, array | memoryview>>) Named columns, cumulative
+                                                  sums and errors to store."""
+        return ([(field, self._columns[field]) for field in COLUMNS]
+                + [(_SUM_PREFIX + field, self._sums[field])
+                   for field in SUMMED_FIELDS]
+                + [(_ERROR_PREFIX + field, self._sum_errors[field])
+                   for field in SUMMED_FIELDS])
+
+    def _ensure_writable(self):
+        """Copies columns read from a snapshot into arrays that can grow,
+        and parses any columns whose parsing was deferred."""
+        if self._deferred:
+            self._load_all_deferred()
+        if self._snapshot_buffer is not None:
+            self._columns = {field: array(TYPECODES[field], column)
+                             for field, column in self._columns.items()}
+            self._sums = {field: array("d", sums)
+                          for field, sums in self._sums.items()}
+            self._sum_errors = {field: array("d", errors)
+                                for field, errors in self._sum_errors.items()}
+            self._snapshot_source = None
+            self._snapshot_buffer = None
+
+    def set_retention(self, number_days, period="month", compact_days=None):
+        """Limits the days kept in full, rolling older days up into summaries.
+
+        Once the data holds number_days + compact_days days, the oldest are
+        removed, leaving number_days, and added to a WeatherDataSummary of
+        their week or month. Removing days in batches keeps the cost per day
+        added constant, and memory stays bounded however many days are added.
+
+        Rows returned before days are rolled up keep reading the same days,
+        as do views, except for days that have themselves been rolled up.
+        Snapshots do not include the summaries.
+
+        Parameters:
+            number_days (int): Number of most recent days to keep in full,
+                               or None to keep every day.
+            period (str): Period of the summaries, one of ROLLUP_PERIODS.
+            compact_days (int): Number of days beyond number_days to allow
+                                before rolling up, or None for number_days.
+
+        Raises:
+            ValueError: If the period is not one of ROLLUP_PERIODS.
+        """
+        if number_days is None:
+            self._retention = None
+            return
+        if period not in ROLLUP_PERIODS:
+            raise ValueError(f"Unknown roll-up period: {period!r}")
+        if compact_days is None:
+            compact_days = number_days
+        self._retention = (max(number_days, 1), period, max(compact_days, 1))
+        self._apply_retention()
+
+    def get_retention(self):
+        """(tuple<int, str, int>) Number of days kept in full, period of the
+                                  summaries and number of days rolled up at
+                                  once, or None if every day is kept."""
+        return self._retention
+
+    def get_summaries(self):
+        """(list<WeatherDataSummary>) Summaries of the days rolled up,
+                                      ordered from oldest to most recent."""
+        return list(self._summaries.values())
+
+    def _apply_retention(self):
+        """Rolls up the oldest days if the retention policy allows no more."""
+        if self._retention is None:
+            return
+        number_days, period, compact_days = self._retention
+        if self._size >= number_days + compact_days:
+            self._ensure_writable()
+            self._roll_up(self._size - number_days, period)
+
+    def _roll_up(self, count, period):
+        """Removes the oldest days, adding them to the summaries of their periods.
+
+        Parameters:
+            count (int): Number of days to remove.
+            period (str): Period of the summaries, one of ROLLUP_PERIODS.
+        """
+        dates = self._columns["date"]
+        first = 0
+        while first < count:
+            start = period_start(dates[first], period)
+            last = bisect.bisect_left(dates, period_end(start, period),
+                                      first, count)
+            summary = self._summaries.get(start)
+            if summary is None:
+                summary = self._summaries[start] = WeatherDataSummary(start)
+            summary.add(self._columns, first, last)
+            first = last
+
+        for column in self._columns.values():
+            del column[:count]
+        for sums in self._sums.values():
+            del sums[:count]
+        for errors in self._sum_errors.values():
+            del errors[:count]
+        self._size -= count
+        self._base += count
+        self._version = next(_versions)
+
+    def get_checkpoint(self):
+        """(WeatherDataCheckpoint) Position reached by the last file ingest,
+                                   or None if no file has been ingested."""
+        return self._checkpoint
+
+    def _ingest_rows(self, rows, header):
+        """Appends parsed CSV rows to the end of the data.
+
+        Parameters:
+            rows (iter<list<str>>): CSV rows, excluding the header.
+            header (list<str>): Column names of the CSV file.
+        """
+        positions = [(PARSERS[field], header.index(CSV_COLUMNS[field]))
+                     for field in FIELDS]
+        date_position = (header.index(DATE_COLUMN) if DATE_COLUMN in header
+                         else None)
+        for row in rows:
+            if row:
+                self._append_values([parse(row[position])
+                                     for parse, position in positions],
+                                    None if date_position is None
+                                    else parse_date(row[date_position]))
+
+    def _append_values(self, values, date=None):
+        """Appends one day of data, given its values in FIELDS order.
+
+        Parameters:
+            values (list): Values of the day, in FIELDS order.
+            date (int): Ordinal of the day's date, or None for the day after
+                        the most recent day.
+
+        Raises:
+            ValueError: If the date is before the most recent day.
+        """
+        dates = self._columns["date"]
+        if date is None:
+            date = dates[-1] + 1 if dates else 1
+        elif dates and date < dates[-1]:
+            raise ValueError("Weather data must be added in date order: "
+                             f"{datetime.date.fromordinal(date)} is before "
+                             f"{datetime.date.fromordinal(dates[-1])}")
+        dates.append(date)
+        self._size += 1
+
+        self._version = next(_versions)
+        for field, value in zip(FIELDS, values):
+            self._columns[field].append(value)
+            sums = self._sums.get(field)
+            if sums is not None:
+                # Keep the rounding error of each addition, so that window
+                # totals can be computed exactly.
+                last = sums[-1]
+                total = last + value
+                rounding = total - last
+                errors = self._sum_errors[field]
+                errors.append(errors[-1] + (last - (total - rounding))
+                              + (value - rounding))
+                sums.append(total)
+        if self._retention is not None:
+            self._apply_retention()
 
     def get_data(self, number_days):
         """Returns a specified number of days of weather data.
@@ -154,14 +1130,842 @@ class WeatherData(object):
             [WeatherDataItem] List of WeatherDataItem objects,
                               ordered from oldest to most recent.
         """
-        # Slice list number_days from end to end.
-        return self._weather_data[(-1 * number_days):]
+        size = self.size()
+        start = max(0, size - number_days)
+        return [WeatherDataRow(self, self._base + index)
+                for index in range(start, size)]
+
+    def get_column(self, field, number_days=None, end=None):
+        """Returns the values of one field, for bulk computation.
+
+        Parameters:
+            field (str): Name of the field, one of COLUMNS.
+            number_days (int): Number of days to retrieve, counting backwards
+                               from 'end', or None for all days before 'end'.
+            end (int): Number of days from the start of the data to the end
+                       of the retrieved days, or None for all of the data.
+
+        Return:
+            (array | memoryview) Values of the field, ordered from oldest to
+                                 most recent. Wind directions are given as
+                                 their code in WIND_DIRECTIONS, and dates
+                                 as ordinals.
+        """
+        column = self._columns[field]
+        if end is None:
+            end = len(column)
+        if number_days is None:
+            return column[:end]
+        return column[max(0, end - number_days):end]
+
+    def window_sum(self, field, number_days, end=None):
+        """Returns the total of a field over a window of days, in constant time.
+
+        Parameters:
+            field (str): Name of the field, one of SUMMED_FIELDS.
+            number_days (int): Number of days in the window, counting backwards
+                               from 'end'. Limited to the days available.
+            end (int): Number of days from the start of the data to the end
+                       of the window, or None for all of the data.
+
+        Return:
+            (float) Sum of the field's values over the window.
+        """
+        sums = self._sums[field]
+        errors = self._sum_errors[field]
+        if end is None:
+            end = len(sums) - 1
+        start = max(0, end - number_days)
+
+        # Subtract the compensated sums so that the result is the window's
+        # total rounded once, as if it had been added up exactly.
+        total = sums[end] - sums[start]
+        rounding = total - sums[end]
+        error = ((sums[end] - (total - rounding)) + (-sums[start] - rounding)
+                 + (errors[end] - errors[start]))
+        return total + error
+
+    def window_mean(self, field, number_days, end=None):
+        """Returns the mean of a field over a window of days, in constant time.
+
+        Parameters:
+            field (str): Name of the field, one of SUMMED_FIELDS.
+            number_days (int): Number of days in the window, counting backwards
+                               from 'end'. Limited to the days available.
+            end (int): Number of days from the start of the data to the end
+                       of the window, or None for all of the data.
+
+        Return:
+            (float) Mean of the field's values over the days in the window.
+
+        Pre-condition:
+            number_days > 0 and the window contains at least one day.
+        """
+        if end is None:
+            end = self.size()
+        return (self.window_sum(field, number_days, end)
+                / (end - max(0, end - number_days)))
+
+    def get_data_range(self, start, end, size=None):
+        """Returns the weather data of the days between two dates.
+
+        Parameters:
+            start (datetime.date | str): First date to include.
+            end (datetime.date | str): Last date to include.
+            size (int): Number of days, from the start of the data, to search,
+                        or None for all of the data.
+
+        Return:
+            [WeatherDataItem] Weather data of the days from start to end,
+                              inclusive, ordered from oldest to most recent.
+        """
+        dates = self._columns["date"]
+        size = len(dates) if size is None else size
+        first = bisect.bisect_left(dates, parse_date(start), 0, size)
+        last = bisect.bisect_right(dates, parse_date(end), first, size)
+        return [WeatherDataRow(self, self._base + index)
+                for index in range(first, last)]
+
+    def get_data_as_of(self, date, number_days):
+        """Returns a number of days of weather data, up to and including a date.
+
+        Parameters:
+            date (datetime.date | str): Most recent date to include.
+            number_days (int): Number of days of data to retrieve, counting
+                               backwards from the last day on or before date.
+
+        Return:
+            [WeatherDataItem] Weather data, ordered from oldest to most recent.
+        """
+        return self.as_of(date).get_data(number_days)
+
+    def index_of(self, date, size=None):
+        """Returns the number of days up to and including a date.
+
+        Parameters:
+            date (datetime.date | str): The date.
+            size (int): Number of days, from the start of the data, to search,
+                        or None for all of the data.
+
+        Return:
+            (int) Number of days on or before date.
+        """
+        dates = self._columns["date"]
+        return bisect.bisect_right(dates, parse_date(date), 0,
+                                   len(dates) if size is None else size)
+
+    def as_of(self, date):
+        """Returns a read-only view of the data as it was on a date.
+
+        Prediction models built on the view predict the weather of the day
+        after the date, without copying the data.
+
+        Parameters:
+            date (datetime.date | str): Most recent date to include.
+
+        Return:
+            (WeatherDataView) View of the days on or before date.
+        """
+        return WeatherDataView(self, self.index_of(date))
+
+    def get_first_date(self):
+        """(datetime.date) Date of the oldest day, or None if there is no data."""
+        dates = self._columns["date"]
+        return datetime.date.fromordinal(dates[0]) if len(dates) else None
+
+    def get_last_date(self):
+        """(datetime.date) Date of the most recent day, or None if no data."""
+        dates = self._columns["date"]
+        return datetime.date.fromordinal(dates[-1]) if len(dates) else None
+
+    def get_version(self):
+        """(int) Identifies the current state of the data.
+
+        Changes whenever data is loaded, appended or cleared, and is never
+        shared by two WeatherData objects, so results computed from the data
+        can be cached against it.
+        """
+        return self._version
 
     def size(self):
         """(int) Returns the number of days of weather data available,
                  after loading data from file.
                  Returns 0 if no data is available."""
-        return len(self._weather_data)
+        return self._size
+
+    def __getstate__(self):
+        """(dict) State to pickle, with any mapped snapshot copied out."""
+        if self._deferred:
+            self._load_all_deferred()
+        state = self.__dict__.copy()
+        if self._snapshot_buffer is not None:
+            state["_columns"] = {field: array(TYPECODES[field], column)
+                                 for field, column in self._columns.items()}
+            state["_sums"] = {field: array("d", sums)
+                              for field, sums in self._sums.items()}
+            state["_sum_errors"] = {field: array("d", errors)
+                                    for field, errors in self._sum_errors.items()}
+            state["_snapshot_source"] = None
+            state["_snapshot_buffer"] = None
+        return state
+
+    def __setstate__(self, state):
+        """Restores pickled state, with a version unique to this process."""
+        self.__dict__.update(state)
+        self._version = next(_versions)
+
+    def copy(self):
+        """Returns a copy of the data that can be changed, for example by
+        ingesting new rows, without changing this collection.
+
+        Return:
+            (WeatherData) The copy, with the same data version until changed.
+        """
+        if self._deferred:
+            self._load_all_deferred()
+        copied = type(self).__new__(type(self))
+        copied.__dict__.update(self.__dict__)
+        copied._columns = {field: array(TYPECODES[field], column)
+                           for field, column in self._columns.items()}
+        copied._sums = {field: array("d", sums)
+                        for field, sums in self._sums.items()}
+        copied._sum_errors = {field: array("d", errors)
+                              for field, errors in self._sum_errors.items()}
+        copied._summaries = copy.deepcopy(self._summaries)
+        copied._snapshot_source = None
+        copied._snapshot_buffer = None
+        return copied
+
+    def view(self, end):
+        """Returns a read-only view of the first days of the data.
+
+        Parameters:
+            end (int): Number of days, from the start of the data, to include.
+
+        Return:
+            (WeatherDataView) View of the data, sharing its storage.
+        """
+        return WeatherDataView(self, end)
+
+
+class WeatherDataView(object):
+    """Read-only view of the first days of a WeatherData collection.
+
+    Answers queries as the collection would have before any later days were
+    added, without copying the data, so that prediction models can be built
+    as at an earlier day.
+    """
+
+    def __init__(self, weather_data, end):
+        """
+        Parameters:
+            weather_data (WeatherData): Collection holding the data.
+            end (int): Number of days, from the start of the data, in the view.
+        """
+        self._data = weather_data
+        # Counted from the first day ever added, so that the view keeps
+        # the same days if older days are rolled up.
+        self._stop = weather_data._base + min(end, weather_data.size())
+
+    def get_data(self, number_days):
+        """Returns a specified number of days of weather data, counting
+        backwards from the most recent day in the view.
+
+        Return:
+            [WeatherDataItem] Weather data, ordered from oldest to most recent.
+        """
+        end = self._end()
+        start = max(0, end - number_days)
+        return [WeatherDataRow(self._data, self._data._base + index)
+                for index in range(start, end)]
+
+    def get_column(self, field, number_days=None, end=None):
+        """Returns the values of one field, as WeatherData.get_column."""
+        return self._data.get_column(field, number_days, self._limit(end))
+
+    def window_sum(self, field, number_days, end=None):
+        """(float) Total of a field over a window, as WeatherData.window_sum."""
+        return self._data.window_sum(field, number_days, self._limit(end))
+
+    def window_mean(self, field, number_days, end=None):
+        """(float) Mean of a field over a window, as WeatherData.window_mean."""
+        return self._data.window_mean(field, number_days, self._limit(end))
+
+    def get_data_range(self, start, end):
+        """Returns the data of the days between two dates, inclusive,
+        as WeatherData.get_data_range."""
+        return self._data.get_data_range(start, end, self._end())
+
+    def get_data_as_of(self, date, number_days):
+        """Returns a number of days of weather data, up to and including a
+        date, as WeatherData.get_data_as_of."""
+        return self.as_of(date).get_data(number_days)
+
+    def index_of(self, date):
+        """(int) Number of days in the view on or before a date."""
+        return self._data.index_of(date, self._end())
+
+    def as_of(self, date):
+        """(WeatherDataView) View of the days on or before a date."""
+        return WeatherDataView(self._data, self.index_of(date))
+
+    def get_version(self):
+        """(tuple<int, int>) Identifies the data seen through the view."""
+        return self._data.get_version(), self._stop
+
+    def size(self):
+        """(int) Number of days of weather data in the view."""
+        return self._end()
+
+    def _end(self):
+        """(int) Number of days, from the start of the data, in the view."""
+        return max(0, self._stop - self._data._base)
+
+    def _limit(self, end):
+        """(int) 'end', limited to the days in the view."""
+        view_end = self._end()
+        return view_end if end is None else min(end, view_end)
+
+
+def period_start(date, period):
+    """(int) Ordinal of the first day of the week (from Monday) or month,
+             as given by period, that the date with ordinal 'date' is in."""
+    if period == "week":
+        return date - (date - 1) % 7
+    return datetime.date.fromordinal(date).replace(day=1).toordinal()
+
+
+def period_end(start, period):
+    """(int) Ordinal of the first day after the period starting on 'start'."""
+    if period == "week":
+        return start + 7
+    first = datetime.date.fromordinal(start)
+    if first.month == 12:
+        return first.replace(year=first.year + 1, month=1).toordinal()
+    return first.replace(month=first.month + 1).toordinal()
+
+
+class WeatherDataSummary(object):
+    """Totals and extremes of the weather data of the days of a week or
+    month that have been rolled up."""
+
+    __slots__ = ("_start", "_count", "_sums", "_minimums", "_maximums",
+                 "_wind_directions")
+
+    def __init__(self, start):
+        """
+        Parameters:
+            start (int): Ordinal of the first day of the period.
+        """
+        self._start = start
+        self._count = 0
+        self._sums = dict.fromkeys(SUMMED_FIELDS, 0.0)
+        self._minimums = dict.fromkeys(SUMMED_FIELDS, math.inf)
+        self._maximums = dict.fromkeys(SUMMED_FIELDS, -math.inf)
+        self._wind_directions = Counter()
+
+    def add(self, columns, first, last):
+        """Adds days of weather data to the summary.
+
+        Parameters:
+            columns (dict<str, array>): Columns of the data.
+            first (int): Position of the first day to add.
+            last (int): Position just past the last day to add.
+        """
+        self._count += last - first
+        for field in SUMMED_FIELDS:
+            values = columns[field][first:last]
+            self._sums[field] = math.fsum((self._sums[field], math.fsum(values)))
+            self._minimums[field] = min(self._minimums[field], min(values))
+            self._maximums[field] = max(self._maximums[field], max(values))
+        self._wind_directions.update(columns["wind_direction"][first:last])
+
+    def get_start(self):
+        """(datetime.date) First day of the period."""
+        return datetime.date.fromordinal(self._start)
+
+    def get_count(self):
+        """(int) Number of days of data in the summary."""
+        return self._count
+
+    def get_sum(self, field):
+        """(float) Total of a field, one of SUMMED_FIELDS, over the days."""
+        return self._sums[field]
+
+    def get_mean(self, field):
+        """(float) Mean of a field, one of SUMMED_FIELDS, over the days."""
+        return self._sums[field] / self._count
+
+    def get_minimum(self, field):
+        """(float) Least value of a field, one of SUMMED_FIELDS."""
+        return self._minimums[field]
+
+    def get_maximum(self, field):
+        """(float) Greatest value of a field, one of SUMMED_FIELDS."""
+        return self._maximums[field]
+
+    def get_dominant_wind_direction(self):
+        """(str) Most frequent wind direction, ignoring days with none
+                 recorded, or "" if none was recorded on any day."""
+        recorded = [(count, -code) for code, count
+                    in self._wind_directions.items() if code]
+        return WIND_DIRECTIONS[-max(recorded)[1]] if recorded else ""
+
+    def __str__(self):
+        """(str) Readable representation of the summary."""
+        return (f"Summary({self.get_start()}: {self._count} days, "
+                f"rain {self._sums['rain']:.1f} mm)")
+
+
+class WeatherDataCheckpoint(object):
+    """Position in a CSV file up to which rows have been ingested."""
+
+    def __init__(self, weather_file, offset, header, fingerprint=None):
+        """
+        Parameters:
+            weather_file (str): Name of the CSV file.
+            offset (int): Byte offset just past the last ingested row.
+            header (list<str>): Column names of the CSV file.
+            fingerprint (bytes): Hash of the file's first line and of the
+                                 FINGERPRINT_SIZE bytes before offset,
+                                 or None if not known.
+        """
+        self._file = weather_file
+        self._offset = offset
+        self._header = header
+        self._fingerprint = fingerprint
+
+    @classmethod
+    def at(cls, binary_file, weather_file, offset, header):
+        """Returns a checkpoint at an offset of a file that is open, taking
+        its fingerprint from the file."""
+        return cls(weather_file, offset, header, _fingerprint(binary_file, offset))
+
+    def get_file(self):
+        """(str) Name of the CSV file."""
+        return self._file
+
+    def get_offset(self):
+        """(int) Byte offset just past the last ingested row."""
+        return self._offset
+
+    def get_header(self):
+        """(list<str>) Column names of the CSV file."""
+        return self._header
+
+    def get_fingerprint(self):
+        """(bytes) Hash of the file's first line and of the FINGERPRINT_SIZE
+                   bytes before the offset, or None if not known."""
+        return self._fingerprint
+
+    def matches(self):
+        """(bool) True if the file still has the fingerprint it had when the
+                  checkpoint was taken, so it has most likely only been
+                  appended to since.
+
+        Only the header and the rows just before the offset are compared,
+        so rows changed further back, without changing the length of the
+        rows after them, are not noticed.
+        """
+        try:
+            with open(self._file, "rb") as weather_details:
+                return _fingerprint(weather_details, self._offset) == self._fingerprint
+        except FileNotFoundError:
+            return False
+
+    def __str__(self):
+        """(str) Readable representation of the checkpoint."""
+        return f"Checkpoint({self._file} @ {self._offset})"
+
+
+def _fingerprint(binary_file, offset):
+    """(bytes) Hash of the first line of a file and of the FINGERPRINT_SIZE
+               bytes before an offset, which moves the file's position."""
+    binary_file.seek(0)
+    digest = hashlib.sha256(binary_file.readline())
+    start = max(0, offset - FINGERPRINT_SIZE)
+    binary_file.seek(start)
+    digest.update(binary_file.read(offset - start))
+    return digest.digest()
+
+
+class _LineReader(object):
+    """Iterates over the complete lines of a binary file from an offset,
+    keeping track of the byte offset reached."""
+
+    def __init__(self, binary_file, offset, end=None, last_line=False):
+        """
+        Parameters:
+            binary_file (file): File opened in binary mode, positioned at offset.
+            offset (int): Byte offset of the file's current position.
+            end (int): Byte offset to stop reading at, or None to read to the
+                       end of the file.
+            last_line (bool): Whether to read a last line without a line
+                              break. Otherwise it is left unread, as it may
+                              still be being written.
+        """
+        self._file = binary_file
+        self._offset = offset
+        self._line_start = offset
+        self._end = end
+        self._last_line = last_line
+        self._row_count = 0
+
+    def get_offset(self):
+        """(int) Byte offset just past the last line read."""
+        return self._offset
+
+    def get_line_start(self):
+        """(int) Byte offset of the start of the last line read."""
+        return self._line_start
+
+    def get_row_count(self):
+        """(int) Number of lines read that were not blank."""
+        return self._row_count
+
+    def __iter__(self):
+        for line in self._file:
+            if self._end is not None and self._offset >= self._end:
+                return
+            if not line.endswith(b"\n") and not self._last_line:
+                return
+            self._line_start = self._offset
+            self._offset += len(line)
+            if line.strip():
+                self._row_count += 1
+            yield line.decode("utf-8")
+
+
+class _LazyColumns(dict):
+    """Columns of weather data, some of which are only parsed when first used."""
+
+    def __init__(self, loader):
+        """
+        Parameters:
+            loader (callable): Parses and stores the named column.
+        """
+        super().__init__()
+        self._loader = loader
+
+    def __missing__(self, field):
+        self._loader(field)
+        return dict.__getitem__(self, field)
+
+
+def open_weather_file(weather_file):
+    """Opens a CSV file of weather data for reading as text, decompressing it
+    as it is read if its extension is one of DECOMPRESSORS.
+
+    Parameters:
+        weather_file (str): Name of the file.
+
+    Return:
+        (file) The open file.
+    """
+    opener = DECOMPRESSORS.get(os.path.splitext(weather_file)[1].lower(), open)
+    return opener(weather_file, "rt", encoding="utf-8-sig", newline="")
+
+
+def _read_weather_file(weather_file):
+    """Parses every column of one CSV file, possibly in a worker process.
+
+    Return:
+        (tuple<dict<str, array>, bool>) The columns, and whether the dates
+            were read from the file rather than numbered from 1, or None if
+            the file is empty, not even having a header.
+    """
+    with open_weather_file(weather_file) as weather_details:
+        rows = csv.reader(weather_details)
+        header = next(rows, None)
+        if header is None:
+            return None
+        columns, _ = _parse_columns(rows, header, COLUMNS)
+        return columns, DATE_COLUMN in header
+
+
+def _merge_columns(parsed):
+    """Merges the columns of many files into one set of columns in date order.
+
+    Parameters:
+        parsed (list<tuple<dict<str, array>, bool>>): Columns of each file,
+            and whether they have dates, as returned by _read_weather_file.
+            Empty files, given as None, are skipped.
+
+    Return:
+        (dict<str, array>) The merged columns.
+    """
+    parsed = [columns for columns in parsed if columns is not None]
+    merged = _new_columns()
+    if not all(dated for _, dated in parsed):
+        # Without dates the days follow on in the order of the files.
+        for columns, _ in parsed:
+            for field in FIELDS:
+                merged[field].extend(columns[field])
+        merged["date"].extend(range(1, len(merged["rain"]) + 1))
+        return merged
+
+    chunks = sorted((columns for columns, _ in parsed if columns["date"]),
+                    key=lambda columns: (columns["date"][0], columns["date"][-1]))
+    if all(earlier["date"][-1] <= later["date"][0]
+           for earlier, later in zip(chunks, chunks[1:])):
+        for columns in chunks:
+            for field in COLUMNS:
+                merged[field].extend(columns[field])
+        return merged
+
+    # The files overlap, so interleave their days by date.
+    days = heapq.merge(*(zip(columns["date"], itertools.repeat(columns),
+                             range(len(columns["date"])))
+                         for columns in chunks),
+                       key=operator.itemgetter(0))
+    for _, columns, index in days:
+        for field in COLUMNS:
+            merged[field].append(columns[field][index])
+    return merged
+
+
+def _tail_offset(binary_file, start, rows):
+    """Finds where the last rows of a file begin, by reading back from its end.
+
+    Blank lines are not counted. A last line without a line break is.
+
+    Parameters:
+        binary_file (file): File opened in binary mode.
+        start (int): Byte offset of the first row, after any header.
+        rows (int): Number of rows wanted.
+
+    Return:
+        (int) Byte offset of the first of the last 'rows' rows,
+              or 'start' if the file has no more than that many.
+    """
+    end = binary_file.seek(0, os.SEEK_END)
+    position = end
+    block_size = TAIL_BLOCK_SIZE
+    while position > start:
+        position = max(start, position - block_size)
+        block_size *= 2
+        binary_file.seek(position)
+        data = binary_file.read(end - position)
+
+        # Every line is complete, except for the first if it may have
+        # started before this block.
+        lines = data.split(b"\n")
+        if position > start:
+            lines = lines[1:]
+        offset = end
+        count = 0
+        for line in reversed(lines):
+            offset -= len(line)
+            if line.strip():
+                count += 1
+                if count == rows:
+                    return offset
+            offset -= 1
+    return start
+
+
+def _parse_columns(rows, header, fields):
+    """Parses some of the columns of CSV rows.
+
+    Parameters:
+        rows (iter<list<str>>): CSV rows, excluding the header.
+        header (list<str>): Column names of the CSV file.
+        fields (list<str>): Columns to parse, from COLUMNS.
+
+    Return:
+        (tuple<dict<str, array>, int>) The parsed columns, and the number of
+            rows. Dates missing from the file are numbered consecutively
+            from ordinal 1.
+    """
+    columns = {field: array(TYPECODES[field]) for field in fields}
+    parsers = []
+    for field in fields:
+        if field == "date":
+            if DATE_COLUMN not in header:
+                continue
+            parse, name = _DateParser(), DATE_COLUMN
+        else:
+            parse, name = PARSERS[field], CSV_COLUMNS[field]
+        parsers.append((columns[field].extend, parse,
+                        operator.itemgetter(header.index(name))))
+
+    # Each column of a block of rows is parsed in one call, rather than
+    # each value of each row in turn.
+    count = 0
+    rows = filter(None, rows)
+    while True:
+        block = list(itertools.islice(rows, PARSE_BLOCK_ROWS))
+        if not block:
+            break
+        count += len(block)
+        for extend, parse, get_value in parsers:
+            extend(map(parse, map(get_value, block)))
+    if "date" in columns and DATE_COLUMN not in header:
+        columns["date"].extend(range(1, count + 1))
+    return columns, count
+
+
+def _cumulative_sums(column):
+    """(tuple<array, array>) Cumulative sums of a column, from 0, and the
+                             rounding errors accumulated with them."""
+    # The sums are accumulated as total = last + value, and the error of
+    # each addition, (last - (total - rounding)) + (value - rounding) with
+    # rounding = total - last, is found from whole columns at once.
+    sums = array("d", itertools.accumulate(column, initial=0.0))
+    if column.typecode != "d":
+        # Sums of integers are exact.
+        return sums, array("d", bytes(len(sums) * sums.itemsize))
+    lasts = memoryview(sums)[:-1]
+    totals = memoryview(sums)[1:]
+    rounding = array("d", map(operator.sub, totals, lasts))
+    additions = map(operator.add,
+                    map(operator.sub, lasts,
+                        map(operator.sub, totals, rounding)),
+                    map(operator.sub, column, rounding))
+    errors = array("d", itertools.accumulate(additions, initial=0.0))
+    return sums, errors
+
+
+def _new_columns():
+    """(dict<str, array>) Empty storage for each field."""
+    return {field: array(TYPECODES[field]) for field in COLUMNS}
+
+
+def _new_sums():
+    """(dict<str, array>) Cumulative sums of each summed field, for no data.
+
+    sums[field][i] is the total of the field over the first i days.
+    """
+    return {field: array("d", [0.0]) for field in SUMMED_FIELDS}
+
+
+# Layout of a snapshot file:
+#   header: magic, format version, byte order, row count, column count,
+#           source file size and modification time, source file name length;
+#   the source file name, padded to a multiple of 8 bytes;
+#   one descriptor per column: name, type code, data offset and length;
+#   the data of each column, each padded to a multiple of 8 bytes.
+# Columns are COLUMNS, followed by the cumulative sums of SUMMED_FIELDS
+# and their accumulated rounding errors.
+_SNAPSHOT_MAGIC = b"WXSNAP\x00\x00"
+_SNAPSHOT_VERSION = 3
+_SNAPSHOT_HEADER = struct.Struct("=8sHcxIQIqQ")
+_SNAPSHOT_COLUMN = struct.Struct("=24scxxxxxxxQQ")
+_SUM_PREFIX = "sum_"
+_ERROR_PREFIX = "err_"
+
+
+def _padding(length):
+    """(int) Number of bytes needed to pad 'length' to a multiple of 8."""
+    return -length % 8
+
+
+def file_signature(weather_file):
+    """(tuple<int, int>) Size and modification time (ns) of a file, used to
+                         detect when it has changed, or None if it does not
+                         exist."""
+    try:
+        status = os.stat(weather_file)
+    except FileNotFoundError:
+        return None
+    return status.st_size, status.st_mtime_ns
+
+
+def _snapshot_header(columns, size, weather_file, source_size, source_mtime):
+    """(bytes) Header, source name and column descriptors of a snapshot.
+
+    Parameters:
+        columns (list<tuple<str, array | memoryview>>): Named columns to store.
+        size (int): Number of days of data.
+        weather_file (str): Name of the source CSV file, or None.
+        source_size (int): Size of the source CSV file.
+        source_mtime (int): Modification time of the source CSV file (ns).
+    """
+    source = (os.fsencode(os.path.abspath(weather_file))
+              if weather_file is not None else b"")
+    source += bytes(_padding(len(source)))
+    offset = (_SNAPSHOT_HEADER.size + len(source)
+              + _SNAPSHOT_COLUMN.size * len(columns))
+
+    header = [_SNAPSHOT_HEADER.pack(
+        _SNAPSHOT_MAGIC, _SNAPSHOT_VERSION, sys.byteorder[0].encode(), size,
+        len(columns), source_size, source_mtime, len(source)), source]
+    for name, column in columns:
+        typecode = (column.format if isinstance(column, memoryview)
+                    else column.typecode)
+        header.append(_SNAPSHOT_COLUMN.pack(
+            name.encode(), typecode.encode(), offset, len(column)))
+        length = len(column) * column.itemsize
+        offset += length + _padding(length)
+    return b"".join(header)
+
+
+def _read_snapshot(buffer):
+    """Reads the columns of a snapshot, without copying them.
+
+    Parameters:
+        buffer (buffer): Contents of a snapshot file.
+
+    Return:
+        (tuple<dict<str, memoryview>, dict<str, memoryview>,
+               dict<str, memoryview>, str, tuple<int, int>>)
+            Columns, cumulative sums and their rounding errors, source file
+            name (None if not recorded), and source file size and
+            modification time.
+
+    Raises:
+        ValueError: If the buffer does not hold a snapshot of this format.
+    """
+    view = memoryview(buffer)
+    if len(view) < _SNAPSHOT_HEADER.size:
+        raise ValueError("Snapshot is too short to hold a header")
+    (magic, version, byte_order, size, column_count, source_size,
+     source_mtime, source_length) = _SNAPSHOT_HEADER.unpack_from(view)
+    if (magic != _SNAPSHOT_MAGIC or version != _SNAPSHOT_VERSION
+            or byte_order != sys.byteorder[0].encode()):
+        raise ValueError("Not a weather data snapshot of a supported format")
+
+    position = _SNAPSHOT_HEADER.size
+    if (position + source_length + _SNAPSHOT_COLUMN.size * column_count
+            > len(view)):
+        raise ValueError("Snapshot is truncated")
+    source = os.fsdecode(bytes(view[position:position + source_length])
+                         .rstrip(b"\x00")) or None
+    position += source_length
+
+    columns = {}
+    sums = {}
+    errors = {}
+    for _ in range(column_count):
+        name, typecode, offset, length = _SNAPSHOT_COLUMN.unpack_from(
+            view, position)
+        position += _SNAPSHOT_COLUMN.size
+        name = name.rstrip(b"\x00").decode()
+        typecode = typecode.decode()
+        if name.startswith(_SUM_PREFIX):
+            stored, field, expected = sums, name[len(_SUM_PREFIX):], "d"
+        elif name.startswith(_ERROR_PREFIX):
+            stored, field, expected = errors, name[len(_ERROR_PREFIX):], "d"
+        else:
+            stored, field, expected = columns, name, TYPECODES.get(name)
+        if typecode != expected:
+            raise ValueError(f"Unexpected column in snapshot: {name}")
+        end = offset + length * array(typecode).itemsize
+        if end > len(view):
+            raise ValueError(f"Snapshot column is truncated: {name}")
+        stored[field] = view[offset:end].cast(typecode)
+
+    if (set(columns) != set(COLUMNS) or set(sums) != set(SUMMED_FIELDS)
+            or set(errors) != set(SUMMED_FIELDS)):
+        raise ValueError("Snapshot is missing columns")
+    if (any(len(column) != size for column in columns.values())
+            or any(len(column) != size + 1
+                   for column in (*sums.values(), *errors.values()))):
+        raise ValueError("Snapshot columns are truncated")
+    return columns, sums, errors, source, (source_size, source_mtime)
+
+
+instrumentation.instrument(WeatherData, "load", "ingest_file", "get_data")
 
 
 def demo():